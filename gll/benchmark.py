@@ -0,0 +1,1572 @@
+"""
+This module implements benchmarks for the GLL generator.
+
+Usage:
+    python -m gll.benchmark [SUITE...] [--repeat N] [--json FILE]
+
+Runs the given benchmark suites, or every suite if none are given. Each measurement is repeated N times (3 by default) and the best is kept.
+With --json, the results of suites that record them (currently resolve, report, calls, pipeline, model and fetch) are also written to FILE, so runs can be compared over time.
+
+Suites:
+    parse    Compares the streaming registry parser (gll.generate.parseRegistry) against the tree-based one (gll.generate.parseRegistryTree) on gl.xml,
+             then compares parsing every registry file one after another against parsing them concurrently (gll.generate.parse),
+             then compares both parsers on gl.xml with every installed XML backend (see gll.xmlbackend).
+             The best wall time and the peak memory allocated while parsing are reported.
+             Parsers being compared must produce the same enums, commands, features and extensions, otherwise the benchmark fails.
+             Note that peak memory only covers allocations made by this process, not by worker processes.
+    loaders  Generates the GL module loaders in each loader style (see gll.generate --loader), compiles them with the C++ compiler in $CXX (g++ by default),
+             and reports the size and relocation count of the object files, as well as how long it takes to load every GL module
+             using a stand-in getProcAddress that doesn't need an OpenGL context. Every style looks each command up once, so load times are
+             expected to be about the same; table loaders trade nothing in load time for their smaller objects and fewer relocations.
+             The drivers take turns, at least LOADER_RUNS times each, so one noisy run can't decide the comparison.
+    lazy     Generates the GL module loaders in the statements and lazy styles and compiles a stand-in renderer that calls USED_COMMANDS commands against each.
+             Reports the startup cost (loading every module up front and then calling each used command once, versus just calling them through their trampolines)
+             and the steady-state cost of calling a command that has already been resolved.
+    extensions
+             Compiles gl_ext.cpp against a stand-in context that reports REPORTED_EXTENSIONS extension names (every extension GLL knows about, padded with made-up ones).
+             Reports how long LoadExtensions() takes, how long looking up every reported name takes with the generated perfect hash table
+             and by comparing it against every known name, and the cost of gll::has() against searching the reported names.
+    context  Generates context loaders and reports how long it takes to fill a dispatch table with Load( table ), to reset one, to make one current,
+             and to call a command through the current table.
+    resolve  Compiles the generated loader.cpp and looks up every generated command, and a made-up name for each, against the system's libGL with
+             glXGetProcAddress, with dlsym, with gll::ResolveDefault, and through gll::getProcAddress with a stand-in resolver set with gll::SetResolver.
+             Reports the time per lookup and how many real and made-up names each strategy claims are available.
+    report   Compiles the GL module loaders and loader.cpp with and without GLL_LOAD_REPORT (see report.hpp), and reports the size of the
+             object files and how long it takes to load every GL module through a stand-in resolver set with gll::SetResolver.
+    calls    Generates the GL 1.0 module with --call-profile, compiles it with and without GLL_CALL_PROFILE, and reports how long a call to glFlush
+             (resolved to a stand-in that does nothing) takes directly and through its call profiling wrapper.
+    amalgamate
+             Generates AMALGAMATE_TARGET in the split layout and with --amalgamate, and reports how long it takes to compile the generated sources
+             and CONSUMERS source files that include the target's headers. Also checks that the amalgamations of CHECK_TARGETS compile.
+    modules  Generates AMALGAMATE_TARGET's headers and its C++20 module interface unit (see gll.generate --modules), and reports how long it takes
+             to compile the split sources and CONSUMERS files that include the headers, versus compiling the interface unit and CONSUMERS files that import it.
+             Also checks that the interface units of CHECK_TARGETS compile. Needs a compiler that accepts GCC's -fmodules-ts.
+    pipeline Times each phase of generation (parsing gl.xml, then generating types, features, extensions, user headers and the loader)
+             and the peak memory each allocates, against the shipped gl.xml and synthetic copies of it scaled to PIPELINE_SCALES times as many
+             enums, commands and extensions. Each phase's time per unit of scale is reported relative to the shipped registry, so phases
+             that scale linearly stay near 1.00.
+    model    Parses every registry file and reports the memory the parsed model retains, the size of its cache snapshot (see gll.cache),
+             and how long restoring the model from that snapshot takes.
+    fetch    Serves the registry files in xml/ from a local stand-in HTTP server that takes FETCH_LATENCY to answer each request, and fetches them
+             with gll.generate.fetch one at a time, concurrently, and concurrently again with the files from the previous fetch on disk,
+             where the server's ETags let every file come back as 304 Not Modified. Reports the time each took and the bytes downloaded and saved.
+"""
+import gc
+import os
+import json
+import pickle
+import time
+import random
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from sys        import argv, exit
+from io         import StringIO
+from time       import perf_counter
+from contextlib import redirect_stdout
+from tempfile   import TemporaryDirectory
+from shutil     import which, rmtree
+from copy       import deepcopy
+from hashlib    import sha256
+from functools  import partial
+from threading  import Thread
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from subprocess import run, PIPE, CalledProcessError
+
+from gll           import generate, xmlbackend
+from gll.constants import *
+
+#Results suites have recorded for --json, keyed by suite name
+results = {}
+
+def record( suite, data ):
+    """Records the given JSON-serializable results of a suite, to be written out if --json was given."""
+    results[ suite ] = data
+
+def runQuietly( function ):
+    """Calls the given function, discarding anything it prints."""
+    with redirect_stdout( StringIO() ):
+        function()
+
+def timeParser( parser, repeat ):
+    """Returns the best wall time (in seconds) out of repeat runs of the given parser."""
+    best = None
+    for _ in range( repeat ):
+        generate.reset()
+        gc.collect()
+        start = perf_counter()
+        runQuietly( parser )
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def peakMemory( parser ):
+    """Returns the peak memory (in bytes) allocated while running the given parser once."""
+    generate.reset()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        runQuietly( parser )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def snapshot():
+    """
+    Returns a plain representation of everything parsed so far.
+    Two parses of the registry produced the same model if and only if their snapshots are equal.
+    """
+    def moduleSnapshot( module ):
+        return (
+            module.name,
+            module.registry,
+            [ enum.name    for enum    in module.coreEnums       ],
+            [ command.name for command in module.coreCommands    ],
+            [ enum.name    for enum    in module.removedEnums    ],
+            [ command.name for command in module.removedCommands ]
+        )
+
+    return {
+        "includeTypes": [ ( t.content, t.name, t.comment, t.api, t.registry ) for t in generate.includeTypes ],
+        "types":        [ ( t.content, t.name, t.comment, t.api, t.registry ) for t in generate.types ],
+        "enums":        [ ( e.name, e.value, e.owner and e.owner.name ) for e in generate.enums.values() ],
+        "commands":     [ ( c.rv, c.name, c.params, c.owner and c.owner.name ) for c in generate.commands.values() ],
+        "features":     [ ( f.api, str( f.version ), moduleSnapshot( f ) ) for f in generate.features ],
+        "extensions":   [ ( x.apis, moduleSnapshot( x ) ) for x in generate.extensions ]
+    }
+
+def parseSerially():
+    """Parses every registry file one after another in this process, as gll.generate.parse does when there's only one CPU."""
+    for registry, path in REGISTRIES:
+        generate.parseRegistry( registry, path )
+    generate.adoptOrphans()
+
+def compareParsers( parsers, repeat ):
+    """Benchmarks the given ( name, parser ) pairs against each other. Returns True if they all produced the same model."""
+    results   = []
+    snapshots = []
+    for name, parser in parsers:
+        seconds = timeParser( parser, repeat )
+        snapshots.append( snapshot() )
+        peak = peakMemory( parser )
+        results.append( ( name, seconds, peak ) )
+
+    print( f"{'parser':<16} {'time (ms)':>10} {'peak (MiB)':>11}" )
+    for name, seconds, peak in results:
+        print( f"{name:<16} {seconds * 1000:>10.1f} {peak / ( 1024 * 1024 ):>11.2f}" )
+
+    same = all( s == snapshots[0] for s in snapshots[1:] )
+    if same:
+        print( "All parsers produced the same model.\n" )
+    else:
+        print( "error: Parsers produced different models.\n" )
+    return same
+
+def benchmarkParsers( repeat = 3 ):
+    """Benchmarks the streaming and tree-based parsers against each other on gl.xml. Returns True if they produced the same model."""
+    print( f"{GL_FILE}:" )
+    return compareParsers( (
+        ( "tree",      lambda: generate.parseRegistryTree( "gl", GL_FILE ) ),
+        ( "streaming", lambda: generate.parseRegistry(     "gl", GL_FILE ) )
+    ), repeat )
+
+def benchmarkRegistries( repeat = 3 ):
+    """Benchmarks parsing every registry file serially and concurrently against each other. Returns True if they produced the same model."""
+    print( "All registries:" )
+    return compareParsers( (
+        ( "serial",     parseSerially  ),
+        ( "concurrent", generate.parse )
+    ), repeat )
+
+def withBackend( backend, parser ):
+    """Returns a parser that runs the given parser with the given XML backend selected."""
+    def run():
+        xmlbackend.select( backend )
+        parser()
+    return run
+
+def benchmarkBackends( repeat = 3 ):
+    """Benchmarks both parsers with every available XML backend against each other on gl.xml. Returns True if they produced the same model."""
+    default = xmlbackend.backend
+    missing = [ backend for backend in xmlbackend.BACKENDS if backend not in xmlbackend.available() ]
+    print( f"{GL_FILE} by XML backend{'' if len( missing ) == 0 else ' (not installed: ' + ', '.join( missing ) + ')'}:" )
+    parsers = []
+    for backend in xmlbackend.available():
+        parsers.append( ( f"{backend} tree",      withBackend( backend, lambda: generate.parseRegistryTree( "gl", GL_FILE ) ) ) )
+        parsers.append( ( f"{backend} streaming", withBackend( backend, lambda: generate.parseRegistry(     "gl", GL_FILE ) ) ) )
+    try:
+        return compareParsers( parsers, repeat )
+    finally:
+        xmlbackend.select( default )
+
+def benchmarkParse( repeat = 3 ):
+    """Runs the parse suite. Returns True if the parsers being compared produced the same models."""
+    ok = benchmarkParsers( repeat )
+    ok = benchmarkRegistries( repeat ) and ok
+    ok = benchmarkBackends( repeat ) and ok
+    return ok
+
+#Stand-in for the getProcAddress in loader.cpp; returns the same non-null address for every name, after reading the name so the lookup isn't free
+LOADER_DRIVER = """
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+
+namespace gll {{
+typedef void(*ProcAddress)();
+static void stub() {{}}
+volatile unsigned sink = 0;
+ProcAddress getProcAddress( const char* name ) {{
+    unsigned h = 0;
+    while( *name ) h = h * 31 + (unsigned char)*name++;
+    sink = sink + h;
+    return stub;
+}}
+{declarations}
+}}
+
+int main( int argc, char** argv ) {{
+    int iterations = argc > 1 ? std::atoi( argv[1] ) : 1000;
+    int fail = 0;
+    auto start = std::chrono::steady_clock::now();
+    for( int i = 0; i < iterations; ++i ) {{
+{calls}
+    }}
+    auto end = std::chrono::steady_clock::now();
+    std::printf( "%d %f\\n", fail, std::chrono::duration<double, std::nano>( end - start ).count() / iterations );
+    return 0;
+}}
+"""
+
+def compileCpp( compiler, source, output, link = (), flags = () ):
+    """
+    Compiles the given C++ source file with optimizations, passing the compiler any extra flags given.
+    If link is empty, only compiles; otherwise links with the given object files.
+    """
+    command = [ compiler, "-std=c++20", "-O2", *flags, "-Iinclude", "-o", output, source, *link ]
+    if len( link ) == 0:
+        command.insert( 1, "-c" )
+    run( command, check=True )
+
+def objectStats( objects ):
+    """Returns the total size (text + data + bss) of the given object files and the number of relocations in them. Either is None if the tool to measure it isn't available."""
+    size = None
+    if which( "size" ):
+        result = run( [ "size", "--totals", *objects ], stdout=PIPE, text=True, check=True )
+        size   = int( result.stdout.strip().splitlines()[-1].split()[3] )
+
+    relocations = None
+    if which( "readelf" ):
+        result      = run( [ "readelf", "--relocs", "--wide", *objects ], stdout=PIPE, text=True, check=True )
+        relocations = sum( 1 for line in result.stdout.splitlines() if line[:1] in "0123456789abcdef" and " R_" in line )
+
+    return size, relocations
+
+def glModules():
+    """Returns the load functions of every GL module that has commands."""
+    return [
+        loadFunction
+        for feature in generate.features if feature.api == "gl"
+        for commands, loadFunction in (
+            ( feature.coreCommands,    feature.coreLoadFunction    ),
+            ( feature.removedCommands, feature.removedLoadFunction )
+        )
+        if len( commands ) > 0
+    ]
+
+def buildModules( style, compiler ):
+    """Generates the GL module loaders in the given style (in the current directory) and compiles them. Returns ( load functions, object files )."""
+    generate.loaderStyle = style
+    runQuietly( generate.generate )
+
+    modules = glModules()
+    objects = []
+    for loadFunction in modules:
+        source = f"{SRC_PROJECT_DIR}/{loadFunction[ len( 'load_' ): ]}.{SRC_EXT}"
+        output = f"{loadFunction}.o"
+        compileCpp( compiler, source, output )
+        objects.append( output )
+    return modules, objects
+
+def bestRun( command, repeat ):
+    """Runs the given command repeat times. It must print whitespace-separated numbers; returns the smallest of each."""
+    best = None
+    for _ in range( repeat ):
+        result  = run( command, stdout=PIPE, text=True, check=True )
+        numbers = [ float( number ) for number in result.stdout.split() ]
+        best    = numbers if best is None else [ min( a, b ) for a, b in zip( best, numbers ) ]
+    return best
+
+#Minimum number of times the loaders suite runs each style's driver
+LOADER_RUNS = 20
+
+def buildLoaderStyle( style, compiler ):
+    """Generates and compiles the GL module loaders in the given style and a driver that loads them (in the current directory). Returns ( object size, relocations, driver path )."""
+    modules, objects  = buildModules( style, compiler )
+    size, relocations = objectStats( objects )
+
+    with open( "driver.cpp", "w" ) as fout:
+        fout.write( LOADER_DRIVER.format(
+            declarations = "\n".join( f"int {loadFunction}();" for loadFunction in modules ),
+            calls        = "\n".join( f"        fail += gll::{loadFunction}();" for loadFunction in modules )
+        ) )
+    compileCpp( compiler, "driver.cpp", "driver", objects )
+    return size, relocations, os.path.abspath( "driver" )
+
+def findCompiler( suite ):
+    """Returns the C++ compiler in $CXX (g++ by default), or None if it can't be found."""
+    compiler = os.environ.get( "CXX", "g++" )
+    if not which( compiler ):
+        print( f"error: Can't find C++ compiler \"{compiler}\"; set $CXX to run the {suite} suite.\n" )
+        return None
+    return compiler
+
+def benchmarkLoaders( repeat = 3 ):
+    """Runs the loaders suite. Returns False if it couldn't be run."""
+    compiler = findCompiler( "loaders" )
+    if compiler is None:
+        return False
+
+    runQuietly( generate.loadOrParse )
+
+    #Context loaders don't generate module loaders; the context suite measures them instead
+    styles   = [ style for style in generate.LOADER_STYLES if style != "context" ]
+    builds   = {}
+    times    = {}
+    previous = generate.loaderStyle
+    cwd      = os.getcwd()
+    try:
+        with TemporaryDirectory() as directory:
+            for style in styles:
+                os.makedirs( f"{directory}/{style}" )
+                os.chdir( f"{directory}/{style}" )
+                try:
+                    builds[ style ] = buildLoaderStyle( style, compiler )
+                finally:
+                    os.chdir( cwd )
+
+            #The styles' load times are within a few microseconds of each other, so a single noisy run would decide the comparison;
+            #the drivers take turns, at least LOADER_RUNS times each, and each style's best run is kept
+            for _ in range( max( repeat, LOADER_RUNS ) ):
+                for style in styles:
+                    _, nanoseconds = bestRun( [ builds[ style ][2], "200" ], 1 )
+                    times[ style ] = min( times.get( style, nanoseconds ), nanoseconds )
+    finally:
+        generate.loaderStyle = previous
+    results = [ ( style, builds[ style ][0], builds[ style ][1], times[ style ] ) for style in styles ]
+
+    def show( value ):
+        return "n/a" if value is None else str( value )
+
+    print( "GL module loaders:" )
+    print( f"{'style':<12} {'size (bytes)':>13} {'relocations':>12} {'load (us)':>10}" )
+    for style, size, relocations, nanoseconds in results:
+        print( f"{style:<12} {show( size ):>13} {show( relocations ):>12} {nanoseconds / 1000:>10.1f}" )
+    print()
+    return True
+
+#Number of commands the stand-in renderer in the lazy suite calls
+USED_COMMANDS = 100
+
+#Stand-in renderer for the lazy suite. Started with "eager", it loads every GL module before making its first calls, as Load() does;
+#started with "lazy", it makes its first calls right away. It prints the time until every used command has been called once,
+#followed by the average time per call of a command that has already been resolved.
+LAZY_DRIVER = """
+#include <chrono>
+#include <cstdio>
+#include <cstring>
+#include <gll/gl_types.hpp>
+{includes}
+
+namespace gll {{
+typedef void(*ProcAddress)();
+static void stub() {{}}
+volatile unsigned sink = 0;
+ProcAddress getProcAddress( const char* name ) {{
+    unsigned h = 0;
+    while( *name ) h = h * 31 + (unsigned char)*name++;
+    sink = sink + h;
+    return stub;
+}}
+{declarations}
+}}
+
+int main( int argc, char** argv ) {{
+    bool eager = argc > 1 && std::strcmp( argv[1], "eager" ) == 0;
+    int  calls = argc > 2 ? std::atoi( argv[2] ) : 10000000;
+
+    auto start = std::chrono::steady_clock::now();
+    if( eager ) {{
+{loads}
+    }}
+{firstCalls}
+    auto started = std::chrono::steady_clock::now();
+
+    for( int i = 0; i < calls; ++i )
+        gll::{steadyCall};
+    auto end = std::chrono::steady_clock::now();
+
+    std::printf( "%f %f\\n",
+        std::chrono::duration<double, std::nano>( started - start ).count(),
+        std::chrono::duration<double, std::nano>( end - started ).count() / calls );
+    return 0;
+}}
+"""
+
+def usedCommands():
+    """Returns USED_COMMANDS void GL commands spread evenly over the GL modules, standing in for the commands a renderer actually calls."""
+    candidates = [
+        command
+        for feature in generate.features if feature.api == "gl"
+        for command in ( *feature.coreCommands, *feature.removedCommands )
+        if command.rv.strip() == "void"
+    ]
+    step = max( len( candidates ) // USED_COMMANDS, 1 )
+    return candidates[ ::step ][ :USED_COMMANDS ]
+
+def benchmarkLazy( repeat = 3 ):
+    """Runs the lazy suite. Returns False if it couldn't be run."""
+    compiler = findCompiler( "lazy" )
+    if compiler is None:
+        return False
+
+    runQuietly( generate.loadOrParse )
+
+    commands = usedCommands()
+    results  = []
+    previous = generate.loaderStyle
+    cwd      = os.getcwd()
+    try:
+        for style in ( "statements", "lazy" ):
+            with TemporaryDirectory() as directory:
+                os.chdir( directory )
+                try:
+                    modules, objects = buildModules( style, compiler )
+                    with open( "driver.cpp", "w" ) as fout:
+                        fout.write( LAZY_DRIVER.format(
+                            includes     = "\n".join( f"#include <{PROJECT_NAME}/{loadFunction[ len( 'load_' ): ]}.{INC_EXT}>" for loadFunction in modules ),
+                            declarations = "\n".join( f"int {loadFunction}();" for loadFunction in modules ),
+                            loads        = "\n".join( f"        gll::{loadFunction}();" for loadFunction in modules ),
+                            firstCalls   = "\n".join( f"    gll::{command.name}( {', '.join( '{}' for _ in command.params )} );" for command in commands ),
+                            steadyCall   = f"{commands[0].name}( {', '.join( '{}' for _ in commands[0].params )} )"
+                        ) )
+                    compileCpp( compiler, "driver.cpp", "driver", objects )
+
+                    #The eager startup needs every module loaded, as it would be by Load(); the lazy startup doesn't load anything up front
+                    mode = "lazy" if style == "lazy" else "eager"
+                    results.append( ( style, mode, *bestRun( [ os.path.abspath( "driver" ), mode ], repeat ) ) )
+                finally:
+                    os.chdir( cwd )
+    finally:
+        generate.loaderStyle = previous
+
+    print( f"Startup with {len( commands )} of {sum( len( f.coreCommands ) + len( f.removedCommands ) for f in generate.features if f.api == 'gl' )} GL commands used:" )
+    print( f"{'style':<12} {'startup':<8} {'startup (us)':>13} {'call (ns)':>10}" )
+    for style, mode, startup, call in results:
+        print( f"{style:<12} {mode:<8} {startup / 1000:>13.1f} {call:>10.2f}" )
+    print()
+    return True
+
+#Number of extension names the stand-in context in the extensions suite reports; every extension GLL knows about, padded with made-up names
+REPORTED_EXTENSIONS = 4096
+
+#Stand-in context for the extensions suite. Reports a synthetic list of extension names through glGetIntegerv/glGetStringi and prints:
+#the time LoadExtensions() takes, the time it takes to look up every reported name with findExtension() and by comparing it against every known name,
+#and the time per query of gll::has() and of searching the reported names for an extension.
+#Then it stands in for a context older than OpenGL 3.0 whose glGetStringi can still be found, which doesn't know GL_NUM_EXTENSIONS and reports
+#the same names through glGetString, and prints how many extensions LoadExtensions() found with each context.
+EXTENSIONS_DRIVER = """
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <string>
+#include <gll/gl_ext.hpp>
+{includes}
+
+static const char* const reported[] = {{
+{reported}
+}};
+static const int reportedCount = sizeof( reported ) / sizeof( reported[0] );
+
+static const char* const known[] = {{
+{known}
+}};
+static const int knownCount = sizeof( known ) / sizeof( known[0] );
+
+namespace gll {{
+typedef void(*ProcAddress)();
+static void stub() {{}}
+volatile unsigned sink = 0;
+ProcAddress getProcAddress( const char* name ) {{
+    unsigned h = 0;
+    while( *name ) h = h * 31 + (unsigned char)*name++;
+    sink = sink + h;
+    return stub;
+}}
+}}
+
+static void fakeGetIntegerv( gll::GLenum, gll::GLint* data ) {{
+    *data = reportedCount;
+}}
+
+static const gll::GLubyte* fakeGetStringi( gll::GLenum, gll::GLuint index ) {{
+    return reinterpret_cast<const gll::GLubyte*>( reported[ index ] );
+}}
+
+//Contexts older than OpenGL 3.0 don't know GL_NUM_EXTENSIONS, so they leave the result alone, and report every name in one string
+static std::string reportedString;
+static void oldGetIntegerv( gll::GLenum, gll::GLint* ) {{}}
+static const gll::GLubyte* oldGetString( gll::GLenum ) {{
+    return reinterpret_cast<const gll::GLubyte*>( reportedString.c_str() );
+}}
+
+static int countPresent() {{
+    int present = 0;
+    for( int i = 0; i < gll::EXTENSION_COUNT; ++i )
+        present += gll::has( gll::Extension( i ) );
+    return present;
+}}
+
+static int naiveFind( const char* name ) {{
+    for( int i = 0; i < knownCount; ++i )
+        if( std::strcmp( known[i], name ) == 0 )
+            return i;
+    return -1;
+}}
+
+static bool naiveHas( const char* name ) {{
+    for( int i = 0; i < reportedCount; ++i )
+        if( std::strcmp( reported[i], name ) == 0 )
+            return true;
+    return false;
+}}
+
+template< typename F >
+static double nanoseconds( int iterations, F f ) {{
+    auto start = std::chrono::steady_clock::now();
+    for( int i = 0; i < iterations; ++i )
+        f( i );
+    auto end = std::chrono::steady_clock::now();
+    return std::chrono::duration<double, std::nano>( end - start ).count() / iterations;
+}}
+
+volatile long long total = 0;
+
+int main( int argc, char** argv ) {{
+    int iterations = argc > 1 ? std::atoi( argv[1] ) : 20;
+    gll::glGetIntegerv = fakeGetIntegerv;
+    gll::glGetStringi  = fakeGetStringi;
+
+    double load    = nanoseconds( iterations, []( int ) {{ total = total + gll::LoadExtensions(); }} );
+    double hashed  = nanoseconds( iterations, []( int ) {{
+        for( int i = 0; i < reportedCount; ++i )
+            total = total + gll::findExtension( reported[i], std::strlen( reported[i] ) );
+    }} );
+    double naive   = nanoseconds( iterations, []( int ) {{
+        for( int i = 0; i < reportedCount; ++i )
+            total = total + naiveFind( reported[i] );
+    }} );
+    double has     = nanoseconds( 10000000, []( int i ) {{ total = total + gll::has( gll::Extension( i % gll::EXTENSION_COUNT ) ); }} );
+    double hasScan = nanoseconds( 10000,    []( int i ) {{ total = total + naiveHas( known[ i % knownCount ] ); }} );
+    int    present = countPresent();
+
+    for( int i = 0; i < reportedCount; ++i )
+        reportedString += std::string( reported[i] ) + " ";
+    gll::glGetIntegerv = oldGetIntegerv;
+    gll::glGetString   = oldGetString;
+    gll::LoadExtensions();
+    int oldPresent = countPresent();
+
+    std::printf( "%f %f %f %f %f %d %d\\n", load, hashed, naive, has, hasScan, present, oldPresent );
+    return 0;
+}}
+"""
+
+def syntheticExtensions( known ):
+    """Returns REPORTED_EXTENSIONS extension names in a fixed random order: every known name, padded with made-up names GLL doesn't know about."""
+    names = list( known )
+    names.extend( f"GL_SYNTH_vendor{i % 64}_extension_{i}" for i in range( REPORTED_EXTENSIONS - len( names ) ) )
+    random.Random( 0 ).shuffle( names )
+    return names
+
+def benchmarkExtensions( repeat = 3 ):
+    """Runs the extensions suite. Returns False if it couldn't be run."""
+    compiler = findCompiler( "extensions" )
+    if compiler is None:
+        return False
+
+    runQuietly( generate.loadOrParse )
+
+    known    = [ extension.name for extension in generate.generatedExtensions() ]
+    reported = syntheticExtensions( known )
+    headers  = sorted( { generate.moduleHeader( generate.commands[ name ] ) for name in ( "glGetIntegerv", "glGetString", "glGetStringi" ) } )
+
+    previous = generate.loaderStyle
+    cwd      = os.getcwd()
+    try:
+        with TemporaryDirectory() as directory:
+            os.chdir( directory )
+            try:
+                generate.loaderStyle = "statements"
+                runQuietly( generate.generate )
+
+                objects = []
+                for name in [ EXT_FILE ] + [ header[ : -len( f".{INC_EXT}" ) ] for header in headers ]:
+                    compileCpp( compiler, f"{SRC_PROJECT_DIR}/{name}.{SRC_EXT}", f"{name}.o" )
+                    objects.append( f"{name}.o" )
+
+                with open( "driver.cpp", "w" ) as fout:
+                    fout.write( EXTENSIONS_DRIVER.format(
+                        includes = "\n".join( f"#include <{PROJECT_NAME}/{header}>" for header in headers ),
+                        reported = ",\n".join( f"    \"{name}\"" for name in reported ),
+                        known    = ",\n".join( f"    \"{name}\"" for name in known )
+                    ) )
+                compileCpp( compiler, "driver.cpp", "driver", objects )
+
+                load, hashed, naive, has, hasScan, present, oldPresent = bestRun( [ os.path.abspath( "driver" ) ], repeat )
+            finally:
+                os.chdir( cwd )
+    finally:
+        generate.loaderStyle = previous
+
+    print( f"Extensions ({len( reported )} reported, {len( known )} known):" )
+    print( f"{'LoadExtensions()':<34} {load / 1000:>10.1f} us" )
+    print( f"{'look up every name (perfect hash)':<34} {hashed / 1000:>10.1f} us" )
+    print( f"{'look up every name (strcmp scan)':<34} {naive / 1000:>10.1f} us" )
+    print( f"{'has() (bit test)':<34} {has:>10.2f} ns" )
+    print( f"{'has() (strcmp scan)':<34} {hasScan:>10.2f} ns" )
+    print( f"Found {int( present )} extensions on an OpenGL 3.0 context and {int( oldPresent )} on an older one that has glGetStringi." )
+    print()
+    if oldPresent != present or present == 0:
+        print( "error: LoadExtensions() didn't find the same extensions on both contexts.\n" )
+        return False
+    return True
+
+#Stand-in application for the context suite. Prints the time it takes to fill a dispatch table with Load( table ), to reset one,
+#to make one current, and to call a command through the current table.
+CONTEXT_DRIVER = """
+#include <chrono>
+#include <cstdio>
+#include <cstring>
+#include <gll/loader.hpp>
+#include <gll/dispatch.hpp>
+
+//Stand-in for every command. The context reports no version (so Load( table ) loads every version) and no extensions.
+static void stub() {{}}
+static void fakeGetIntegerv( gll::GLenum, gll::GLint* data ) {{ *data = 0; }}
+static const gll::GLubyte* fakeGetString( gll::GLenum ) {{ return nullptr; }}
+volatile unsigned sink = 0;
+static gll::ProcAddress resolve( const char* name ) {{
+    if( std::strcmp( name, "glGetIntegerv" ) == 0 )
+        return reinterpret_cast<gll::ProcAddress>( fakeGetIntegerv );
+    if( std::strcmp( name, "glGetString" ) == 0 )
+        return reinterpret_cast<gll::ProcAddress>( fakeGetString );
+    unsigned h = 0;
+    while( *name ) h = h * 31 + (unsigned char)*name++;
+    sink = sink + h;
+    return stub;
+}}
+
+template< typename F >
+static double nanoseconds( int iterations, F f ) {{
+    auto start = std::chrono::steady_clock::now();
+    for( int i = 0; i < iterations; ++i )
+        f( i );
+    auto end = std::chrono::steady_clock::now();
+    return std::chrono::duration<double, std::nano>( end - start ).count() / iterations;
+}}
+
+static gll::DispatchTable tables[2];
+volatile long long total = 0;
+
+int main() {{
+    gll::SetResolver( resolve );
+    double load   = nanoseconds( 200,      []( int i ) {{ total = total + gll::Load( tables[ i % 2 ] ); }} );
+    double reset  = nanoseconds( 100000,   []( int i ) {{ gll::Reset( tables[ i % 2 ] ); }} );
+    gll::Load( tables[0] );
+    gll::Load( tables[1] );
+    double swap   = nanoseconds( 10000000, []( int i ) {{ gll::MakeCurrent( &tables[ i % 2 ] ); total = total + ( gll::GetCurrent() != nullptr ); }} );
+    gll::MakeCurrent( &tables[0] );
+    double call   = nanoseconds( 10000000, []( int ) {{ gll::{command}; }} );
+
+    std::printf( "%f %f %f %f\\n", load, reset, swap, call );
+    return 0;
+}}
+"""
+
+def benchmarkContext( repeat = 3 ):
+    """Runs the context suite. Returns False if it couldn't be run."""
+    compiler = findCompiler( "context" )
+    if compiler is None:
+        return False
+
+    runQuietly( generate.loadOrParse )
+    command = usedCommands()[0]
+
+    previous = generate.loaderStyle
+    cwd      = os.getcwd()
+    try:
+        with TemporaryDirectory() as directory:
+            os.chdir( directory )
+            try:
+                generate.loaderStyle = "context"
+                runQuietly( generate.generate )
+
+                objects = []
+                for name in ( DISPATCH_FILE, EXT_FILE, LOADER_FILE ):
+                    compileCpp( compiler, f"{SRC_PROJECT_DIR}/{name}.{SRC_EXT}", f"{name}.o" )
+                    objects.append( f"{name}.o" )
+
+                #loader.cpp refers to the window system module loaders, which the driver doesn't need; empty ones stand in for them
+                with open( "modules.cpp", "w" ) as fout:
+                    fout.write( "namespace gll {\n" )
+                    for api, apiFeatures in generate.loaderApis():
+                        for feature in apiFeatures:
+                            for loadFunction in generate.moduleLoadFunctions( feature ):
+                                if loadFunction is not None:
+                                    fout.write( f"int {loadFunction}() {{ return 0; }}\n" )
+                    fout.write( "}\n" )
+                objects.extend( ( "modules.cpp", "-ldl" ) )
+
+                with open( "driver.cpp", "w" ) as fout:
+                    fout.write( CONTEXT_DRIVER.format( command = f"{command.name}( {', '.join( '{}' for _ in command.params )} )" ) )
+                compileCpp( compiler, "driver.cpp", "driver", objects )
+
+                load, reset, swap, call = bestRun( [ os.path.abspath( "driver" ) ], repeat )
+            finally:
+                os.chdir( cwd )
+    finally:
+        generate.loaderStyle = previous
+
+    print( "Dispatch tables (context loaders):" )
+    print( f"{'Load( table )':<26} {load / 1000:>10.1f} us" )
+    print( f"{'Reset( table )':<26} {reset:>10.1f} ns" )
+    print( f"{'MakeCurrent( table )':<26} {swap:>10.2f} ns" )
+    print( f"{'call through current table':<26} {call:>10.2f} ns" )
+    print()
+    return True
+
+#Looks up every generated command (and a made-up name for each) with each resolution strategy against the system's libGL, for the resolve suite.
+#Prints the nanoseconds per lookup, the number of real names found and the number of made-up names found, for each strategy in turn.
+RESOLVE_DRIVER = """
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <dlfcn.h>
+
+namespace gll {{
+typedef void(*ProcAddress)();
+typedef ProcAddress (Resolver)( const char* name );
+ProcAddress getProcAddress( const char* name );
+ProcAddress ResolveDefault( const char* name );
+void SetResolver( Resolver* resolver );
+}}
+
+static const char* names[] = {{
+{names}
+}};
+static const char* madeUp[] = {{
+{madeUp}
+}};
+static const int count = sizeof( names ) / sizeof( names[0] );
+
+static void* library = nullptr;
+static gll::ProcAddress ( *glXGetProcAddressARB )( const unsigned char* name ) = nullptr;
+
+static gll::ProcAddress viaGLX(   const char* name ) {{ return glXGetProcAddressARB( reinterpret_cast<const unsigned char*>( name ) ); }}
+static gll::ProcAddress viaDlsym( const char* name ) {{ return reinterpret_cast<gll::ProcAddress>( dlsym( library, name ) ); }}
+
+//Stand-in for a resolver a test would inject; returns the same non-null address for every name, after reading the name so the lookup isn't free
+static void stub() {{}}
+volatile unsigned sink = 0;
+static gll::ProcAddress injected( const char* name ) {{
+    unsigned h = 0;
+    while( *name ) h = h * 31 + (unsigned char)*name++;
+    sink = sink + h;
+    return stub;
+}}
+
+static void measure( gll::ProcAddress ( *resolve )( const char* ), int iterations ) {{
+    int found = 0, foundMadeUp = 0;
+    for( int i = 0; i < count; ++i ) {{
+        found       += resolve( names[i]  ) != nullptr;
+        foundMadeUp += resolve( madeUp[i] ) != nullptr;
+    }}
+
+    auto start = std::chrono::steady_clock::now();
+    for( int j = 0; j < iterations; ++j )
+        for( int i = 0; i < count; ++i )
+            if( !resolve( names[i] ) ) sink = sink + 1;
+    auto end = std::chrono::steady_clock::now();
+    std::printf( "%f %d %d\\n", std::chrono::duration<double, std::nano>( end - start ).count() / ( (double)iterations * count ), found, foundMadeUp );
+}}
+
+int main( int argc, char** argv ) {{
+    int iterations = argc > 1 ? std::atoi( argv[1] ) : 20;
+    library = dlopen( "libGL.so.1", RTLD_LAZY | RTLD_LOCAL );
+    if( !library ) {{
+        std::fprintf( stderr, "Can't open libGL.so.1\\n" );
+        return 1;
+    }}
+    glXGetProcAddressARB = reinterpret_cast<gll::ProcAddress (*)( const unsigned char* )>( dlsym( library, "glXGetProcAddressARB" ) );
+
+    measure( viaGLX,              iterations );
+    measure( viaDlsym,            iterations );
+    measure( gll::ResolveDefault, iterations );
+    gll::SetResolver( injected );
+    measure( gll::getProcAddress, iterations );
+    return 0;
+}}
+"""
+
+#Strategies the resolve suite measures, in the order RESOLVE_DRIVER prints them
+RESOLVE_STRATEGIES = ( "glXGetProcAddress", "dlsym", "ResolveDefault", "SetResolver" )
+
+def generatedCommands():
+    """Returns the names of the commands owned by generated modules, in the order they were parsed."""
+    return [ command.name for command in generate.commands.values() if command.owner is not None and generate.isGeneratedModule( command.owner ) ]
+
+def benchmarkResolve( repeat = 3 ):
+    """Runs the resolve suite. Returns False if it couldn't be run."""
+    compiler = findCompiler( "resolve" )
+    if compiler is None:
+        return False
+
+    runQuietly( generate.loadOrParse )
+    names = generatedCommands()
+
+    cwd = os.getcwd()
+    with TemporaryDirectory() as directory:
+        os.chdir( directory )
+        try:
+            runQuietly( generate.generate )
+            compileCpp( compiler, f"{SRC_PROJECT_DIR}/{LOADER_FILE}.{SRC_EXT}", f"{LOADER_FILE}.o" )
+
+            #loader.cpp refers to every module loader, but the driver never calls them; empty ones stand in for them
+            with open( "modules.cpp", "w" ) as fout:
+                fout.write( "namespace gll {\n" )
+                for api, apiFeatures in generate.loaderApis():
+                    for feature in apiFeatures:
+                        for loadFunction in generate.moduleLoadFunctions( feature ):
+                            if loadFunction is not None:
+                                fout.write( f"int {loadFunction}() {{ return 0; }}\n" )
+                fout.write( "int LoadExtensions() { return 0; }\n}\n" )
+
+            with open( "driver.cpp", "w" ) as fout:
+                fout.write( RESOLVE_DRIVER.format(
+                    names  = "\n".join( f"    \"{name}\"," for name in names ),
+                    madeUp = "\n".join( f"    \"{name}GLL\"," for name in names )
+                ) )
+            compileCpp( compiler, "driver.cpp", "driver", ( f"{LOADER_FILE}.o", "modules.cpp", "-ldl" ) )
+
+            try:
+                numbers = bestRun( [ os.path.abspath( "driver" ) ], repeat )
+            except CalledProcessError:
+                print( "error: The resolve suite needs the system's libGL (libGL.so.1).\n" )
+                return False
+        finally:
+            os.chdir( cwd )
+
+    runs = []
+    for i, strategy in enumerate( RESOLVE_STRATEGIES ):
+        nanoseconds, found, foundMadeUp = numbers[ i * 3 : i * 3 + 3 ]
+        runs.append( { "strategy": strategy, "nanosecondsPerSymbol": nanoseconds, "found": int( found ), "foundMadeUp": int( foundMadeUp ) } )
+    record( "resolve", runs )
+
+    print( f"Resolving {len( names )} commands (and a made-up name for each) against libGL:" )
+    print( f"{'strategy':<18} {'ns/symbol':>10} {'found':>7} {'made-up found':>14}" )
+    for run_ in runs:
+        print( f"{run_['strategy']:<18} {run_['nanosecondsPerSymbol']:>10.1f} {run_['found']:>7} {run_['foundMadeUp']:>14}" )
+    print()
+    return True
+
+REPORT_DRIVER = """
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <gll/loader.hpp>
+#include <gll/report.hpp>
+
+namespace gll {{
+{declarations}
+}}
+
+//Stand-in resolver; returns the same non-null address for every name, after reading the name so the lookup isn't free
+static void stub() {{}}
+volatile unsigned sink = 0;
+static gll::ProcAddress injected( const char* name ) {{
+    unsigned h = 0;
+    while( *name ) h = h * 31 + (unsigned char)*name++;
+    sink = sink + h;
+    return stub;
+}}
+
+int main( int argc, char** argv ) {{
+    int iterations = argc > 1 ? std::atoi( argv[1] ) : 200;
+    int fail = 0;
+    gll::SetResolver( injected );
+
+    double total = 0;
+    for( int i = 0; i < iterations; ++i ) {{
+        auto start = std::chrono::steady_clock::now();
+{calls}
+        auto end = std::chrono::steady_clock::now();
+        total += std::chrono::duration<double, std::nano>( end - start ).count();
+#ifdef GLL_LOAD_REPORT
+        //Otherwise the report would grow with every iteration
+        gll::ClearLoadReport();
+#endif
+    }}
+    std::printf( "%d %f\\n", fail, total / iterations );
+    return 0;
+}}
+"""
+
+def benchmarkReport( repeat = 3 ):
+    """Runs the report suite. Returns False if it couldn't be run."""
+    compiler = findCompiler( "report" )
+    if compiler is None:
+        return False
+
+    runQuietly( generate.loadOrParse )
+
+    runs = []
+    cwd  = os.getcwd()
+    with TemporaryDirectory() as directory:
+        os.chdir( directory )
+        try:
+            modules, _ = buildModules( "statements", compiler )
+
+            #loader.cpp refers to every module loader, but the driver only calls the GL ones; empty ones stand in for the rest
+            with open( "modules.cpp", "w" ) as fout:
+                fout.write( "namespace gll {\n" )
+                for api, apiFeatures in generate.loaderApis():
+                    for feature in apiFeatures:
+                        for loadFunction in generate.moduleLoadFunctions( feature ):
+                            if loadFunction is not None and loadFunction not in modules:
+                                fout.write( f"int {loadFunction}() {{ return 0; }}\n" )
+                fout.write( "int LoadExtensions() { return 0; }\n}\n" )
+
+            with open( "driver.cpp", "w" ) as fout:
+                fout.write( REPORT_DRIVER.format(
+                    declarations = "\n".join( f"int {loadFunction}();" for loadFunction in modules ),
+                    calls        = "\n".join( f"        fail += gll::{loadFunction}();" for loadFunction in modules )
+                ) )
+
+            for name, flags in ( ( "off", () ), ( "GLL_LOAD_REPORT", ( "-DGLL_LOAD_REPORT", ) ) ):
+                objects = []
+                for loadFunction in modules:
+                    source = f"{SRC_PROJECT_DIR}/{loadFunction[ len( 'load_' ): ]}.{SRC_EXT}"
+                    objects.append( f"{loadFunction}.o" )
+                    compileCpp( compiler, source, objects[-1], flags=flags )
+                size, _ = objectStats( objects )
+
+                compileCpp( compiler, f"{SRC_PROJECT_DIR}/{LOADER_FILE}.{SRC_EXT}", f"{LOADER_FILE}.o", flags=flags )
+                compileCpp( compiler, "driver.cpp", "driver", ( *objects, f"{LOADER_FILE}.o", "modules.cpp", "-ldl" ), flags )
+                _, nanoseconds = bestRun( [ os.path.abspath( "driver" ) ], repeat )
+                runs.append( { "build": name, "moduleBytes": size, "nanosecondsPerLoad": nanoseconds } )
+        finally:
+            os.chdir( cwd )
+    record( "report", runs )
+
+    print( f"Loading {len( modules )} GL modules through a stand-in resolver:" )
+    print( f"{'build':<16} {'size (bytes)':>13} {'load (us)':>10}" )
+    for run_ in runs:
+        size = "n/a" if run_["moduleBytes"] is None else str( run_["moduleBytes"] )
+        print( f"{run_['build']:<16} {size:>13} {run_['nanosecondsPerLoad'] / 1000:>10.1f}" )
+    print()
+    return True
+
+CALLS_DRIVER = """
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <gll/gl_types.hpp>
+#include <gll/loader.hpp>
+#include <gll/mod_gl_1_0.hpp>
+
+namespace gll {
+int load_mod_gl_1_0();
+}
+
+//Stand-in for every command; does nothing, so the cost of a call is the cost of calling through the pointer (and the wrapper, if any)
+static void stub() {}
+static gll::ProcAddress resolve( const char* ) { return stub; }
+
+int main( int argc, char** argv ) {
+    int iterations = argc > 1 ? std::atoi( argv[1] ) : 10000000;
+    gll::SetResolver( resolve );
+    gll::load_mod_gl_1_0();
+
+    auto start = std::chrono::steady_clock::now();
+    for( int i = 0; i < iterations; ++i )
+        gll::glFlush();
+    auto end = std::chrono::steady_clock::now();
+    std::printf( "%f\\n", std::chrono::duration<double, std::nano>( end - start ).count() / iterations );
+    return 0;
+}
+"""
+
+def benchmarkCalls( repeat = 3 ):
+    """Runs the calls suite. Returns False if it couldn't be run."""
+    compiler = findCompiler( "calls" )
+    if compiler is None:
+        return False
+
+    runQuietly( generate.loadOrParse )
+
+    runs     = []
+    previous = ( generate.loaderStyle, generate.callProfile )
+    cwd      = os.getcwd()
+    with TemporaryDirectory() as directory:
+        os.chdir( directory )
+        try:
+            generate.loaderStyle = "statements"
+            generate.callProfile = True
+            runQuietly( generate.generate )
+
+            #loader.cpp refers to every module loader, but the driver only loads GL 1.0; empty ones stand in for the rest
+            with open( "modules.cpp", "w" ) as fout:
+                fout.write( "namespace gll {\n" )
+                for api, apiFeatures in generate.loaderApis():
+                    for feature in apiFeatures:
+                        for loadFunction in generate.moduleLoadFunctions( feature ):
+                            if loadFunction is not None and loadFunction != "load_mod_gl_1_0":
+                                fout.write( f"int {loadFunction}() {{ return 0; }}\n" )
+                fout.write( "int LoadExtensions() { return 0; }\n}\n" )
+
+            with open( "driver.cpp", "w" ) as fout:
+                fout.write( CALLS_DRIVER )
+
+            for name, flags in ( ( "direct", () ), ( "GLL_CALL_PROFILE", ( "-DGLL_CALL_PROFILE", ) ) ):
+                sources = [ f"{SRC_PROJECT_DIR}/{source}.{SRC_EXT}" for source in ( "mod_gl_1_0", CALL_PROFILE_FILE, LOADER_FILE ) ]
+                compileCpp( compiler, "driver.cpp", "driver", ( *sources, "modules.cpp", "-ldl" ), flags )
+                nanoseconds, = bestRun( [ os.path.abspath( "driver" ) ], repeat )
+                runs.append( { "build": name, "nanosecondsPerCall": nanoseconds } )
+        finally:
+            os.chdir( cwd )
+            generate.loaderStyle, generate.callProfile = previous
+    record( "calls", runs )
+
+    print( "Calling glFlush (a stand-in that does nothing):" )
+    print( f"{'build':<18} {'ns/call':>8}" )
+    for run_ in runs:
+        print( f"{run_['build']:<18} {run_['nanosecondsPerCall']:>8.2f}" )
+    print()
+    return True
+
+#User header the amalgamate suite builds, and the number of translation units that include it
+AMALGAMATE_TARGET = "gl_4_6_comp"
+CONSUMERS         = 16
+
+#A translation unit that uses GLL, for the amalgamate suite
+CONSUMER = """
+{includes}
+
+int consumer{index}() {{
+    gll::glClear( GL_COLOR_BUFFER_BIT );
+    return gll::has( gll::EXT_GL_KHR_debug ) + gll::Load();
+}}
+"""
+
+def timeCompiles( compiler, sources, repeat, flags = () ):
+    """Returns the best wall time (in seconds) out of repeat runs of compiling the given C++ source files one after another."""
+    best = None
+    for _ in range( repeat ):
+        start = perf_counter()
+        for source in sources:
+            compileCpp( compiler, source, os.path.splitext( source )[0] + ".o", flags = flags )
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+#User headers before OpenGL 3.0, which the amalgamate and modules suites check compile as well; they don't declare glGetStringi
+CHECK_TARGETS = ( "gl_1_0", "gl_2_1" )
+
+def checkTargets( compiler, modules ):
+    """
+    Generates CHECK_TARGETS (in the current directory) with --amalgamate, or with --modules if modules is True, and compiles each target's source.
+    Returns the targets that failed to compile.
+    """
+    if modules:
+        generate.modules = True
+    else:
+        generate.amalgamateTargets = list( CHECK_TARGETS )
+    runQuietly( generate.generate )
+
+    failed = []
+    for target in CHECK_TARGETS:
+        try:
+            if modules:
+                compileCpp( compiler, f"{SRC_PROJECT_DIR}/{target}.{MODULE_EXT}", f"{target}.o", flags = MODULE_FLAGS )
+            else:
+                compileCpp( compiler, f"{SRC_PROJECT_DIR}/{target}.{SRC_EXT}", f"{target}.o" )
+        except CalledProcessError:
+            failed.append( target )
+    return failed
+
+def reportChecks( failed, what ):
+    """Prints whether the given kind of sources of CHECK_TARGETS compiled, given the targets that failed. Returns True if they all compiled."""
+    for target in CHECK_TARGETS:
+        print( f"{target} {what}: {'failed to compile' if target in failed else 'compiles'}" )
+    print()
+    return len( failed ) == 0
+
+def measureLayout( compiler, amalgamated, repeat ):
+    """Generates AMALGAMATE_TARGET in the split or amalgamated layout (in the current directory) and times compiling it and CONSUMERS files that include it."""
+    generate.amalgamateTargets = [ AMALGAMATE_TARGET ] if amalgamated else []
+    runQuietly( generate.generate )
+
+    if amalgamated:
+        library  = [ f"{SRC_PROJECT_DIR}/{AMALGAMATE_TARGET}.{SRC_EXT}" ]
+        includes = [ AMALGAMATE_TARGET ]
+    else:
+        feature, compatibility = generate.userHeaderTargets()[ AMALGAMATE_TARGET ]
+        library = [
+            path
+            for feature2 in generate.features if feature2.api == feature.api and feature2.version <= feature.version
+            for path in ( f"{SRC_PROJECT_DIR}/mod_{feature2.name}.{SRC_EXT}", f"{SRC_PROJECT_DIR}/mod_{feature2.name}_rem.{SRC_EXT}" )
+            if os.path.exists( path ) and ( compatibility or not path.endswith( f"_rem.{SRC_EXT}" ) )
+        ]
+        library += [ f"{SRC_PROJECT_DIR}/{EXT_FILE}.{SRC_EXT}", f"{SRC_PROJECT_DIR}/{LOADER_FILE}.{SRC_EXT}" ]
+        includes = [ AMALGAMATE_TARGET, EXT_FILE, LOADER_FILE ]
+
+    consumers = []
+    for i in range( CONSUMERS ):
+        consumers.append( f"consumer{i}.cpp" )
+        with open( consumers[-1], "w" ) as fout:
+            fout.write( CONSUMER.format( index = i, includes = "\n".join( f"#include <{PROJECT_NAME}/{name}.{INC_EXT}>" for name in includes ) ) )
+
+    return len( library ), timeCompiles( compiler, library, repeat ), timeCompiles( compiler, consumers, repeat )
+
+def benchmarkAmalgamate( repeat = 3 ):
+    """Runs the amalgamate suite. Returns False if it couldn't be run."""
+    compiler = findCompiler( "amalgamate" )
+    if compiler is None:
+        return False
+
+    runQuietly( generate.loadOrParse )
+
+    results  = []
+    previous = generate.loaderStyle, generate.amalgamateTargets
+    cwd      = os.getcwd()
+    try:
+        generate.loaderStyle = "statements"
+        for name, amalgamated in ( ( "split", False ), ( "amalgamated", True ) ):
+            with TemporaryDirectory() as directory:
+                os.chdir( directory )
+                try:
+                    results.append( ( name, *measureLayout( compiler, amalgamated, repeat ) ) )
+                finally:
+                    os.chdir( cwd )
+        with TemporaryDirectory() as directory:
+            os.chdir( directory )
+            try:
+                failed = checkTargets( compiler, False )
+            finally:
+                os.chdir( cwd )
+    finally:
+        generate.loaderStyle, generate.amalgamateTargets = previous
+
+    print( f"Compile times for {AMALGAMATE_TARGET} ({CONSUMERS} translation units include it):" )
+    print( f"{'layout':<12} {'sources':>8} {'library (s)':>12} {'per includer (ms)':>18} {'total (s)':>10}" )
+    for name, count, library, consumers in results:
+        print( f"{name:<12} {count:>8} {library:>12.2f} {consumers / CONSUMERS * 1000:>18.1f} {library + consumers:>10.2f}" )
+    print()
+    return reportChecks( failed, "amalgamation" )
+
+#GCC's flags for compiling module interface units and translation units that import them.
+#-x c++ makes GCC treat .cppm files as C++; it only applies to the files named after it.
+MODULE_FLAGS = ( "-fmodules-ts", "-x", "c++" )
+
+#A translation unit that uses GLL through its named module, for the modules suite
+MODULE_CONSUMER = """
+import {module};
+
+int consumer{index}() {{
+    gll::glClear( gll::GL_COLOR_BUFFER_BIT );
+    return gll::has( gll::EXT_GL_KHR_debug ) + gll::Load();
+}}
+"""
+
+def measureModule( compiler, repeat ):
+    """
+    Generates AMALGAMATE_TARGET's module interface unit (in the current directory) and times compiling it and CONSUMERS files that import it.
+    The interface unit has to be compiled before anything can import it; GCC writes the compiled interface to gcm.cache.
+    """
+    generate.modules = True
+    runQuietly( generate.generate )
+
+    library = [ f"{SRC_PROJECT_DIR}/{AMALGAMATE_TARGET}.{MODULE_EXT}" ]
+    consumers = []
+    for i in range( CONSUMERS ):
+        consumers.append( f"consumer{i}.cpp" )
+        with open( consumers[-1], "w" ) as fout:
+            fout.write( MODULE_CONSUMER.format( index = i, module = f"{PROJECT_NAME}.{AMALGAMATE_TARGET}" ) )
+
+    return len( library ), timeCompiles( compiler, library, repeat, MODULE_FLAGS ), timeCompiles( compiler, consumers, repeat, MODULE_FLAGS )
+
+def benchmarkModules( repeat = 3 ):
+    """Runs the modules suite. Returns False if it couldn't be run."""
+    compiler = findCompiler( "modules" )
+    if compiler is None:
+        return False
+
+    runQuietly( generate.loadOrParse )
+
+    results  = []
+    previous = generate.loaderStyle, generate.amalgamateTargets, generate.modules
+    cwd      = os.getcwd()
+    try:
+        generate.loaderStyle       = "statements"
+        generate.amalgamateTargets = []
+        for name, measure in ( ( "headers", lambda: measureLayout( compiler, False, repeat ) ), ( "module", lambda: measureModule( compiler, repeat ) ) ):
+            with TemporaryDirectory() as directory:
+                os.chdir( directory )
+                try:
+                    results.append( ( name, *measure() ) )
+                except CalledProcessError:
+                    print( f"error: \"{compiler}\" couldn't build GLL's {name}; the modules suite needs a compiler that accepts GCC's -fmodules-ts.\n" )
+                    return False
+                finally:
+                    os.chdir( cwd )
+        with TemporaryDirectory() as directory:
+            os.chdir( directory )
+            try:
+                failed = checkTargets( compiler, True )
+            finally:
+                os.chdir( cwd )
+    finally:
+        generate.loaderStyle, generate.amalgamateTargets, generate.modules = previous
+
+    print( f"Compile times for {AMALGAMATE_TARGET} ({CONSUMERS} translation units include or import it):" )
+    print( f"{'layout':<12} {'sources':>8} {'library (s)':>12} {'per consumer (ms)':>18} {'total (s)':>10}" )
+    for name, count, library, consumers in results:
+        print( f"{name:<12} {count:>8} {library:>12.2f} {consumers / CONSUMERS * 1000:>18.1f} {library + consumers:>10.2f}" )
+    print()
+    return reportChecks( failed, "module interface unit" )
+
+#How many times more commands, enums and extensions than the shipped gl.xml each registry the pipeline suite generates from has
+PIPELINE_SCALES = ( 1, 2, 5, 10 )
+
+#Phases of generation the pipeline suite measures, in the order they run; each is a ( name, function ) pair
+PIPELINE_PHASES = (
+    ( "parse",        lambda: generate.parseRegistry( "gl", GL_FILE ) ),
+    ( "types",        lambda: generate.generateTypes() ),
+    ( "features",     lambda: generate.generateFeatures() ),
+    ( "extensions",   lambda: generate.generateExtensions() ),
+    ( "user headers", lambda: generate.generateUserHeaders() ),
+    ( "loader",       lambda: generate.generateLoader() )
+)
+
+def scaleRegistry( source, destination, scale ):
+    """
+    Writes a copy of the given registry file with scale times as many enums, commands and extensions.
+    Every enum, command and extension gets scale - 1 copies whose names end in _SCALED1, _SCALED2, etc,
+    and every feature and extension that requires or removes something does the same to its copies, so modules grow in proportion.
+    """
+    tree = ET.parse( source )
+    root = tree.getroot()
+    suffixes = [ f"_SCALED{i}" for i in range( 1, scale ) ]
+
+    def copyRequirements( module ):
+        for group in module:
+            for child in list( group ):
+                if child.tag in ( "enum", "command" ):
+                    for suffix in suffixes:
+                        copy = deepcopy( child )
+                        copy.attrib["name"] += suffix
+                        group.append( copy )
+
+    for node in root:
+        if node.tag == "enums":
+            for child in list( node ):
+                if child.tag == "enum":
+                    for suffix in suffixes:
+                        copy = deepcopy( child )
+                        copy.attrib["name"] += suffix
+                        node.append( copy )
+        elif node.tag == "commands":
+            for child in list( node ):
+                for suffix in suffixes:
+                    copy = deepcopy( child )
+                    copy.find( "proto/name" ).text += suffix
+                    node.append( copy )
+        elif node.tag == "feature":
+            copyRequirements( node )
+        elif node.tag == "extensions":
+            for child in list( node ):
+                for suffix in suffixes:
+                    copy = deepcopy( child )
+                    copy.attrib["name"] += suffix
+                    for group in copy:
+                        for requirement in group:
+                            if requirement.tag in ( "enum", "command" ):
+                                requirement.attrib["name"] += suffix
+                    node.append( copy )
+
+    tree.write( destination, encoding="utf-8", xml_declaration=True )
+
+def preparePhase( name ):
+    """Prepares to run the given phase of the pipeline suite. Generation phases start from empty output directories, so every file they render is written."""
+    if name == "parse":
+        generate.reset()
+    else:
+        rmtree( SRC_DIR, ignore_errors=True )
+        rmtree( INC_DIR, ignore_errors=True )
+        os.makedirs( SRC_PROJECT_DIR )
+        os.makedirs( INC_PROJECT_DIR )
+    gc.collect()
+
+def measurePhase( name, function, repeat ):
+    """
+    Returns the best wall time (in seconds) out of repeat runs of the given phase of the pipeline suite, and the peak memory (in bytes) allocated while running it once.
+    Memory is measured first, which also warms up anything the phase does for the first time (e.g. imports), so it doesn't count against the timed runs.
+    """
+    preparePhase( name )
+    tracemalloc.start()
+    try:
+        runQuietly( function )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = None
+    for _ in range( repeat ):
+        preparePhase( name )
+        start = perf_counter()
+        runQuietly( function )
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, peak
+
+def benchmarkPipeline( repeat = 3 ):
+    """Runs the pipeline suite. Returns False if it couldn't be run."""
+    if not os.path.exists( GL_FILE ):
+        print( f"error: Can't find \"{GL_FILE}\"; run python -m gll.generate --fetch to run the pipeline suite.\n" )
+        return False
+    source = os.path.abspath( GL_FILE )
+
+    runs     = []
+    previous = generate.loaderStyle, generate.amalgamateTargets, generate.modules, generate.usedSymbols
+    cwd      = os.getcwd()
+    try:
+        generate.loaderStyle, generate.amalgamateTargets, generate.modules, generate.usedSymbols = "statements", [], False, None
+        for scale in PIPELINE_SCALES:
+            with TemporaryDirectory() as directory:
+                os.chdir( directory )
+                try:
+                    os.makedirs( XML_DIR )
+                    scaleRegistry( source, GL_FILE, scale )
+
+                    phases = {}
+                    for name, function in PIPELINE_PHASES:
+                        seconds, peak = measurePhase( name, function, repeat )
+                        phases[ name ] = { "seconds": seconds, "peakBytes": peak }
+                    runs.append( {
+                        "scale":      scale,
+                        "enums":      len( generate.enums ),
+                        "commands":   len( generate.commands ),
+                        "extensions": len( generate.extensions ),
+                        "phases":     phases
+                    } )
+                finally:
+                    os.chdir( cwd )
+    finally:
+        generate.loaderStyle, generate.amalgamateTargets, generate.modules, generate.usedSymbols = previous
+        #Don't leave the synthetic registry behind for other suites
+        generate.reset()
+
+    record( "pipeline", runs )
+
+    #Time per unit of scale, relative to the shipped registry; stays near 1.00 for phases that scale linearly
+    base = runs[0]["phases"]
+    for run_ in runs:
+        print( f"{GL_FILE} x{run_['scale']} ({run_['enums']} enums, {run_['commands']} commands, {run_['extensions']} extensions):" )
+        print( f"{'phase':<14} {'time (ms)':>10} {'vs. linear':>11} {'peak (MiB)':>11}" )
+        for name, phase in run_["phases"].items():
+            relative = phase["seconds"] / ( base[ name ]["seconds"] * run_["scale"] )
+            print( f"{name:<14} {phase['seconds'] * 1000:>10.1f} {relative:>11.2f} {phase['peakBytes'] / ( 1024 * 1024 ):>11.2f}" )
+        print()
+    return True
+
+def benchmarkModel( repeat = 3 ):
+    """Runs the model suite. Returns True."""
+    generate.reset()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        runQuietly( parseSerially )
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    counts = {
+        "types":      len( generate.includeTypes ) + len( generate.types ),
+        "enums":      len( generate.enums ),
+        "commands":   len( generate.commands ),
+        "features":   len( generate.features ),
+        "extensions": len( generate.extensions )
+    }
+    pickled = pickle.dumps( generate.capture(), protocol=pickle.HIGHEST_PROTOCOL )
+
+    best = None
+    for _ in range( repeat ):
+        gc.collect()
+        start = perf_counter()
+        generate.restore( pickle.loads( pickled ) )
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    record( "model", { "retainedBytes": retained, "snapshotBytes": len( pickled ), "restoreSeconds": best, "counts": counts } )
+
+    print( "Parsed model of every registry file ({}):".format( ", ".join( f"{count} {name}" for name, count in counts.items() ) ) )
+    print( f"{'retained (MiB)':<24} {retained / ( 1024 * 1024 ):>10.2f}" )
+    print( f"{'per enum + command (B)':<24} {retained / ( counts['enums'] + counts['commands'] ):>10.0f}" )
+    print( f"{'cache snapshot (MiB)':<24} {len( pickled ) / ( 1024 * 1024 ):>10.2f}" )
+    print( f"{'cache restore (ms)':<24} {best * 1000:>10.1f}" )
+    print()
+    return True
+
+#Seconds the fetch suite's stand-in server waits before answering each request, standing in for the round trip to a real server
+FETCH_LATENCY = 0.05
+
+class RegistryHandler( SimpleHTTPRequestHandler ):
+    """
+    Serves the fetch suite's registry files. Like SimpleHTTPRequestHandler (which already handles If-Modified-Since),
+    but also sends an ETag for each file and answers requests whose If-None-Match matches it with 304 Not Modified.
+    """
+    etag = None
+
+    def send_head( self ):
+        time.sleep( FETCH_LATENCY )
+        try:
+            with open( self.translate_path( self.path ), "rb" ) as fin:
+                self.etag = '"{}"'.format( sha256( fin.read() ).hexdigest()[:16] )
+        except OSError:
+            self.etag = None
+
+        if self.etag is not None and self.headers.get( "If-None-Match" ) == self.etag:
+            self.send_response( 304 )
+            self.end_headers()
+            return None
+        return super().send_head()
+
+    def end_headers( self ):
+        if self.etag is not None:
+            self.send_header( "ETag", self.etag )
+        super().end_headers()
+
+    def log_message( self, format, *args ):
+        pass
+
+def timeFetch( files, repeat, workers = None, cold = True ):
+    """
+    Returns the best wall time (in seconds) out of repeat fetches of the given files into the current directory, and the result of the last fetch.
+    Cold fetches start without any files or validators; others revalidate the files left by the previous fetch.
+    """
+    best = None
+    for _ in range( repeat ):
+        if cold:
+            rmtree( XML_DIR, ignore_errors=True )
+        start = perf_counter()
+        with redirect_stdout( StringIO() ):
+            results = generate.fetch( files, workers )
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, results
+
+def benchmarkFetch( repeat = 3 ):
+    """Runs the fetch suite. Returns False if it couldn't be run."""
+    names = [ os.path.basename( filepath ) for _, filepath in REGISTRY_FILES ]
+    if not all( os.path.exists( filepath ) for _, filepath in REGISTRY_FILES ):
+        print( "error: The fetch suite serves the registry files in xml/; run python -m gll.generate --fetch first.\n" )
+        return False
+
+    server = ThreadingHTTPServer( ( "127.0.0.1", 0 ), partial( RegistryHandler, directory = os.path.abspath( XML_DIR ) ) )
+    Thread( target = server.serve_forever, daemon = True ).start()
+    files = [ ( f"http://127.0.0.1:{server.server_address[1]}/{name}", f"{XML_DIR}/{name}" ) for name in names ]
+
+    runs = []
+    cwd  = os.getcwd()
+    try:
+        with TemporaryDirectory() as directory:
+            os.chdir( directory )
+            try:
+                for name, workers, cold in ( ( "serial", 1, True ), ( "concurrent", None, True ), ( "revalidated", None, False ) ):
+                    seconds, results = timeFetch( files, repeat, workers, cold )
+                    downloaded = sum( size for _, _, modified, size in results if modified )
+                    saved      = sum( size for _, _, modified, size in results if not modified )
+                    runs.append( { "name": name, "seconds": seconds, "downloadedBytes": downloaded, "savedBytes": saved } )
+            finally:
+                os.chdir( cwd )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    record( "fetch", runs )
+
+    print( f"Fetching {len( files )} registry files from a local server that takes {FETCH_LATENCY * 1000:.0f}ms to answer each request:" )
+    print( f"{'fetch':<12} {'time (ms)':>10} {'downloaded (B)':>15} {'saved (B)':>10}" )
+    for run_ in runs:
+        print( f"{run_['name']:<12} {run_['seconds'] * 1000:>10.1f} {run_['downloadedBytes']:>15} {run_['savedBytes']:>10}" )
+    print()
+    return True
+
+#Benchmark suites that can be selected on the command line, in the order they run when none are selected
+SUITES = {
+    "parse":      benchmarkParse,
+    "loaders":    benchmarkLoaders,
+    "lazy":       benchmarkLazy,
+    "extensions": benchmarkExtensions,
+    "context":    benchmarkContext,
+    "resolve":    benchmarkResolve,
+    "report":     benchmarkReport,
+    "calls":      benchmarkCalls,
+    "amalgamate": benchmarkAmalgamate,
+    "modules":    benchmarkModules,
+    "pipeline":   benchmarkPipeline,
+    "model":      benchmarkModel,
+    "fetch":      benchmarkFetch
+}
+
+def main( argv ):
+    suites = []
+    repeat = 3
+    output = None
+    args   = iter( argv[1:] )
+    for arg in args:
+        if arg == "--repeat":
+            repeat = int( next( args, "3" ) )
+        elif arg == "--json":
+            output = next( args, None )
+            if output is None:
+                print( "error: Expected a file after \"--json\"." )
+                return 1
+        elif arg in SUITES:
+            suites.append( arg )
+        else:
+            print( f"error: Unrecognized suite \"{arg}\"; expected one of: {', '.join( SUITES )}." )
+            return 1
+
+    ok = True
+    for name in suites or SUITES:
+        ok = SUITES[ name ]( repeat ) and ok
+
+    if output is not None:
+        with open( output, "w" ) as fout:
+            json.dump( { "version": VERSION, "repeat": repeat, "suites": results }, fout, indent=4 )
+            fout.write( "\n" )
+    return 0 if ok else 1
+
+#Enter into main()
+if __name__ == "__main__":
+    exit( main( argv ) )
@@ -0,0 +1,70 @@
+"""
+This module implements GLL's registry cache.
+
+Parsing the OpenGL XML API Registry files is the slowest part of generation, and the files rarely change between runs.
+After a successful parse, a snapshot of the parsed model (types, enums, commands, features, extensions and which modules own what)
+is pickled to CACHE_FILE. The snapshot is keyed by a hash of every registry file and the GLL version,
+so fetching new registry files or upgrading GLL causes the next run to parse from scratch again.
+"""
+import os
+import pickle
+
+from hashlib import sha256
+
+from gll.constants import *
+
+#Bump this whenever the classes stored in the cache change in a way that makes old snapshots unusable
+FORMAT = 7
+
+def computeKey():
+    """
+    Returns a hash of the GLL version, the cache format, and the contents of each registry file.
+    Registry files that don't exist contribute their absence to the hash.
+    """
+    key = sha256( f"{VERSION}\n{FORMAT}\n".encode() )
+    for _, filepath in REGISTRY_FILES:
+        key.update( f"{filepath}\n".encode() )
+        try:
+            with open( filepath, "rb" ) as fin:
+                key.update( sha256( fin.read() ).digest() )
+        except FileNotFoundError:
+            key.update( b"missing" )
+    return key.hexdigest()
+
+def load( key ):
+    """
+    Returns the snapshot stored in the cache if it was stored with the given key, or None otherwise.
+    A cache that can't be read is treated the same as a missing one.
+    """
+    try:
+        with open( CACHE_FILE, "rb" ) as fin:
+            storedKey, state = pickle.load( fin )
+    #Missing, truncated, or written by an incompatible version of GLL
+    except Exception:
+        return None
+
+    if storedKey != key:
+        return None
+    return state
+
+def save( key, state ):
+    """Stores the given snapshot in the cache under the given key."""
+    os.makedirs( XML_DIR, exist_ok=True )
+
+    #Write to a temporary file first so an interrupted run can't leave a truncated cache behind
+    temppath = f"{CACHE_FILE}.part"
+    with open( temppath, "wb" ) as fout:
+        pickle.dump( ( key, state ), fout, protocol=pickle.HIGHEST_PROTOCOL )
+    os.replace( temppath, CACHE_FILE )
+
+def invalidate():
+    """Deletes the cache, if there is one. Returns True if a cache was deleted."""
+    try:
+        os.remove( CACHE_FILE )
+    except FileNotFoundError:
+        return False
+    return True
+
+def isCurrent():
+    """Returns True if the cache exists and matches the current registry files."""
+    return load( computeKey() ) is not None
@@ -9,73 +9,123 @@ and SourceFile and IncludeFile will enerate boilerplate comments, namespaces, in
 """
 import os.path
 
+from io  import StringIO
+from sys import intern
+
 from gll.constants import *
+from gll.util import hashText, hashFile, writeAtomically, log
 
-class Version:
-    major = 1
-    minor = 0
+class Version( tuple ):
+    """
+    A version number, e.g. 4.6. Stored as a ( major, minor ) tuple, so versions are hashable and compare in version order.
+    Can be constructed from two ints or from a "major.minor" string.
+    """
+    __slots__ = ()
 
-    def __init__( self, *args ):
+    def __new__( cls, *args ):
         if len( args ) == 2 and all( type( x ) == int for x in args ):
-            self.major, self.minor = args
+            return super().__new__( cls, args )
         elif len( args ) == 1 and type( args[0] ) == str:
-            self.major, self.minor = ( int(x) for x in args[0].split(".") )
-        else:
-            raise ValueError( "Wrong number / types of arguments provided to Version.__init__(): " + ", ".join( type(x).__name__ for x in args ) )
+            return super().__new__( cls, ( int(x) for x in args[0].split(".") ) )
+        raise ValueError( "Wrong number / types of arguments provided to Version(): " + ", ".join( type(x).__name__ for x in args ) )
+
+    #Unpickling passes these to __new__
+    def __getnewargs__( self ):
+        return tuple( self )
+
+    @property
+    def major( self ):
+        return self[0]
+    @property
+    def minor( self ):
+        return self[1]
 
     def __str__( self ):
         return f"{self.major}.{self.minor}"
-    def __lt__( self, other ):
-        return self.major < other.major or self.major == other.major and self.minor < other.minor
-    def __gt__( self, other ):
-        return self.major > other.major or self.major == other.major and self.minor > other.minor
-    def __le__( self, other ):
-        return self.major < other.major or self.major == other.major and self.minor <= other.minor
-    def __ge__( self, other ):
-        return self.major > other.major or self.major == other.major and self.minor >= other.minor
-    def __eq__( self, other ):
-        return self.major == other.major and self.minor == other.minor
-    def __ne__( self, other ):
-        return self.major != other.major or self.minor != other.minor
+
+#A set that remembers the order items were added in.
+#Backed by a dict, so adding, removing and testing for an item are O(1) no matter how large the set gets.
+class OrderedSet:
+    __slots__ = ( "items", )
+
+    def __init__( self, items = () ):
+        self.items = dict.fromkeys( items )
+
+    def add( self, item ):
+        self.items[ item ] = None
+
+    #Removes the item if it's in the set
+    def discard( self, item ):
+        self.items.pop( item, None )
+
+    def __contains__( self, item ):
+        return item in self.items
+    def __iter__( self ):
+        return iter( self.items )
+    def __len__( self ):
+        return len( self.items )
+    def __repr__( self ):
+        return f"OrderedSet( {list( self.items )} )"
 
 #Stores information about types
 class Type:
-    def __init__( self, content, name = None, comment = None, api = None ):
-        self.content = content
-        self.name    = name
-        self.comment = comment
-        self.api     = api
+    __slots__ = ( "content", "name", "comment", "api", "registry" )
+
+    def __init__( self, content, name = None, comment = None, api = None, registry = "gl" ):
+        self.content  = content
+        self.name     = name
+        self.comment  = comment
+        self.api      = api
+        self.registry = registry    #Name of the registry (see REGISTRIES) the type was defined in
 
 #Base class for Enum and Command
+#There are thousands of these, so they have slots instead of a __dict__, and the strings they share with each other are interned
+#
+#Any number of modules can require or remove an enum or command, in any order. Every one of them is recorded, in order,
+#in providers and removers respectively, so it's possible to ask e.g. which features and extensions provide glFoo, and which versions removed it.
+#The enum or command is generated in a single module, its owner: the first module that required it (see also adopt()).
+#It's in its owner's core set, or in its owner's removed set once any module has removed it.
 class GLObj:
+    __slots__ = ( "owner", "providers", "removers" )
+
     def __init__( self ):
-        self.owner = None
+        self.owner     = None
+        self.providers = ()
+        self.removers  = ()
 
     def require( self, module ):
+        self.providers += ( module, )
         if self.owner is None:
             self.owner = module
-            getattr( self.owner, self.coreList ).append( self )
+            getattr( self.owner, self.coreList ).add( self )
         else:
-            print( f"{module.name} requires {self.name} as well" )
-
-        #if extension then...
+            log.debug( "%s requires %s as well", module.name, self.name )
 
     def remove( self, module ):
+        self.removers += ( module, )
         if self.owner is not None:
-            getattr( self.owner, self.coreList    ).remove( self )
-            getattr( self.owner, self.removedList ).append( self )
-            #print( "%s removes %s" % ( module.name, self.name ) )
+            getattr( self.owner, self.coreList    ).discard( self )
+            getattr( self.owner, self.removedList ).add( self )
         else:
-            print( f"{module.name} is removing {self.name} even though it doesn't belong to anything" )
+            log.warning( "%s is removing %s even though it doesn't belong to anything", module.name, self.name )
+
+    #Makes the given module, which must be one of the providers, the owner instead
+    def adopt( self, module ):
+        removed = self in getattr( self.owner, self.removedList )
+        getattr( self.owner, self.coreList    ).discard( self )
+        getattr( self.owner, self.removedList ).discard( self )
+        self.owner = module
+        getattr( self.owner, self.removedList if removed else self.coreList ).add( self )
 
 class Enum( GLObj ):
     coreList    = "coreEnums"
     removedList = "removedEnums"
+    __slots__   = ( "name", "value" )
 
     def __init__( self, name, value ):
         super().__init__()
         self.name    = name
-        self.value   = value
+        self.value   = intern( value )
 
     def getDefinition( self, nameWidth ):
         return f"#define {self.name.ljust( nameWidth )} {self.value}"
@@ -83,15 +133,19 @@ class Enum( GLObj ):
 class Command( GLObj ):
     coreList    = "coreCommands"
     removedList = "removedCommands"
+    __slots__   = ( "rv", "name", "params", "paramNames" )
 
-    def __init__( self, rv, name, params ):
+    def __init__( self, rv, name, params, paramNames ):
         super().__init__()
-        self.rv      = rv
-        self.name    = name
-        self.params  = params
+        self.rv         = intern( rv )
+        self.name       = name
+        self.params     = tuple( intern( param ) for param in params )
+        self.paramNames = tuple( intern( param ) for param in paramNames )    #Just the name of each parameter in params
 
-        #Prototype name for this command (of the form PFN...PROC, where ... is the function's name in uppercase)
-        self.prototypeName = f"PFN{name.upper()}PROC"
+    #Prototype name for this command (of the form PFN...PROC, where ... is the function's name in uppercase)
+    @property
+    def prototypeName( self ):
+        return f"PFN{self.name.upper()}PROC"
 
     #Function prototype appearing in an .hpp file
     #Needed by declarations and definitions of this command
@@ -112,28 +166,124 @@ class Command( GLObj ):
     def getDefinition( self, ptnameWidth, nameWidth ):
         return f"{self.prototypeName.ljust( ptnameWidth )} {self.name.ljust( nameWidth )} = nullptr;"
 
+    #Replaces the definition in a .cpp file when using lazy loaders; the command starts out pointing at its trampoline
+    def getLazyDefinition( self, ptnameWidth, nameWidth ):
+        return f"{self.prototypeName.ljust( ptnameWidth )} {self.name.ljust( nameWidth )} = {self.trampolineName};"
+
+    #Name of the trampoline a command points at until it's resolved (lazy loaders only)
+    @property
+    def trampolineName( self ):
+        return f"resolve_{self.name}"
+
+    #Trampoline appearing in a .cpp file when using lazy loaders.
+    #On the first call it resolves the command, patches the command's pointer so later calls go straight to the driver, and forwards the call.
+    #If the command can't be resolved, the pointer is left alone and the call returns 0 (nullptr, false, etc.) without doing anything;
+    #getProcAddress() has already recorded the failure in the load report, if there is one.
+    #The pointer is patched with a plain store, so the first call of each command mustn't race with other calls of the same command.
+    def getTrampoline( self ):
+        if len( self.params ) > 0:
+            paramsString = " {} ".format( ", ".join( self.params ) )
+            argsString   = " {} ".format( ", ".join( self.paramNames ) )
+        else:
+            paramsString = ""
+            argsString   = ""
+
+        missing = "return;" if self.rv.strip() == "void" else "return {};"
+        return (
+            f"static {self.rv} GLAPI {self.trampolineName}({paramsString}) {{\n"
+            f"    {self.prototypeName} address = ( {self.prototypeName} )getProcAddress( \"{self.name}\" );\n"
+             "    if( !address )\n"
+            f"        {missing}\n"
+            f"    {self.name} = address;\n"
+            f"    return address({argsString});\n"
+             "}"
+        )
+
+    #Member of the function table of the module that owns the command (table loaders only)
+    def getTableMember( self, ptnameWidth ):
+        return f"{self.prototypeName.ljust( ptnameWidth )} {self.name};"
+
+    #Replaces the declaration in an .hpp file when using table loaders.
+    #The command's name becomes a reference to its slot in the given table; it's constexpr, so calls through it cost the same as calls through a plain pointer.
+    def getTableReference( self, ptnameWidth, nameWidth, table ):
+        return f"inline constexpr {( self.prototypeName + '&' ).ljust( ptnameWidth + 1 )} {self.name.ljust( nameWidth )} = {table}.{self.name};"
+
+    #Replaces the declaration in an .hpp file when using context loaders.
+    #Calls the command through the given member of the calling thread's current dispatch table.
+    def getDispatchWrapper( self, member ):
+        if len( self.params ) > 0:
+            paramsString = " {} ".format( ", ".join( self.params ) )
+            argsString   = " {} ".format( ", ".join( self.paramNames ) )
+        else:
+            paramsString = ""
+            argsString   = ""
+
+        return f"inline {self.rv} {self.name}({paramsString}) {{ return currentTable->{member}.{self.name}({argsString}); }}"
+
+    #Name of the wrapper that counts and times calls to the command, and of the pointer it forwards them to, respectively (--call-profile only)
+    @property
+    def profileWrapperName( self ):
+        return f"profile_{self.name}"
+
+    @property
+    def profiledName( self ):
+        return f"real_{self.name}"
+
+    #Wrapper appearing in a .cpp file when generating call profiles.
+    #Counts and times the call in the given CallStats, and forwards it to the address the command was loaded with.
+    def getProfileWrapper( self, stats ):
+        if len( self.params ) > 0:
+            paramsString = " {} ".format( ", ".join( self.params ) )
+            argsString   = " {} ".format( ", ".join( self.paramNames ) )
+        else:
+            paramsString = ""
+            argsString   = ""
+
+        return (
+            f"static {self.rv} GLAPI {self.profileWrapperName}({paramsString}) {{\n"
+            f"    CallTimer timer( {stats} );\n"
+            f"    return {self.profiledName}({argsString});\n"
+             "}"
+        )
+
+    #Appears in a function that loads the command, after its load statement, when generating call profiles.
+    #If the command loaded, keeps its address for the wrapper and points the command at the wrapper instead.
+    def getProfileStatement( self, nameWidth ):
+        return f"if( ( {self.profiledName.ljust( nameWidth + 5 )} = {self.name.ljust( nameWidth )} ) ) {self.name.ljust( nameWidth )} = {self.profileWrapperName};"
+
     #Appears in a function that loads the command
     def getLoadStatement( self, nameWidth, ptnameWidth ):
         nameQuotedJustified = ( f"\"{self.name}\"" ).ljust( nameWidth + 2 )
         return f"if( !( {self.name.ljust( nameWidth )} = ( {self.prototypeName.ljust( ptnameWidth )} )getProcAddress( {nameQuotedJustified} ) ) ) ++fail;"
 
 class Module:
-    def __init__( self, name ):
+    __slots__ = (
+        "name", "registry",
+        "coreEnums", "coreCommands", "coreLoadFunction", "coreTable",
+        "removedEnums", "removedCommands", "removedLoadFunction", "removedTable",
+        "coreEnumWidth", "coreReturnValueWidth", "corePrototypeWidth", "coreFunctionNameWidth",
+        "removedEnumWidth", "removedReturnValueWidth", "removedPrototypeWidth", "removedFunctionNameWidth"
+    )
+
+    def __init__( self, name, registry ):
         self.name         = name
+        self.registry     = registry    #Name of the registry (see REGISTRIES) the module was defined in
 
         #Core
-        self.coreEnums           = []
-        self.coreCommands        = []
+        self.coreEnums           = OrderedSet()
+        self.coreCommands        = OrderedSet()
         self.coreLoadFunction    = f"load_mod_{name}"
+        self.coreTable           = f"table_mod_{name}"
 
         #Removed
-        self.removedEnums        = []
-        self.removedCommands     = []
+        self.removedEnums        = OrderedSet()
+        self.removedCommands     = OrderedSet()
         self.removedLoadFunction = f"load_mod_{name}_rem"
+        self.removedTable        = f"table_mod_{name}_rem"
 
     #Calling this tells the enum/command that this module requires it
     #If it is the first module to do so it becomes its "owner",
-    #and is added to this module's core list
+    #and is added to this module's core set
     def require( self, obj ):
         obj.require( self )
 
@@ -155,25 +305,41 @@ class Module:
         self.removedFunctionNameWidth = max( ( len( command.name          ) for command in self.removedCommands ), default=0 )    #Function names
 
 class Feature( Module ):
-    def __init__( self, api, number ):
+    __slots__ = ( "api", "version", "loadFunction", "compatLoadFunction" )
+
+    def __init__( self, api, number, registry ):
         #Parse version from number string; ensures number matches "\d.\d" format
         version = Version( number )
         
         #Name follows the following format: "namespace_major_minor"
         name = "{}_{}".format( api, str( version ).replace( ".", "_" ) )
 
-        super().__init__( name )
+        super().__init__( name, registry )
         self.api     = api
         self.version = version
 
+        #Loads this feature's modules and those of every earlier version of the same API; the second also loads removed modules (compatibility profile)
+        self.loadFunction       = f"load_{name}"
+        self.compatLoadFunction = f"load_{name}_comp"
+
 class Extension( Module ):
-    def __init__( self, name, apis ):
-        super().__init__( name )
-        self.apis = apis
+    __slots__ = ( "apis", )
+
+    def __init__( self, name, apis, registry ):
+        super().__init__( name, registry )
+        self.apis = tuple( intern( api ) for api in apis )
 
 class SourceFile:
     basePath = SRC_PROJECT_DIR
 
+    #Paths of files written and files left untouched because their content didn't change, respectively, and the number of bytes written
+    written   = []
+    unchanged = []
+    emitted   = 0
+
+    #If this is a dict, files are rendered into it (path: content) instead of being written to disk
+    captured  = None
+
     def __init__( self, path ):
         self.path         = f"{self.basePath}/{path}"
         self.relativePath = path
@@ -208,14 +374,45 @@ class SourceFile:
     def write( self, str ):
         self.fout.write( str )
 
+    #Content is rendered into memory, and only written to disk (see __exit__) if it differs from what's already there
     def __enter__( self ):
-        self.fout = open( self.path, "w" )
+        self.fout = StringIO()
         return self
 
     def __exit__( self, exc_type, exc_value, traceback ):
-        self.fout.close()
+        content   = self.fout.getvalue()
         self.fout = None
 
+        #Don't write anything if the file couldn't be generated
+        if exc_type is not None:
+            return
+
+        if SourceFile.captured is not None:
+            SourceFile.captured[ self.path ] = content
+            return
+
+        if hashText( content ) == hashFile( self.path ):
+            SourceFile.unchanged.append( self.path )
+        else:
+            writeAtomically( self.path, content )
+            SourceFile.written.append( self.path )
+            SourceFile.emitted += len( content.encode() )
+
+    #Forgets which files have been written / left untouched so far
+    @staticmethod
+    def resetStats():
+        SourceFile.written.clear()
+        SourceFile.unchanged.clear()
+        SourceFile.emitted = 0
+
+    #Returns copies of the files written and left untouched so far, and the number of bytes written
+    @staticmethod
+    def stats():
+        return list( SourceFile.written ), list( SourceFile.unchanged ), SourceFile.emitted
+
+class BenchmarkFile( SourceFile ):
+    basePath = BENCH_DIR
+
 class IncludeFile( SourceFile ):
     basePath = INC_PROJECT_DIR
 
@@ -33,10 +33,35 @@ REGISTRY_FILES = (
     ( WGL_URL, WGL_FILE )
 )
 
+#List of registries that are parsed; each entry is a tuple consisting of the registry's name and the path of its file.
+#Every type and module records the name of the registry it came from, which determines the files it's generated into.
+#gl.xml must come first (see gll.generate.parse).
+REGISTRIES = (
+    ( "gl",  GL_FILE  ),
+    ( "glx", GLX_FILE ),
+    ( "wgl", WGL_FILE ),
+    ( "egl", EGL_FILE )
+)
+
+#The ETag and Last-Modified headers each registry file was last fetched with are stored here, so unchanged files aren't downloaded again
+FETCH_FILE = f"{XML_DIR}/fetch.json"
+
+#Seconds to wait for a registry server to respond before giving up
+FETCH_TIMEOUT = 30
+
+#Summary of the registry the output was last generated from, and which files each generation job wrote, for --incremental
+GENERATED_FILE = f"{XML_DIR}/generated.snapshot"
+
+#Snapshot of the parsed registry files is cached here
+CACHE_FILE = f"{XML_DIR}/registry.cache"
+
 #Extension to use for source files and includes (headers), respectively
 SRC_EXT = "cpp"
 INC_EXT = "hpp"
 
+#Extension to use for C++20 module interface units
+MODULE_EXT = "cppm"
+
 #Name of the project; affects folder names
 PROJECT_NAME = "gll"
 
@@ -57,3 +82,47 @@ GUARD_PREFIX = "GLL_"
 #The name that will be given to the types and extensions files (sans extension), respectively
 TYPES_FILE = "gl_types"
 EXT_FILE   = "gl_ext"
+
+#The name that will be given to each registry's types file (sans extension)
+TYPES_FILES = {
+    "gl":  TYPES_FILE,
+    "glx": "glx_types",
+    "wgl": "wgl_types",
+    "egl": "egl_types"
+}
+
+#Window system registries don't declare the platform types they use (e.g. Display, HDC); their types files include these headers for them
+PLATFORM_INCLUDES = {
+    "glx": ( "X11/Xlib.h", "X11/Xutil.h" ),
+    "wgl": ( "windows.h", ),
+    "egl": ()
+}
+
+#Window system registries that only exist on some platforms; their loaders are only compiled when the given preprocessor condition holds
+PLATFORM_CONDITIONS = {
+    "glx": "defined( __linux__ )",
+    "wgl": "defined( _WIN32 )"
+}
+
+#The name that will be given to the loader source and header files (sans extension)
+LOADER_FILE = "loader"
+
+#The name that will be given to the load report header (sans extension); see GLL_LOAD_REPORT in it
+REPORT_FILE = "report"
+
+#The name that will be given to the call profile header and source (sans extension); see --call-profile
+CALL_PROFILE_FILE = "callprofile"
+
+#The name that will be given to the fake OpenGL implementation's header and source (sans extension); see --fake
+FAKE_FILE = "fake"
+
+#The load benchmark (see --fake) is output to this directory, under this name (sans extension).
+#It's a program rather than part of the library, so it's kept out of SRC_PROJECT_DIR.
+BENCH_DIR  = "bench"
+BENCH_FILE = "load"
+
+#Extensions of the C/C++ source files --scan looks for symbols in
+SCAN_EXTENSIONS = ( ".c", ".cc", ".cpp", ".cxx", ".h", ".hh", ".hpp", ".hxx", ".inl", ".ipp" )
+
+#The name that will be given to the dispatch table source and header files (sans extension); only generated for context loaders
+DISPATCH_FILE = "dispatch"
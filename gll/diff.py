@@ -0,0 +1,145 @@
+"""
+This module compares parsed registries, for --incremental.
+
+A parsed registry is reduced to a summary with summarize(): plain tuples of the names, values and signatures of every type, and of the enums
+and commands of every feature and extension, in the order they're generated in. Summaries don't refer to any of GLL's classes,
+so they can be stored between runs and read back by any version of GLL. compare() works out what changed between two summaries,
+module by module, and report() prints it.
+"""
+
+#Bump this whenever the layout of summaries changes, so summaries stored by older versions aren't compared against newer ones
+FORMAT = 1
+
+#Labels of a module's lists of enums and commands, in the order summarize() stores them
+LISTS = ( "enums", "commands", "removed enums", "removed commands" )
+
+def summarize( state ):
+    """Returns a summary of a snapshot returned by gll.generate.capture()."""
+    def enumList( enums ):
+        return tuple( ( enum.name, enum.value ) for enum in enums )
+
+    def commandList( commands ):
+        return tuple( ( command.name, command.rv, command.params ) for command in commands )
+
+    def moduleLists( module ):
+        return ( enumList( module.coreEnums ), commandList( module.coreCommands ), enumList( module.removedEnums ), commandList( module.removedCommands ) )
+
+    types = {}
+    for typer in ( *state["includeTypes"], *state["types"] ):
+        types.setdefault( typer.registry, [] ).append( ( typer.content, typer.name, typer.comment, typer.api ) )
+
+    modules = {}
+    for feature in state["features"]:
+        modules[ ( "feature", feature.name ) ] = ( feature.registry, feature.api, tuple( feature.version ), moduleLists( feature ) )
+    for extension in state["extensions"]:
+        modules[ ( "extension", extension.name ) ] = ( extension.registry, extension.apis, None, moduleLists( extension ) )
+
+    return { "types": { registry: tuple( registryTypes ) for registry, registryTypes in types.items() }, "modules": modules }
+
+class ModuleChange:
+    """
+    How a feature or extension changed between two registries.
+    status is "added", "removed" or "changed". registry, api (of features), apis (of extensions) and version (of features, as a tuple)
+    describe the module as it is in the newer registry, or in the older one if it was removed.
+    lists maps the label (see LISTS) of each of the module's lists that changed to the ( gained, lost, changed ) names in it;
+    reordered is True if the module has the same enums and commands as before, but in a different order.
+    """
+    def __init__( self, kind, name, status, summary ):
+        registry, api, version, _ = summary
+        self.kind      = kind
+        self.name      = name
+        self.status    = status
+        self.registry  = registry
+        self.api       = api if kind == "feature" else None
+        self.apis      = api if kind == "extension" else ()
+        self.version   = version
+        self.lists     = {}
+        self.reordered = False
+
+    def names( self ):
+        """Returns the names of every enum and command that was gained, lost or changed."""
+        return { name for gained, lost, changed in self.lists.values() for name in ( *gained, *lost, *changed ) }
+
+class RegistryDiff:
+    """
+    What changed between two registries.
+    types lists the registries whose types changed; modules is a ModuleChange for each feature and extension that changed.
+    """
+    def __init__( self ):
+        self.types   = []
+        self.modules = []
+
+    def isEmpty( self ):
+        return len( self.types ) == 0 and len( self.modules ) == 0
+
+def compareList( old, new ):
+    """Returns the ( gained, lost, changed ) names between two lists of a module, or None if they're the same."""
+    if old == new:
+        return None
+    oldItems = { item[0]: item for item in old }
+    newItems = { item[0]: item for item in new }
+    gained   = [ name for name in newItems if name not in oldItems ]
+    lost     = [ name for name in oldItems if name not in newItems ]
+    changed  = [ name for name, item in newItems.items() if name in oldItems and oldItems[ name ] != item ]
+    return gained, lost, changed
+
+def compare( old, new ):
+    """Returns a RegistryDiff of what changed from the old summary to the new one."""
+    changes = RegistryDiff()
+    for registry in { **old["types"], **new["types"] }:
+        if old["types"].get( registry ) != new["types"].get( registry ):
+            changes.types.append( registry )
+
+    oldModules = old["modules"]
+    newModules = new["modules"]
+    for key, summary in newModules.items():
+        if key not in oldModules:
+            change = ModuleChange( *key, "added", summary )
+            for label, items in zip( LISTS, summary[3] ):
+                if len( items ) > 0:
+                    change.lists[ label ] = ( [ item[0] for item in items ], [], [] )
+            changes.modules.append( change )
+        elif oldModules[ key ] != summary:
+            change = ModuleChange( *key, "changed", summary )
+            for label, oldItems, newItems in zip( LISTS, oldModules[ key ][3], summary[3] ):
+                listChange = compareList( oldItems, newItems )
+                if listChange is not None and any( len( names ) > 0 for names in listChange ):
+                    change.lists[ label ] = listChange
+            change.reordered = len( change.lists ) == 0
+            changes.modules.append( change )
+    for key, summary in oldModules.items():
+        if key not in newModules:
+            change = ModuleChange( *key, "removed", summary )
+            for label, items in zip( LISTS, summary[3] ):
+                if len( items ) > 0:
+                    change.lists[ label ] = ( [], [ item[0] for item in items ], [] )
+            changes.modules.append( change )
+    return changes
+
+def describeNames( verb, label, names ):
+    """Returns e.g. "gained 2 enums (GL_A, GL_B)", listing at most 10 names."""
+    noun = label if len( names ) != 1 else label[:-1]
+    listed = ", ".join( names[:10] ) + ( ", ..." if len( names ) > 10 else "" )
+    return f"{verb} {len( names )} {noun} ({listed})"
+
+def report( changes ):
+    """Prints a line for each registry whose types changed and each module that changed."""
+    if changes.isEmpty():
+        print( "No changes since the previous registry." )
+        return
+
+    print( "Changes since the previous registry:" )
+    for registry in changes.types:
+        print( f"    {registry} types changed" )
+    for change in changes.modules:
+        parts = []
+        for label, ( gained, lost, changed ) in change.lists.items():
+            for verb, names in ( ( "gained", gained ), ( "lost", lost ), ( "changed", changed ) ):
+                if len( names ) > 0:
+                    parts.append( describeNames( verb, label, names ) )
+        if change.reordered:
+            parts.append( "reordered its enums or commands" )
+        details = "; ".join( parts )
+        if change.status != "changed":
+            details = change.status + ( "" if details == "" else f": {details}" )
+        print( f"    {change.kind} {change.name}: {details}" )
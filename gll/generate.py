@@ -4,38 +4,51 @@ Implements functions to download and parse the OpenGL XML API Registry files, as
 It also processes options from the user to determine which function to invoke.
 """
 
-#TODO: * commands and enums can be required in multiple places.
-#        commands and enums can be required by one feature, removed by another, then required again by an extension.
-#        :dealwithit:
+#TODO: * commands and enums can be required by one feature, removed by another, then required again by an extension.
+#        Every module that requires or removes them is recorded (see GLObj), but each is still generated in just its owner,
+#        so extensions don't load the commands they share with core versions.
 #      * compatibility profiles (newer versions of OpenGL remove commands and enums added by earlier versions)
 #        Non-removed stuff goes in the core folder
 #        Removed stuff should go in the removed folder
 #        When including headers and loading functions for contexts older than OpenGL 3.1,
 #        load both core and removed functionality (because contexts that old haven't removed it yet!).
-#      * Load and generate wgl and glx stuff
-#      * Need main file + header that ties this all together
+#      * Load wgl, glx and egl stuff (only their module loaders are generated so far)
+#      * Load wgl, glx and egl extensions
 
 #Standard library
-import xml.etree.ElementTree as ET
 import sys
 import os.path
-
-from sys       import argv, exit, stderr
-from traceback import print_exc
-from os        import rmdir
-from os.path   import basename as path_basename, dirname as path_dirname
-from tempfile  import NamedTemporaryFile
-from shutil    import move, rmtree
-from re        import compile as re_compile
+import json
+import pickle
+import logging
+import cProfile
+
+from sys        import argv, exit, stderr
+from traceback  import print_exc
+from os         import rmdir
+from os.path    import basename as path_basename, dirname as path_dirname
+from tempfile   import NamedTemporaryFile
+from shutil     import move, rmtree
+from re         import compile as re_compile
+from io         import StringIO
+from contextlib import redirect_stdout, contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 #Our stuff
 from gll.constants import *
-from gll.util import innerText, error, tagError
-from gll.classes import Version, Type, Enum, Command, Feature, Extension, SourceFile, IncludeFile
+from gll.util import innerText, error, tagError, cpuCount, log
+from gll.classes import Version, OrderedSet, Type, Enum, Command, Feature, Extension, SourceFile, IncludeFile, BenchmarkFile
+from gll.perfecthash import PerfectHash, writeLookup
+from gll import cache
+from gll import profile
+from gll import xmlbackend
+from gll import diff
 
 #Third party
 import requests
 
+from requests.adapters import HTTPAdapter
+
 #OpenGL split into core and compatibility profiles in OpenGL 3.1
 PROFILES_SINCE = Version( 3, 1 )
 
@@ -50,27 +63,113 @@ commands     = {}
 features     = []
 extensions   = []
 
+#Options that take no value and select what the program does
+ACTIONS = ( "--clean", "--fetch", "--generate", "--clean-cache", "--cache-status", "--version", "--help" )
+
+#Number of worker processes to generate files with; 1 generates everything in this process
+jobs         = 1
+
+#How generated module loaders resolve their commands; one of LOADER_STYLES
+LOADER_STYLES = ( "statements", "table", "lazy", "context" )
+loaderStyle  = "statements"
+
+#True if the last call to loadOrParse() loaded the registry from the cache instead of parsing it
+cacheHit     = False
+
+#Names of the user headers (e.g. "gl_4_6_comp") to generate amalgamations for, instead of the split layout. See --amalgamate.
+amalgamateTargets = []
+
+#If True, a C++20 module interface unit is generated for each user header as well. See --modules.
+modules      = False
+
+#If True, every command is given a wrapper that counts and times its calls, used in builds that define GLL_CALL_PROFILE. See --call-profile.
+callProfile  = False
+
+#If True, a fake OpenGL implementation and a benchmark of the loaders that runs against it are generated as well. See --fake.
+fake         = False
+
+#If True, only the files affected by changes to the registry since the output was last generated are regenerated. See --incremental.
+incremental  = False
+
+#Older registry file or generation snapshot to compare the registry against instead of GENERATED_FILE, or None. See --since.
+sincePath    = None
+
+#Names of the enums and commands to generate; None generates everything. See --symbols and --scan.
+usedSymbols  = None
+
+#How much is logged; one of LOG_LEVELS. See --log-level.
+LOG_LEVELS   = ( "debug", "info", "warning", "error" )
+logLevel     = "warning"
+
+#Files to write the --profile trace to as JSON, and cProfile statistics to, respectively; None writes nothing
+profileJsonPath  = None
+profileStatsPath = None
+
+#Matches identifiers that may name an enum or command in C/C++ source code
+SYMBOL_PATTERN = re_compile( r"\b(?:gl|glX|wgl|egl)[A-Z]\w*|\b(?:GL|GLX|WGL|EGL)_\w+" )
+
 def main( argv ):
+    global profileJsonPath, profileStatsPath, incremental
     try:
-        argc = len( argv ) - 1
-        if argc == 0:
-            help()
-        elif argc == 1:
-            arg = argv[1];
-            if   arg == "--clean":
+        action = None
+        args   = iter( argv[1:] )
+        for arg in args:
+            #Options that modify how an action is carried out
+            if arg == "--jobs":
+                setJobs( next( args, None ) )
+            elif arg == "--loader":
+                setLoaderStyle( next( args, None ) )
+            elif arg == "--amalgamate":
+                addAmalgamateTarget( next( args, None ) )
+            elif arg == "--modules":
+                enableModules()
+            elif arg == "--call-profile":
+                enableCallProfile()
+            elif arg == "--fake":
+                enableFake()
+            elif arg == "--profile":
+                profile.enabled = True
+            elif arg == "--profile-json":
+                profileJsonPath = expectFile( arg, next( args, None ) )
+            elif arg == "--profile-stats":
+                profileStatsPath = expectFile( arg, next( args, None ) )
+            elif arg == "--log-level":
+                setLogLevel( next( args, None ) )
+            elif arg == "--xml-backend":
+                xmlbackend.select( next( args, None ) )
+            elif arg == "--incremental":
+                incremental = True
+            elif arg == "--since":
+                setSince( next( args, None ) )
+            elif arg == "--symbols":
+                addSymbolsFile( next( args, None ) )
+            elif arg == "--scan":
+                addScannedSymbols( next( args, None ) )
+            #Actions; at most one can be given
+            elif arg in ACTIONS:
+                if action is not None:
+                    raise RuntimeError( f"Expected at most 1 action but received \"{action}\" and \"{arg}\"." )
+                action = arg
+            else:
+                raise RuntimeError( f"Unrecognized option \"{arg}\"." )
+
+        logging.basicConfig( level = logLevel.upper(), format = "%(levelname)s: %(message)s" )
+
+        with profiling():
+            if   action is None or action == "--help":
+                help()
+            elif action == "--clean":
                 clean()
-            elif arg == "--fetch":
+            elif action == "--fetch":
                 fetch()
-            elif arg == "--generate":
+            elif action == "--generate":
                 parse_and_generate()
-            elif arg == "--version":
+            elif action == "--clean-cache":
+                clean_cache()
+            elif action == "--cache-status":
+                cache_status()
+            elif action == "--version":
                 print( VERSION )
-            elif arg == "--help":
-                help()
-            else:
-                raise RuntimeError( f"Unrecognized option \"{arg}\"." )
-        else:
-            raise RuntimeError( f"Expected at most 1 command-line argument but received {argc}." )
     except RuntimeError as e:
         if len( e.args ) > 0:
             print( f"error: {e.args[0]}", file=stderr )
@@ -101,30 +200,298 @@ Description:
 
 Options:
     --fetch     Fetch the latest OpenGL XML API Registry files.
+                Files are downloaded concurrently; files that haven't
+                changed on the server since the last fetch aren't
+                downloaded again.
     --clean     Delete generated C++ source code and headers.
     --generate  Generate C++ source code and headers.
+                The parsed registry is cached; if the registry files
+                haven't changed since the last run, parsing is skipped.
+    --clean-cache
+                Delete the parsed registry cache, forcing the next
+                --generate to parse the registry files again.
+    --cache-status
+                Report whether the parsed registry cache is up-to-date
+                with the registry files.
     --version   Print gll.generate version and exit immediately.
-    --help      Print this help text and exit immediately."""
+    --help      Print this help text and exit immediately.
+    --jobs N    Used with --generate. Render files in N worker processes.
+                Output is identical to rendering them in a single process.
+    --loader STYLE
+                Used with --generate. Selects how module loaders are
+                generated:
+                  statements  One load statement and one pointer variable
+                              per command (default).
+                  table       Each module's pointers are gathered in a
+                              table that's filled by a single loop over
+                              a packed string of command names. Command
+                              names become references into the table.
+                              Loads as fast as statements (each command
+                              is still looked up once), but with smaller
+                              objects and far fewer relocations.
+                  lazy        Like statements, but each pointer starts
+                              out pointing at a trampoline that resolves
+                              the command on its first call. Load() is
+                              optional; calling it resolves everything
+                              up front, as with statements. Calls of
+                              commands that can't be resolved return 0.
+                              The first call of each command mustn't
+                              race with other calls of it; call Load()
+                              first if it could.
+                  context     Every OpenGL and extension command is kept
+                              in a DispatchTable; Load( table ) fills one
+                              for the current context, and MakeCurrent()
+                              selects the calling thread's table. Window
+                              system commands use statements.
+    --amalgamate TARGET
+                Used with --generate. Instead of a header and source per
+                module, write a single self-contained header and source
+                for TARGET, the name of a user header (e.g. gl_4_6_comp).
+                Can be given more than once. Not available with context
+                loaders.
+    --modules   Used with --generate. Also write a C++20 module interface
+                unit (src/gll/TARGET.cppm) for each OpenGL user header,
+                exporting it as module gll.TARGET (e.g. import
+                gll.gl_4_6_comp;). Enums become constexpr variables.
+                A unit contains every definition its target needs, so
+                build it instead of the split sources, not alongside
+                them. Headers are still generated. Not available with
+                context loaders.
+    --call-profile
+                Used with --generate. Also write a wrapper for every command
+                that counts its calls and the time they take, and
+                callprofile.hpp, whose DumpCallProfile() writes them out,
+                slowest first. The wrappers are only compiled in builds
+                that define GLL_CALL_PROFILE (premake5.lua's profile
+                configuration does); other builds are unaffected. Not
+                available with lazy or context loaders.
+    --fake      Used with --generate. Also write fake.hpp, whose
+                ResolveFake() can be passed to SetResolver() to load
+                against a stand-in OpenGL implementation instead of a real
+                one, e.g. in CI, and bench/load.cpp, a program that times
+                every version loader and Load() against it, with every
+                command available and with only those of an OpenGL 3.3
+                core context. Not available with --amalgamate.
+    --symbols FILE
+                Used with --generate. Only generate the enums and commands
+                named in FILE (one per line; # starts a comment), and the
+                ones GLL needs itself. Can be given more than once, and
+                combined with --scan.
+    --scan DIR  Used with --generate. Only generate the enums and commands
+                whose names appear in the C/C++ sources under DIR, and the
+                ones GLL needs itself. Can be given more than once.
+    --profile   Report the time and peak memory of each phase of the run,
+                along with counts of what was parsed and written. Times of
+                phases run by --jobs workers are summed across workers.
+                Measuring memory makes the run noticeably slower.
+    --profile-json FILE
+                Implies --profile. Also write the report to FILE as JSON.
+    --profile-stats FILE
+                Implies --profile. Also run under cProfile and write its
+                statistics to FILE (readable with python -m pstats).
+                Only covers this process, not --jobs workers.
+    --log-level LEVEL
+                How much diagnostic output to show: debug, info, warning
+                (default) or error. debug shows, among other things, each
+                enum and command required by more than one module.
+    --xml-backend BACKEND
+                Used with --generate. Selects the XML parser the registry
+                files are parsed with:
+                  etree  expat, through Python's xml.etree.ElementTree
+                         (default).
+                  lxml   libxml2, through lxml. Needs lxml installed.
+                Both produce the same output.
+    --incremental
+                Used with --generate. Compare the registry with the one
+                the output was last generated from, print what changed,
+                and only regenerate the files the changes affect: the
+                modules that gained, lost or changed enums or commands,
+                and the user headers, loaders and extension files that
+                depend on them. Everything is regenerated if the output
+                was generated with different options or by another
+                version of GLL.
+    --since FILE
+                Implies --incremental. Compare the registry with FILE
+                instead: an older copy of one of the registry files
+                (e.g. old/gl.xml; the other registries are taken as they
+                are now), or a copy of xml/generated.snapshot from an
+                earlier run. The output must have been generated from
+                that registry. Not available with --amalgamate."""
     )
 
-def fetch():
+def setLoaderStyle( value ):
+    global loaderStyle
+    if value not in LOADER_STYLES:
+        raise RuntimeError( "Expected one of {} after \"--loader\".".format( ", ".join( LOADER_STYLES ) ) )
+    loaderStyle = value
+
+def addAmalgamateTarget( value ):
+    if value is None:
+        raise RuntimeError( "Expected the name of a user header (e.g. gl_4_6_comp) after \"--amalgamate\"." )
+    amalgamateTargets.append( value )
+
+def expectFile( option, path ):
+    if path is None:
+        raise RuntimeError( f"Expected a file after \"{option}\"." )
+    #Options that export profiling results imply --profile
+    profile.enabled = True
+    return path
+
+def setLogLevel( value ):
+    global logLevel
+    if value not in LOG_LEVELS:
+        raise RuntimeError( "Expected one of {} after \"--log-level\".".format( ", ".join( LOG_LEVELS ) ) )
+    logLevel = value
+
+@contextmanager
+def profiling():
+    """
+    Profiles the enclosed block if --profile was given, then reports the results and writes them to any files requested.
+    With --profile-stats, the block is run under cProfile as well. Profiles are written even if the block fails.
+    """
+    profiler = None
+    if profileStatsPath is not None:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    #Stays None if starting the measurement fails, so the error that caused it isn't hidden
+    measurement = None
+    try:
+        with profile.Measurement() as measurement:
+            yield
+    finally:
+        if measurement is not None:
+            profile.add( "total", measurement.seconds, measurement.peak )
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats( profileStatsPath )
+        profile.report()
+        if profileJsonPath is not None:
+            profile.writeJson( profileJsonPath )
+
+def enableModules():
+    global modules
+    modules = True
+
+def enableCallProfile():
+    global callProfile
+    callProfile = True
+
+def enableFake():
+    global fake
+    fake = True
+
+def setSince( path ):
+    global sincePath, incremental
+    if path is None:
+        raise RuntimeError( "Expected an older registry file or a generation snapshot after \"--since\"." )
+    sincePath   = path
+    incremental = True
+
+def addSymbolsFile( path ):
+    global usedSymbols
+    if path is None:
+        raise RuntimeError( "Expected a file after \"--symbols\"." )
+    try:
+        with open( path, "r" ) as fin:
+            lines = fin.readlines()
+    except OSError as e:
+        raise RuntimeError( f"Couldn't read symbols file \"{path}\": {e.strerror}." )
+
+    symbols = { line.split( "#", 1 )[0].strip() for line in lines }
+    symbols.discard( "" )
+    usedSymbols = ( usedSymbols or set() ) | symbols
+
+def addScannedSymbols( path ):
+    global usedSymbols
+    if path is None or not os.path.isdir( path ):
+        raise RuntimeError( "Expected a directory after \"--scan\"." )
+    usedSymbols = ( usedSymbols or set() ) | scanSymbols( path )
+
+def scanSymbols( path ):
+    """
+    Returns every identifier in the C/C++ source files under the given directory that may name an enum or command.
+    GLL's own output directories are skipped, since everything in them would count as used.
+    """
+    skip    = { os.path.abspath( SRC_PROJECT_DIR ), os.path.abspath( INC_PROJECT_DIR ) }
+    symbols = set()
+    for dirpath, dirnames, filenames in os.walk( path ):
+        dirnames[:] = [ dirname for dirname in dirnames if os.path.abspath( os.path.join( dirpath, dirname ) ) not in skip ]
+        for filename in filenames:
+            if os.path.splitext( filename )[1] not in SCAN_EXTENSIONS:
+                continue
+            with open( os.path.join( dirpath, filename ), "r", errors="replace" ) as fin:
+                symbols.update( SYMBOL_PATTERN.findall( fin.read() ) )
+    return symbols
+
+def setJobs( value ):
+    global jobs
+    try:
+        jobs = int( value )
+    except ( TypeError, ValueError ):
+        jobs = 0
+    if jobs < 1:
+        raise RuntimeError( "Expected a positive number of jobs after \"--jobs\"." )
+
+def fetch( files = REGISTRY_FILES, workers = None ):
     """
-    Fetches up-to-date copies of the OpenGL XML API Registry files.
+    Fetches up-to-date copies of the given registry files (by default, the OpenGL XML API Registry files).
+    The files are downloaded concurrently over a shared pool of connections; workers limits how many are downloaded at once (all of them by default).
+    Files that were fetched before are revalidated with the ETag and Last-Modified headers the server sent last time (see FETCH_FILE),
+    so files that haven't changed come back as 304 Not Modified and aren't transferred again.
+    Returns a list of ( url, filepath, modified, size ) tuples, one per file; size is the number of bytes downloaded, or the size of the file on disk if it wasn't modified.
     """
     #Create the local XML API Registry directory if it doesn't exist yet:
     os.makedirs( XML_DIR, exist_ok=True )
 
-    #Download each file:
-    for url, filepath in REGISTRY_FILES:
-        directory = path_dirname(  filepath )
-        prefix    = path_basename( filepath )
-        if prefix != "":
-            prefix += "."
+    validators = loadValidators()
+    with requests.Session() as session:
+        #Keep a connection open for each file being downloaded at once
+        adapter = HTTPAdapter( pool_maxsize = len( files ) )
+        session.mount( "http://",  adapter )
+        session.mount( "https://", adapter )
+
+        with ThreadPoolExecutor( workers or len( files ) ) as pool:
+            results = list( pool.map( lambda file: fetchFile( session, *file, validators ), files ) )
+    saveValidators( validators )
+
+    downloaded = 0
+    saved      = 0
+    for url, filepath, modified, size in results:
+        if modified:
+            print( f"Downloaded {url} to {filepath} ({size} bytes)." )
+            downloaded += size
+        else:
+            print( f"{filepath} is up-to-date with {url}." )
+            saved += size
+    print( f"Downloaded {downloaded} bytes; {saved} bytes didn't need to be downloaded again." )
+    return results
 
-        print( f"Downloading {url} to {filepath}..." )
+def fetchFile( session, url, filepath, validators ):
+    """
+    Downloads the file at the given URL to the given path, unless the validators say the local copy is still up-to-date.
+    Updates the validators for the file after downloading it. Returns a tuple as described in fetch().
+    """
+    directory = path_dirname(  filepath )
+    prefix    = path_basename( filepath )
+    if prefix != "":
+        prefix += "."
+
+    #Validators only apply if they came from the same URL and the file they describe is still there
+    headers = {}
+    known   = validators.get( filepath )
+    if known is not None and known.get( "url" ) == url and os.path.exists( filepath ):
+        if known.get( "etag" ) is not None:
+            headers["If-None-Match"] = known["etag"]
+        if known.get( "lastModified" ) is not None:
+            headers["If-Modified-Since"] = known["lastModified"]
 
-        with requests.get( url, stream=True ) as res:
+    try:
+        with session.get( url, stream=True, headers=headers, timeout=FETCH_TIMEOUT ) as res:
+            if res.status_code == 304:
+                return url, filepath, False, os.path.getsize( filepath )
             res.raise_for_status()
+
+            size = 0
             with NamedTemporaryFile( dir=directory, prefix=prefix, suffix=".part", mode="wb" ) as tfout:
                 #Save temporary file name for later
                 tempfile = tfout.name
@@ -132,14 +499,35 @@ def fetch():
                 #Read up to 8KiB from the response at a time and write to the temporary file:
                 for chunk in res.iter_content( 8192 ):
                     tfout.write( chunk )
-                
+                    size += len( chunk )
+
                 #If (and only if) the file was downloaded without issue, make the temporary file permanent.
                 #HACK: The way we're accomplishing this here relies on an implementation detail in tempfile; changes to this module in the future may cause it to stop working:
                 tfout._closer.delete = False
-                
+
                 #Move the file to its permanent location:
                 move( tempfile, filepath )
 
+            validators[ filepath ] = { "url": url, "etag": res.headers.get( "ETag" ), "lastModified": res.headers.get( "Last-Modified" ) }
+            return url, filepath, True, size
+    except requests.RequestException as e:
+        raise RuntimeError( f"Couldn't download {url}: {e}" )
+
+def loadValidators():
+    """Returns the validators stored in FETCH_FILE, a dict mapping the path of each fetched file to its URL, ETag and Last-Modified header, or an empty dict if there are none."""
+    try:
+        with open( FETCH_FILE, "r" ) as fin:
+            return json.load( fin )
+    #Missing, or unreadable (e.g. truncated); either way, every file is downloaded again
+    except ( OSError, ValueError ):
+        return {}
+
+def saveValidators( validators ):
+    """Stores the given validators in FETCH_FILE."""
+    with open( FETCH_FILE, "w" ) as fout:
+        json.dump( validators, fout, indent=4 )
+        fout.write( "\n" )
+
 def clean():
     """
     Deletes the source and header files that GLL generates.
@@ -162,24 +550,290 @@ def clean():
         rmdir( SRC_DIR )
     except FileNotFoundError:
         pass
+    try:
+        rmtree( BENCH_DIR )
+    except FileNotFoundError:
+        pass
+
+    #The record of what was generated no longer describes anything
+    try:
+        os.remove( GENERATED_FILE )
+    except FileNotFoundError:
+        pass
+
+def clean_cache():
+    """
+    Deletes the parsed registry cache.
+    """
+    if cache.invalidate():
+        print( f"Deleted {CACHE_FILE}." )
+    else:
+        print( "There is no cache to delete." )
+
+def cache_status():
+    """
+    Reports whether the parsed registry cache matches the registry files.
+    """
+    if cache.isCurrent():
+        print( f"{CACHE_FILE} is up-to-date; the next --generate will skip parsing." )
+    else:
+        print( f"{CACHE_FILE} is missing or out-of-date; the next --generate will parse the registry files." )
 
 def parse_and_generate():
     """
     Parses the OpenGL XML API Registry files and generates source code from them.
     """
-    parse()
-    generate()
+    with profile.phase( "load" ):
+        loadOrParse()
+    for name, objs in ( ( "types", includeTypes + types ), ( "enums", enums ), ( "commands", commands ), ( "features", features ), ( "extensions", extensions ) ):
+        profile.count( name, len( objs ) )
+
+    if usedSymbols is not None:
+        with profile.phase( "prune" ):
+            prune( usedSymbols )
+    with profile.phase( "generate" ):
+        generate()
+
+def loadOrParse():
+    """
+    Loads the parsed registry from the cache if it matches the registry files.
+    Otherwise, parses the registry files and caches the result for next time.
+    """
+    global cacheHit
+
+    with profile.phase( "cache lookup" ):
+        key   = cache.computeKey()
+        state = cache.load( key )
+    cacheHit = state is not None
+
+    if cacheHit:
+        with profile.phase( "restore" ):
+            restore( state )
+        print( f"Cache hit: loaded parsed registry from {CACHE_FILE}." )
+        printSummary()
+    else:
+        print( "Cache miss: parsing registry files." )
+        with profile.phase( "parse" ):
+            parse()
+        with profile.phase( "cache save" ):
+            cache.save( key, capture() )
+
+def prune( symbols ):
+    """
+    Removes every enum and command that isn't named in the given symbols from the modules that own them, so they aren't generated.
+    Enums and commands GLL needs itself are always kept. Prints how much was pruned.
+    """
+    keep = set( symbols ) | { obj.name for obj in extensionQueries() }
+
+    unknown = sorted( symbol for symbol in symbols if symbol not in enums and symbol not in commands )
+    if len( unknown ) > 0:
+        log.warning( f"{len( unknown )} symbols don't name an enum or command: {', '.join( unknown[:10] )}{', ...' if len( unknown ) > 10 else ''}" )
+
+    before = [ 0, 0 ]
+    after  = [ 0, 0 ]
+    for module in features + extensions:
+        for i, lists in enumerate( ( ( "coreEnums", "removedEnums" ), ( "coreCommands", "removedCommands" ) ) ):
+            for listName in lists:
+                objs = getattr( module, listName )
+                kept = [ obj for obj in objs if obj.name in keep ]
+                before[i] += len( objs )
+                after[i]  += len( kept )
+                setattr( module, listName, OrderedSet( kept ) )
+
+    print( f"Pruned {before[0] - after[0]} of {before[0]} enums and {before[1] - after[1]} of {before[1]} commands; {after[0]} enums and {after[1]} commands are left." )
+
+def capture():
+    """
+    Returns everything parsed so far, for storage in the cache.
+    Enums and commands keep references to the modules that own them (and vice versa), so ownership is captured as well.
+    """
+    return {
+        "includeTypes": list( includeTypes ),
+        "types":        list( types        ),
+        "enums":        dict( enums        ),
+        "commands":     dict( commands     ),
+        "features":     list( features     ),
+        "extensions":   list( extensions   )
+    }
+
+def restore( state ):
+    """
+    Replaces everything parsed so far with a snapshot previously returned by capture().
+    """
+    reset()
+    merge( state )
+
+def merge( state ):
+    """
+    Adds a snapshot previously returned by capture() to everything parsed so far.
+    """
+    includeTypes.extend( state["includeTypes"] )
+    types.extend(        state["types"]        )
+    enums.update(        state["enums"]        )
+    commands.update(     state["commands"]     )
+    features.extend(     state["features"]     )
+    extensions.extend(   state["extensions"]   )
+
+def reset():
+    """
+    Clears everything parsed so far, so the registry can be parsed again from scratch.
+    """
+    includeTypes.clear()
+    types.clear()
+    enums.clear()
+    commands.clear()
+    features.clear()
+    extensions.clear()
+
+#Parse the registry files to get the data we need to generate the headers
+def presentRegistries():
+    """
+    Returns the entries of REGISTRIES whose files exist. gl.xml is always returned, so parsing it reports it missing;
+    the window system registries are optional, and a warning is logged for each one that's skipped.
+    """
+    present = []
+    for registry, path in REGISTRIES:
+        if registry != "gl" and not os.path.exists( path ):
+            log.warning( f"Can't find file \"{path}\"; skipping the {registry} registry." )
+            continue
+        present.append( ( registry, path ) )
+    return present
 
-#Parse the gl.xml file to get the data we need to generate the headers
 def parse():
+    """
+    Parses every registry file in REGISTRIES into a single model, skipping window system registries whose files are missing.
+    The first registry (gl.xml, by far the largest) is parsed in this process while the others are parsed concurrently in worker processes;
+    their results are then merged in REGISTRIES order, so the model is the same as if each file had been parsed one after another
+    (which is what happens if there's only one CPU available).
+    """
+    reset()
+    registries = presentRegistries()
+
+    #Worker processes only cost time when there's no other CPU for them to run on
+    if cpuCount() == 1 or len( registries ) == 1:
+        for registry, path in registries:
+            with profile.phase( registry ):
+                parseRegistry( registry, path )
+        adoptOrphans()
+        printSummary()
+        return
+
+    local, *others = registries
+    with ProcessPoolExecutor( len( others ) ) as pool:
+        futures = [ pool.submit( parseRegistryIsolated, registry, path, xmlbackend.backend ) for registry, path in others ]
+
+        with profile.phase( local[0] ):
+            parseRegistry( *local )
+        #Time spent here is time the other registries took to parse beyond the time the first one did
+        with profile.phase( "merge" ):
+            for future in futures:
+                output, state = future.result()
+                print( output, end="" )
+                merge( state )
+
+    #Make sure list of extensions is sorted alphabetically by name
+    extensions.sort( key = lambda x: x.name )
+
+    adoptOrphans()
+    printSummary()
+
+#Enums and commands are generated in the module that owns them: the first module that required them.
+#If that module isn't generated (e.g. a GLES extension), they'd be missing from the output,
+#so they're handed to the first module that provides them and is generated, if there is one.
+def adoptOrphans():
+    for obj in ( *enums.values(), *commands.values() ):
+        if obj.owner is None or isGeneratedModule( obj.owner ):
+            continue
+        adopter = next( ( module for module in obj.providers if isGeneratedModule( module ) ), None )
+        if adopter is not None:
+            log.debug( "%s adopts %s from %s", adopter.name, obj.name, obj.owner.name )
+            obj.adopt( adopter )
+
+#Parses a single registry file with the given XML backend into a model of its own, for merging into the model of another process.
+#Returns everything the parse printed and the parsed model.
+def parseRegistryIsolated( registry, path, backend ):
+    xmlbackend.select( backend )
+    reset()
+    with redirect_stdout( StringIO() ) as output:
+        parseRegistry( registry, path )
+    return output.getvalue(), capture()
+
+def parseRegistry( registry, path ):
+    """
+    Streams the given registry file rather than loading it as a whole.
+    Each element is handed to its parse function as soon as its end tag is read, then discarded,
+    so only the element currently being parsed (and its ancestors) are kept in memory.
+    """
+    try:
+        events = xmlbackend.iterparse( path )
+    except FileNotFoundError:
+        error( f"Can't find file \"{path}\"." )
+
     try:
-        tree = ET.parse( GL_FILE )
-    except FileNotFound:
-        error( f"Can't find file \"{GL_FILE}\"." )
+        parseStream( events, registry )
+    except xmlbackend.ParseError as e:
+        error( f"Failed to parse \"{path}\": {e}" )
+
+def parseStream( events, registry ):
+    #Elements that have been opened but not yet closed; path[0] is the root node
+    path = []
+
+    for event, node in events:
+        if event == "start":
+            if len( path ) == 0 and node.tag != "registry":
+                error( f"Expected root node to be \"registry\", got \"{node.tag}\" instead." )
+            path.append( node )
+            continue
+
+        path.pop()
+        depth = len( path )
+
+        #Children of <registry>:
+        if depth == 1:
+            if   node.tag == "feature":
+                parseFeature( node, registry )
+            elif node.tag == "extensions":
+                #Make sure list of extensions is sorted alphabetically by name
+                extensions.sort( key = lambda x: x.name )
+            elif node.tag == "comment":
+                log.debug( "/*%s*/", node.text )
+            #The children of these tags were parsed (or ignored) as they were read
+            elif node.tag == "enums" or node.tag == "types" or node.tag == "commands":
+                pass
+            #ignore groups and kinds
+            elif node.tag == "groups" or node.tag == "kinds":
+                pass
+            else:
+                tagError( node )
+            path[0].remove( node )
+
+        #Children of <enums>, <types>, <commands>, etc:
+        #Features are small, so their children are kept until the whole <feature> has been read.
+        elif depth == 2:
+            parent = path[1]
+            if   parent.tag == "enums":
+                parseEnum( node )
+            elif parent.tag == "types":
+                parseType( node, registry )
+            elif parent.tag == "commands":
+                parseCommand( node )
+            elif parent.tag == "extensions":
+                if node.tag == "extension":
+                    parseExtension( node, registry )
+                else:
+                    tagError( node )
+            if parent.tag != "feature":
+                parent.remove( node )
+
+#Parse a registry file all at once. Produces the same results as parseRegistry(), but loads the whole tree into memory first.
+def parseRegistryTree( registry, path ):
+    try:
+        root = xmlbackend.parse( path )
+    except FileNotFoundError:
+        error( f"Can't find file \"{path}\"." )
     except:
         error( f"An unexpected exception occured: {sys.exc_info()[1]}" )
 
-    root = tree.getroot()
     if root.tag != "registry":
         error( f"Expected root node to be \"registry\", got \"{root.tag}\" instead." )
 
@@ -187,71 +841,74 @@ def parse():
         if   child.tag == "enums":
             parseEnums( child )
         elif child.tag == "feature":
-            parseFeature( child )
+            parseFeature( child, registry )
         elif child.tag == "types":
-            parseTypes( child )
+            parseTypes( child, registry )
         elif child.tag == "commands":
             parseCommands( child )
         elif child.tag == "extensions":
-            parseExtensions( child )
+            parseExtensions( child, registry )
         elif child.tag == "comment":
-            print( f"/*{child.text}*/" )
+            log.debug( "/*%s*/", child.text )
         #ignore groups and kinds
         elif child.tag == "groups" or child.tag == "kinds":
             pass
         else:
             tagError( child )
 
+def printSummary():
     print( f"Parsed {len( enums      )} enums."      )
     print( f"Parsed {len( commands   )} commands."   )
     print( f"Parsed {len( features   )} features."   )
     print( f"Parsed {len( extensions )} extensions." )
 
-def parseTypes( node ):
-    global includeTypes
-    global types
+def parseTypes( node, registry ):
     for child in node:
-        if child.tag == "type":
-            #Note: "requires" attribute is ignored if it exists
-            text = innerText( child )
-            t = Type( text, child.get( "name" ), child.get( "comment" ), child.get( "api" ) )
-
-            #Types that include headers need to go outside of namespaces
-            if "#include" in text:
-                includeTypes.append( t )
-            else:
-                types.append( t )
+        parseType( child, registry )
+
+def parseType( node, registry ):
+    if node.tag == "type":
+        #Note: "requires" attribute is ignored if it exists
+        text = innerText( node )
+        t = Type( text, node.get( "name" ), node.get( "comment" ), node.get( "api" ), registry )
+
+        #Types that include headers need to go outside of namespaces
+        if "#include" in text:
+            includeTypes.append( t )
         else:
-            tagError( child )
+            types.append( t )
+    else:
+        tagError( node )
 
 def parseEnums( node ):
-    global enums
-
     for child in node:
-        if child.tag == "enum":
-            name  = child.attrib["name"]
-            value = child.attrib["value"]
-            enums[ name ] = Enum( name, value )
-        #ignore "unused" tags
-        elif child.tag == "unused":
-            pass
-        else:
-            tagError( child )
+        parseEnum( child )
+
+def parseEnum( node ):
+    if node.tag == "enum":
+        name  = node.attrib["name"]
+        value = node.attrib["value"]
+        enums[ name ] = Enum( name, value )
+    #ignore "unused" tags
+    elif node.tag == "unused":
+        pass
+    else:
+        tagError( node )
 
 def parseCommands( node ):
-    global commands
     for child in node:
-        if child.tag == "command":
-            proto    = child.find( "proto" )
-            rt, name = parseCommand_separate_return_type_and_name( proto )
-            params   = [
-                innerText( paramnode ).strip()
-                for paramnode in child
-                if paramnode.tag == "param"
-            ]
-            commands[ name ] = Command( rt, name, params )
-        else:
-            tagError( child )
+        parseCommand( child )
+
+def parseCommand( node ):
+    if node.tag == "command":
+        proto    = node.find( "proto" )
+        rt, name = parseCommand_separate_return_type_and_name( proto )
+        paramnodes = [ paramnode for paramnode in node if paramnode.tag == "param" ]
+        params     = [ innerText( paramnode ).strip()         for paramnode in paramnodes ]
+        paramNames = [ innerText( paramnode.find( "name" ) ) for paramnode in paramnodes ]
+        commands[ name ] = Command( rt, name, params, paramNames )
+    else:
+        tagError( node )
 
 def parseCommand_separate_return_type_and_name( node ):
     """
@@ -334,25 +991,25 @@ def parseModule( node, module ):
             tagError( child )
 
 #Parse a feature (e.g. OpenGL 4.5, OpenGLES 1.1, etc)
-def parseFeature( node ):
-    feature = Feature( node.attrib["api"], node.attrib["number"] )
+def parseFeature( node, registry ):
+    feature = Feature( node.attrib["api"], node.attrib["number"], registry )
     parseModule( node, feature )
 
     features.append( feature )
 
 #Parse an extension (e.g. GL_ARB_direct_state_access)
-def parseExtensions( node ):
+def parseExtensions( node, registry ):
     for child in node:
         if child.tag == "extension":
-            parseExtension( child )
+            parseExtension( child, registry )
         else:
             tagError( child )
 
     #Make sure list of extensions is sorted alphabetically by name
     extensions.sort( key = lambda x: x.name )
 
-def parseExtension( node ):
-    extension = Extension( node.attrib["name"], node.attrib["supported"].split("|") )
+def parseExtension( node, registry ):
+    extension = Extension( node.attrib["name"], node.attrib["supported"].split("|"), registry )
     parseModule( node, extension )
 
     extensions.append( extension )
@@ -363,17 +1020,281 @@ def generate():
     os.makedirs( SRC_PROJECT_DIR, exist_ok = True ) #src/gll
     os.makedirs( INC_PROJECT_DIR, exist_ok = True ) #include/gll
 
+    if modules and loaderStyle == "context":
+        raise RuntimeError( "--modules can't be used with context loaders." )
+    #Lazy loaders repoint their commands on the first call, and context loaders call through dispatch tables, so neither could keep a wrapper in place
+    if callProfile and loaderStyle in ( "lazy", "context" ):
+        raise RuntimeError( f"--call-profile can't be used with {loaderStyle} loaders." )
+    if fake:
+        if len( amalgamateTargets ) > 0:
+            raise RuntimeError( "--fake can't be used with --amalgamate." )
+        os.makedirs( BENCH_DIR, exist_ok = True )
+
+    written   = []
+    unchanged = []
+    previous  = loadGenerated( GENERATED_FILE )
+    summary   = diff.summarize( capture() )
+    if len( amalgamateTargets ) > 0:
+        if incremental:
+            raise RuntimeError( "--incremental can't be used with --amalgamate." )
+        results = [ runMeasured( amalgamate, target ) for target in amalgamateTargets ]
+
+        #Amalgamations replace the split layout; they're recorded under keys no generation job has, so a later --incremental run regenerates everything
+        saveGenerated( summary, { ( "amalgamate", target ): [ *result[0][0], *result[0][1] ] for target, result in zip( amalgamateTargets, results ) } )
+    else:
+        jobList = generationJobs()
+        skipped = {}
+        if incremental:
+            with profile.phase( "diff" ):
+                jobList, skipped = incrementalJobs( jobList, summary )
+        results = runJobs( jobList )
+
+        #Files of skipped jobs are still part of the output
+        files = dict( skipped )
+        for job, ( ( jobWritten, jobUnchanged, _ ), _ ) in zip( jobList, results ):
+            files[ jobKey( job ) ] = [ *jobWritten, *jobUnchanged ]
+        for paths in skipped.values():
+            unchanged.extend( paths )
+        saveGenerated( summary, files )
+    for ( jobWritten, jobUnchanged, jobEmitted ), ( name, seconds, peak ) in results:
+        written.extend(   jobWritten   )
+        unchanged.extend( jobUnchanged )
+        profile.count( "bytes written", jobEmitted )
+        profile.add( name, seconds, peak )
+    profile.count( "files written",   len( written   ) )
+    profile.count( "files unchanged", len( unchanged ) )
+
+    #Files whose contents didn't change aren't rewritten, so builds only recompile what actually changed
+    print( f"Wrote {len( written )} files; {len( unchanged )} files were already up-to-date." )
+
+    #Files the previous run generated that weren't generated this time (e.g. modules that --symbols or --scan pruned, or that another loader style needed)
+    #would still be picked up by the build, so they're deleted
+    with profile.phase( "removeStaleFiles" ):
+        stale = removeStaleFiles( previous, set( written ) | set( unchanged ) )
+    profile.count( "files deleted", stale )
+    if stale > 0:
+        print( f"Deleted {stale} stale files." )
+
+def removeStaleFiles( previous, generated ):
+    """
+    Deletes the files the previous generation snapshot (see saveGenerated(), or None if there wasn't one) lists that aren't among the given generated paths.
+    Files GLL didn't generate, e.g. ones put in its output directories by hand, are left alone. Returns how many were deleted.
+    """
+    if previous is None:
+        return 0
+    removed = 0
+    for paths in previous["files"].values():
+        for path in paths:
+            if path not in generated and os.path.exists( path ):
+                os.remove( path )
+                removed += 1
+    return removed
+
+#Generation is split into jobs, each of which renders a set of files that no other job touches.
+#A job is a ( function, index ) tuple; the function is called with the feature at that index in features, or with no arguments if index is None.
+#Features are referred to by index so that jobs are cheap to send to worker processes.
+def generationJobs():
     #Write types file
-    generateTypes()
+    jobs = [ ( generateTypes, None ) ]
 
     #Write one header and source file for each feature (e.g. GL 1.0, GL 4.5, GLES 1.0, etc)
-    generateFeatures()
+    jobs.extend( ( generateFeature, i ) for i in range( len( features ) ) )
+
+    #Write extensions header and source file
+    jobs.append( ( generateExtensions, None ) )
+
+    #Generate user headers (these include the headers generated by the jobs above, but don't need them to exist)
+    jobs.extend( ( generateUserHeadersFor, i ) for i in range( len( features ) ) )
 
-    #Write extensions header file
-    #generateExtensions()
+    #Write dispatch tables
+    if loaderStyle == "context":
+        jobs.append( ( generateDispatch, None ) )
 
-    #Generate user headers (these include the headers generated in previous steps)
-    generateUserHeaders()
+    #Write the loader, which ties the module loaders together
+    jobs.append( ( generateLoader, None ) )
+
+    #Write the fake OpenGL implementation and the load benchmark
+    if fake:
+        jobs.append( ( generateFake, None ) )
+
+    #Write module interface units, which render the split layout again for their user header and so are the slowest jobs
+    if modules:
+        jobs.extend( ( generateModuleInterfacesFor, i ) for i in range( len( features ) ) if features[i].api == "gl" )
+
+    return jobs
+
+#Returns a key that identifies the given job across runs: the name of its function, and the name of its feature (or None)
+def jobKey( job ):
+    function, index = job
+    return function.__name__, None if index is None else features[ index ].name
+
+#Returns the options that affect what generation jobs write; files generated with different options can't be reused
+def generationOptions():
+    return {
+        "version":     VERSION,
+        "loaderStyle": loaderStyle,
+        "modules":     modules,
+        "callProfile": callProfile,
+        "fake":        fake,
+        "usedSymbols": None if usedSymbols is None else sorted( usedSymbols )
+    }
+
+#Returns the generation snapshot stored in the given file by saveGenerated(), or None if it's missing or can't be read
+def loadGenerated( path ):
+    try:
+        with open( path, "rb" ) as fin:
+            snapshot = pickle.load( fin )
+    except Exception:
+        return None
+    if not isinstance( snapshot, dict ) or snapshot.get( "format" ) != diff.FORMAT:
+        return None
+    return snapshot
+
+#Stores the summary of the registry that was generated from (see gll.diff), the options it was generated with,
+#and the files each job wrote (a dict mapping each job's key to its paths) in GENERATED_FILE
+def saveGenerated( summary, files ):
+    os.makedirs( XML_DIR, exist_ok=True )
+    snapshot = { "format": diff.FORMAT, "options": generationOptions(), "summary": summary, "files": files }
+
+    #Write to a temporary file first so an interrupted run can't leave a truncated snapshot behind
+    temppath = f"{GENERATED_FILE}.part"
+    with open( temppath, "wb" ) as fout:
+        pickle.dump( snapshot, fout, protocol=pickle.HIGHEST_PROTOCOL )
+    os.replace( temppath, GENERATED_FILE )
+
+#Returns a summary of the registry as it would be parsed with the given older copy of one of the registry files in place of the current one.
+#The current model is left as it was.
+def summarizeRegistryFile( path ):
+    name       = path_basename( path )
+    registries = [ ( registry, path if path_basename( registryPath ) == name else registryPath ) for registry, registryPath in REGISTRIES ]
+    if registries == list( REGISTRIES ):
+        expected = ", ".join( path_basename( registryPath ) for _, registryPath in REGISTRIES )
+        raise RuntimeError( f"Expected \"--since\" to name a registry file ({expected}) or a generation snapshot, but got \"{path}\"." )
+
+    current = capture()
+    try:
+        reset()
+        with redirect_stdout( StringIO() ):
+            for registry, registryPath in registries:
+                parseRegistry( registry, registryPath )
+            extensions.sort( key = lambda x: x.name )
+            adoptOrphans()
+            if usedSymbols is not None:
+                prune( usedSymbols )
+        return diff.summarize( capture() )
+    finally:
+        restore( current )
+
+#Returns the summary of the registry to compare the current one against for --incremental, given the snapshot in GENERATED_FILE (if any)
+def baselineSummary( generated ):
+    if sincePath is None:
+        return None if generated is None else generated["summary"]
+    if sincePath.endswith( ".xml" ):
+        return summarizeRegistryFile( sincePath )
+    snapshot = loadGenerated( sincePath )
+    if snapshot is None:
+        raise RuntimeError( f"Couldn't read the generation snapshot \"{sincePath}\"." )
+    return snapshot["summary"]
+
+#Returns the keys of the jobs (see jobKey()) whose files may be affected by the given RegistryDiff.
+#Jobs that are new (e.g. the features of an added version) aren't listed; they have no files to reuse anyway.
+def affectedJobs( changes ):
+    keys    = set()
+    queries = { obj.name for obj in extensionQueries() }
+    allInterfaces = False
+    if len( changes.types ) > 0:
+        keys.add( ( "generateTypes", None ) )
+        keys.add( ( "generateFake", None ) )
+        allInterfaces = True
+
+    for change in changes.modules:
+        if change.kind == "feature":
+            keys.add( ( "generateFeature", change.name ) )
+            #User headers and module interface units include the modules of every earlier version of their API
+            for feature in features:
+                if feature.api == change.api and feature.version >= change.version:
+                    keys.add( ( "generateUserHeadersFor", feature.name ) )
+                    keys.add( ( "generateModuleInterfacesFor", feature.name ) )
+            if isGenerated( change ):
+                keys.add( ( "generateLoader", None ) )
+                keys.add( ( "generateDispatch", None ) )
+                keys.add( ( "generateFake", None ) )
+                #gl_ext.cpp includes the headers of the modules that own the commands it queries extensions with
+                if not change.names().isdisjoint( queries ):
+                    keys.add( ( "generateExtensions", None ) )
+        elif isGeneratedExtension( change ):
+            keys.add( ( "generateExtensions", None ) )
+            keys.add( ( "generateDispatch", None ) )
+            keys.add( ( "generateFake", None ) )
+            allInterfaces = True
+
+    if allInterfaces:
+        keys.update( ( "generateModuleInterfacesFor", feature.name ) for feature in features )
+    return keys
+
+#Works out which of the given jobs need to run for --incremental, after printing what changed in the registry.
+#Returns the jobs to run, and a dict mapping the key of each job that can be skipped to the files it wrote last time.
+def incrementalJobs( jobList, summary ):
+    generated = loadGenerated( GENERATED_FILE )
+    baseline  = baselineSummary( generated )
+    if baseline is not None:
+        changes = diff.compare( baseline, summary )
+        diff.report( changes )
+
+    if generated is None:
+        print( f"No record of earlier output in {GENERATED_FILE}; regenerating everything." )
+        return jobList, {}
+    if generated["options"] != generationOptions():
+        print( "The output was generated with different options or by another version of GLL; regenerating everything." )
+        return jobList, {}
+
+    affected = affectedJobs( changes )
+    run      = []
+    skipped  = {}
+    for job in jobList:
+        key   = jobKey( job )
+        paths = generated["files"].get( key )
+        #Files deleted since they were generated have to be generated again, whether the job was affected or not
+        if key in affected or paths is None or not all( os.path.exists( path ) for path in paths ):
+            run.append( job )
+        else:
+            skipped[ key ] = paths
+    print( f"Skipped {len( skipped )} of {len( jobList )} generation jobs, whose files aren't affected by the changes." )
+    return run, skipped
+
+#Prepares a worker process to run jobs
+def initWorker( state, style, profiling, calls ):
+    global loaderStyle, callProfile
+    restore( state )
+    loaderStyle     = style
+    profile.enabled = profiling
+    callProfile     = calls
+
+#Runs a single job. See runMeasured() for what it returns.
+def runJob( job ):
+    function, index = job
+    if index is None:
+        return runMeasured( function )
+    return runMeasured( function, features[ index ] )
+
+#Calls the given function with the given arguments, measuring it as a phase named after the function (see gll.profile).
+#Returns the lists of files it wrote and left untouched and the number of bytes it wrote, followed by ( name, seconds, peak ) for profile.add().
+#The measurement is returned rather than recorded because the function may run in a worker process.
+def runMeasured( function, *args ):
+    SourceFile.resetStats()
+    with profile.Measurement() as measurement:
+        function( *args )
+    return SourceFile.stats(), ( function.__name__, measurement.seconds, measurement.peak )
+
+#Runs the given jobs, either in this process or spread across a pool of worker processes.
+#Returns the result of each job, in the same order as the jobs.
+def runJobs( jobList ):
+    if jobs == 1:
+        return [ runJob( job ) for job in jobList ]
+
+    #Workers that weren't forked from this process (e.g. on Windows) need a copy of the parsed registry and options
+    with ProcessPoolExecutor( jobs, initializer=initWorker, initargs=( capture(), loaderStyle, profile.enabled, callProfile ) ) as pool:
+        return list( pool.map( runJob, jobList ) )
 
 def generateType( typer, out ):
     #TEMP: Ignore GLES types
@@ -381,45 +1302,66 @@ def generateType( typer, out ):
     if api is not None and RE_GLES.fullmatch( api ):
         return
 
+    #Window system registries declare placeholders for types defined by other headers (e.g. <type name="Display"/>); these have no content
+    if typer.content == "":
+        return
+
     #If a type has a comment attribute, add this comment to the file above it
     comment = typer.comment
     if comment is not None:
         out.write( f"//{comment}\n" )
     out.write( f"{typer.content}\n" )
 
+#Writes one types file for each registry
 def generateTypes():
-    if len( includeTypes ) == 0 and len( types ) == 0:
+    for registry, _ in REGISTRIES:
+        generateRegistryTypes( registry )
+
+def generateRegistryTypes( registry ):
+    registryIncludeTypes = [ typer for typer in includeTypes if typer.registry == registry ]
+    registryTypes        = [ typer for typer in types        if typer.registry == registry ]
+    if len( registryIncludeTypes ) == 0 and len( registryTypes ) == 0:
         return
 
-    incpath = f"{TYPES_FILE}.{INC_EXT}"
+    incpath = f"{TYPES_FILES[ registry ]}.{INC_EXT}"
     with IncludeFile( incpath ) as out:
         out.writeComment()
         out.beginIncludeGuard()
 
-        out.write(
-            "//Defines\n"
-            "//GLAPI becomes APIENTRY on Windows, and disappears on other platforms\n"
-            "#ifdef _WIN32\n"
-            "#define GLAPI APIENTRY\n"
-            "#else\n"
-            "#define GLAPI\n"
-            "#endif\n"
-            "\n\n\n\n"
-        )
+        if registry == "gl":
+            out.write(
+                "//Defines\n"
+                "//GLAPI becomes APIENTRY on Windows, and disappears on other platforms\n"
+                "#ifdef _WIN32\n"
+                "#define GLAPI APIENTRY\n"
+                "#else\n"
+                "#define GLAPI\n"
+                "#endif\n"
+                "\n\n\n\n"
+            )
+        #Window system types are built on top of GL and platform types
+        else:
+            out.write( "//Dependencies\n" )
+            for header in PLATFORM_INCLUDES[ registry ]:
+                out.write( f"#include <{header}>\n" )
+            out.write(
+                f"#include \"{TYPES_FILE}.{INC_EXT}\"\n"
+                 "\n\n\n\n"
+            )
 
         #Types with #include statements need to occur outside of a namespace
-        if len( includeTypes ) > 0:
+        if len( registryIncludeTypes ) > 0:
             out.write( "//Includes\n" )
-            for typer in includeTypes:
+            for typer in registryIncludeTypes:
                 generateType( typer, out )
             out.write( "\n" )
 
         #All other types go in the namespace
-        if len( types ) > 0:
+        if len( registryTypes ) > 0:
             out.beginNamespaces()
 
             out.write( "//Types\n" )
-            for typer in types:
+            for typer in registryTypes:
                 generateType( typer, out )
 
             out.endNamespaces()
@@ -428,24 +1370,91 @@ def generateTypes():
 
 def generateFeatures():
     for feature in features:
-        #TEMP: Don't generate gles stuff for now
-        if feature.api != "gl":
-            continue
+        generateFeature( feature )
 
-        name = feature.name
-        incCorePath    = f"mod_{name}.{INC_EXT}"
-        incRemovedPath = f"mod_{name}_rem.{INC_EXT}"
-        srcCorePath    = f"mod_{name}.{SRC_EXT}"
-        srcRemovedPath = f"mod_{name}_rem.{SRC_EXT}"
+#Returns True if modules are generated for the given feature
+def isGenerated( feature ):
+    #TEMP: Don't generate gles stuff for now
+    return feature.registry != "gl" or feature.api == "gl"
+
+def generateFeature( feature ):
+    if not isGenerated( feature ):
+        return
 
-        feature.computeWidths()
+    name = feature.name
+    incCorePath    = f"mod_{name}.{INC_EXT}"
+    incRemovedPath = f"mod_{name}_rem.{INC_EXT}"
+    srcCorePath    = f"mod_{name}.{SRC_EXT}"
+    srcRemovedPath = f"mod_{name}_rem.{SRC_EXT}"
+
+    feature.computeWidths()
+
+    GenerateFeatureInclude( feature, incCorePath )
+    GenerateFeatureSource(  feature, srcCorePath, incCorePath )
+
+    if len( feature.removedEnums ) > 0 or len( feature.removedCommands ) > 0:
+        GenerateFeatureInclude( feature, incRemovedPath, True )
+        GenerateFeatureSource(  feature, srcRemovedPath, incRemovedPath, True )
+
+#Returns the loader style used for the given module.
+#Context loaders only apply to OpenGL; window system modules use statement loaders instead.
+def moduleStyle( module ):
+    if loaderStyle == "context" and module.registry != "gl":
+        return "statements"
+    return loaderStyle
+
+#Returns the statement a module loader starts with, which reports on the module while GLL_LOAD_REPORT is defined (see report.hpp)
+#and expands to nothing otherwise. Modules are reported by the names of their files, e.g. "gl_4_6_rem" or "GL_ARB_sync".
+def reportStatement( loadFunction ):
+    return f"GLL_REPORT_MODULE( \"{loadFunction[ len( 'load_mod_' ): ]}\" );"
+
+#Writes the include of the call profile header in a source file with module loaders, if --call-profile was given
+def writeCallProfileInclude( out ):
+    if callProfile:
+        out.write( f"#include <{PROJECT_NAME}/{CALL_PROFILE_FILE}.{INC_EXT}>\n" )
+
+#Writes the call stats of the given module's commands, and a wrapper for each that counts and times its calls, if --call-profile was given.
+#The stats and the module's registration are named after the given table, so they're unique even when every module is in one source file.
+def writeCallProfile( out, commands, table ):
+    if not callProfile:
+        return
+    prototypeWidth = max( len( command.prototypeName ) for command in commands )
+    nameWidth      = max( len( command.profiledName ) for command in commands )
+
+    out.write( f"\n#ifdef GLL_CALL_PROFILE\n//Call stats of each command, in the same order as the definitions\nstatic CallStats {table}_calls[] = {{\n" )
+    for i, command in enumerate( commands ):
+        separator = "," if i < len( commands ) - 1 else ""
+        out.write( f"    {{ \"{command.name}\", {{}}, {{}} }}{separator}\n" )
+    out.write(
+         "};\n"
+        f"static CallProfileModule {table}_profile( {table}_calls, {len( commands )} );\n"
+         "\n"
+         "//Addresses the commands were loaded with, which their wrappers forward calls to\n"
+    )
+    for command in commands:
+        out.write( f"static {command.prototypeName.ljust( prototypeWidth )} {command.profiledName.ljust( nameWidth )} = nullptr;\n" )
+    out.write( "\n//Wrappers\n" )
+    for i, command in enumerate( commands ):
+        out.write( f"{command.getProfileWrapper( f'{table}_calls[{i}]' )}\n" )
+    out.write( "#endif\n" )
+
+#Writes the statements that point each of the given commands at its call profile wrapper once it's loaded, if --call-profile was given
+def writeCallProfileStatements( out, commands ):
+    if not callProfile:
+        return
+    nameWidth = max( len( command.name ) for command in commands )
 
-        GenerateFeatureInclude( feature, incCorePath )
-        GenerateFeatureSource(  feature, srcCorePath, incCorePath )
+    out.write( "\n#ifdef GLL_CALL_PROFILE\n    //Point each loaded command at its wrapper\n" )
+    for command in commands:
+        out.write( f"    {command.getProfileStatement( nameWidth )}\n" )
+    out.write( "#endif\n" )
 
-        if len( feature.removedEnums ) > 0 or len( feature.removedCommands ) > 0:
-            GenerateFeatureInclude( feature, incRemovedPath, True )
-            GenerateFeatureSource(  feature, srcRemovedPath, incRemovedPath, True )
+#Writes a struct with a member for each of the given commands, named after the given table
+def writeTableStruct( out, commands, prototypeWidth, table ):
+    out.write( f"\n//Function table\nstruct {table}_t {{\n" )
+    for command in commands:
+        out.write( f"    {command.getTableMember( prototypeWidth )}\n" )
+    out.write( "};\n" )
 
 def GenerateFeatureInclude( feature, path, removed = False ):
     if removed:
@@ -454,12 +1463,17 @@ def GenerateFeatureInclude( feature, path, removed = False ):
         enumWidth         = feature.removedEnumWidth
         returnValueWidth  = feature.removedReturnValueWidth
         prototypeWidth    = feature.removedPrototypeWidth
+        functionNameWidth = feature.removedFunctionNameWidth
+        table             = feature.removedTable
     else:
         enums             = feature.coreEnums
         commands          = feature.coreCommands
         enumWidth         = feature.coreEnumWidth
         returnValueWidth  = feature.coreReturnValueWidth
         prototypeWidth    = feature.corePrototypeWidth
+        functionNameWidth = feature.coreFunctionNameWidth
+        table             = feature.coreTable
+    style = moduleStyle( feature )
 
     with IncludeFile( path ) as out:
         out.writeComment()
@@ -480,10 +1494,20 @@ def GenerateFeatureInclude( feature, path, removed = False ):
             for command in commands:
                 out.write( f"{command.getPrototype( returnValueWidth, prototypeWidth )}\n" )
 
-            #Write declarations
-            out.write( "\n//Declarations\n" )
+            #Write function table
+            if style == "table" or style == "context":
+                writeTableStruct( out, commands, prototypeWidth, table )
+            if style == "table":
+                out.write( f"extern {table}_t {table};\n" )
+
+            #Write declarations (with context loaders, dispatch.hpp declares the commands instead)
+            if style != "context":
+                out.write( "\n//Declarations\n" )
             for command in commands:
-                out.write( f"{command.getDeclaration( prototypeWidth )}\n" )
+                if style == "table":
+                    out.write( f"{command.getTableReference( prototypeWidth, functionNameWidth, table )}\n" )
+                elif style == "statements" or style == "lazy":
+                    out.write( f"{command.getDeclaration( prototypeWidth )}\n" )
 
         out.endNamespaces()
 
@@ -495,16 +1519,26 @@ def GenerateFeatureSource( feature, path, incpath, removed = False ):
         prototypeWidth    = feature.removedPrototypeWidth
         functionNameWidth = feature.removedFunctionNameWidth
         loadFunction      = feature.removedLoadFunction
+        table             = feature.removedTable
     else:
         commands          = feature.coreCommands
         prototypeWidth    = feature.corePrototypeWidth
         functionNameWidth = feature.coreFunctionNameWidth
         loadFunction      = feature.coreLoadFunction
+        table             = feature.coreTable
     
     #No commands means no need for a source file
     if len( commands ) == 0:
         return
 
+    style = moduleStyle( feature )
+    #Context loaders load commands into dispatch tables (see generateDispatch())
+    if style == "context":
+        return
+    if style == "table":
+        GenerateTableSource( feature, path, incpath, commands, loadFunction, table )
+        return
+
     #Write source file
     with SourceFile( path ) as out:
         out.writeComment()
@@ -512,10 +1546,12 @@ def GenerateFeatureSource( feature, path, incpath, removed = False ):
         out.write(
              "\n\n\n\n"
              "//Includes\n"
-            f"#include <{PROJECT_NAME}/{TYPES_FILE}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{TYPES_FILES[ feature.registry ]}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{REPORT_FILE}.{INC_EXT}>\n"
             f"#include <{PROJECT_NAME}/{incpath}>\n"
-             "\n\n\n\n"
         )
+        writeCallProfileInclude( out )
+        out.write( "\n\n\n\n" )
 
         out.beginNamespaces()
 
@@ -525,19 +1561,32 @@ def GenerateFeatureSource( feature, path, incpath, removed = False ):
             "extern ProcAddress getProcAddress( const char* name );\n\n"
         )
 
+        #Lazy loaders point each command at a trampoline that resolves it on its first call
+        if style == "lazy":
+            out.write( "//Trampolines\n//Each patches its command's pointer with a plain store, so the first call of a command mustn't race with other calls of it\n" )
+            for command in commands:
+                out.write( f"{command.getTrampoline()}\n" )
+            out.write( "\n" )
+
         #Write definitions
         out.write( "//Definitions\n" )
         for command in commands:
-            out.write( f"{command.getDefinition( prototypeWidth, functionNameWidth )}\n" )
+            if style == "lazy":
+                out.write( f"{command.getLazyDefinition( prototypeWidth, functionNameWidth )}\n" )
+            else:
+                out.write( f"{command.getDefinition( prototypeWidth, functionNameWidth )}\n" )
+        writeCallProfile( out, commands, table )
 
         #Write loading function
         out.write(
             f"\nint {loadFunction}() {{\n"
+            f"    {reportStatement( loadFunction )}\n"
              "    int fail = 0;\n\n"
              "    //Load Statements\n"
         )
         for command in commands:
             out.write( f"    {command.getLoadStatement( functionNameWidth, prototypeWidth )}\n" )
+        writeCallProfileStatements( out, commands )
         out.write(
             "\n    return fail;\n"
             "}\n"
@@ -545,38 +1594,192 @@ def GenerateFeatureSource( feature, path, incpath, removed = False ):
 
         out.endNamespaces()
 
-def generateExtensions():
+#Writes a source file for a module's commands that loads them in a loop, rather than with one load statement per command.
+#The commands' names are packed into a single string, and each name is found by its offset in the string;
+#this avoids a relocated pointer to each name, and the loaded addresses are written to consecutive slots in the module's function table.
+def GenerateTableSource( feature, path, incpath, commands, loadFunction, table ):
+    #Offset of each command's name in the packed string; every name is followed by a null terminator
+    offsets = []
+    size    = 0
+    for command in commands:
+        offsets.append( size )
+        size += len( command.name ) + 1
+    offsetType = "unsigned short" if size <= 0xFFFF else "unsigned int"
+
+    with SourceFile( path ) as out:
+        out.writeComment()
+
+        out.write(
+             "\n\n\n\n"
+             "//Includes\n"
+             "#include <cstring>     //std::memcpy, std::size_t\n"
+            f"#include <{PROJECT_NAME}/{TYPES_FILES[ feature.registry ]}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{REPORT_FILE}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{incpath}>\n"
+        )
+        writeCallProfileInclude( out )
+        out.write( "\n\n\n\n" )
+
+        out.beginNamespaces()
+
+        #TEMP
+        out.write(
+            "typedef void(*ProcAddress)();\n"
+            "extern ProcAddress getProcAddress( const char* name );\n\n"
+        )
+
+        #Write definitions
+        out.write(
+             "//Definitions\n"
+            f"{table}_t {table} = {{}};\n"
+            f"static_assert( sizeof( {table}_t ) == {len( commands )} * sizeof( ProcAddress ), \"Function table must be an array of pointers\" );\n"
+             "\n"
+             "//Names of the commands in the function table, in the same order\n"
+            f"static const char {table}_names[] =\n"
+        )
+        for i, command in enumerate( commands ):
+            terminator = ";" if i == len( commands ) - 1 else ""
+            out.write( f"    \"{command.name}\\0\"{terminator}\n" )
+
+        out.write( f"\n//Offset of each command's name in {table}_names\nstatic const {offsetType} {table}_offsets[] = {{\n" )
+        for i in range( 0, len( offsets ), 16 ):
+            line = ", ".join( str( offset ) for offset in offsets[ i : i + 16 ] )
+            separator = "," if i + 16 < len( offsets ) else ""
+            out.write( f"    {line}{separator}\n" )
+        out.write( "};\n" )
+        writeCallProfile( out, commands, table )
+
+        #Write loading function
+        out.write(
+            f"\nint {loadFunction}() {{\n"
+            f"    {reportStatement( loadFunction )}\n"
+             "    int fail = 0;\n\n"
+             "    //Load Statements\n"
+            f"    char* slots = reinterpret_cast<char*>( &{table} );\n"
+            f"    for( std::size_t i = 0; i < {len( commands )}; ++i ) {{\n"
+            f"        ProcAddress address = getProcAddress( {table}_names + {table}_offsets[i] );\n"
+             "        if( !address ) ++fail;\n"
+             "        std::memcpy( slots + i * sizeof( ProcAddress ), &address, sizeof( ProcAddress ) );\n"
+             "    }\n"
+        )
+        writeCallProfileStatements( out, commands )
+        out.write(
+             "\n    return fail;\n"
+             "}\n"
+        )
+
+        out.endNamespaces()
+
+#Returns the extensions that are generated, in alphabetical order.
+#TEMP: Only OpenGL extensions are generated for now
+def generatedExtensions():
+    return [ extension for extension in extensions if isGeneratedExtension( extension ) ]
+
+#Returns True if the given extension is generated: it's an OpenGL extension, as opposed to e.g. a GLES-only or window system one
+def isGeneratedExtension( extension ):
+    return extension.registry == "gl" and ( "gl" in extension.apis or "glcore" in extension.apis )
+
+#Returns True if the given module (a feature or an extension) is generated
+def isGeneratedModule( module ):
+    if isinstance( module, Feature ):
+        return isGenerated( module )
+    return isGeneratedExtension( module )
+
+#Returns the name of the enumerator that identifies the given extension in gll::has()
+def extensionId( extension ):
+    return f"EXT_{extension.name}"
+
+#Returns the path of the header that declares the given enum or command (which must belong to a feature)
+def moduleHeader( obj ):
+    if obj in obj.owner.coreEnums or obj in obj.owner.coreCommands:
+        return f"mod_{obj.owner.name}.{INC_EXT}"
+    return f"mod_{obj.owner.name}_rem.{INC_EXT}"
+
+#Generates gl_ext.hpp and gl_ext.cpp.
+#The header declares the enums and commands of every extension, an ID for each extension, and gll::has(), which tests whether an extension is present.
+#The source defines LoadExtensions(), which asks the context which extensions it has, and loads only those.
+#Extension names reported by the context are looked up in a perfect hash table of every extension GLL knows about, and each extension that's found
+#sets its bit in a bitset; after that, gll::has() is a single bit test.
+#With context loaders, extension commands live in dispatch tables instead (see generateDispatch()), so only the lookup is written here.
+#If a target feature is given (see renderTarget()), the source only relies on what that feature's user header declares.
+def generateExtensions( target = None ):
+    generated = generatedExtensions()
+    for extension in generated:
+        extension.computeWidths()
+
     incpath = f"{EXT_FILE}.{INC_EXT}"
     with IncludeFile( incpath ) as out:
         out.writeComment()
         out.beginIncludeGuard()
+
+        out.write(
+             "//Includes\n"
+             "#include <cstddef>      //std::size_t\n"
+             "#include <cstdint>      //std::uint64_t\n"
+            f"#include \"{TYPES_FILE}.{INC_EXT}\"\n\n"
+        )
+
         out.beginNamespaces()
 
-        for extension in extensions:
+        for extension in generated:
             #Skip empty extensions
-            if len( extension.enums ) == 0 and len( extension.commands ) == 0:
+            if len( extension.coreEnums ) == 0 and len( extension.coreCommands ) == 0:
                 continue
 
             out.write( f"//{extension.name}\n" )
             #Write enums
-            if len( extension.enums ) > 0:
+            if len( extension.coreEnums ) > 0:
                 out.write( "//Enums\n" )
-                for enum in extension.enums:
-                    out.write( f"{enum.getDefinition( extension.enw )}\n" )
+                for enum in extension.coreEnums:
+                    out.write( f"{enum.getDefinition( extension.coreEnumWidth )}\n" )
                 out.write( "\n" )
 
             #Write prototypes
-            if len( extension.commands ) > 0:
+            if len( extension.coreCommands ) > 0:
                 out.write( "//Prototypes\n" )
-                for command in extension.commands:
-                    out.write( f"{command.getPrototype( extension.rvw, extension.ptw )}\n" )
+                for command in extension.coreCommands:
+                    out.write( f"{command.getPrototype( extension.coreReturnValueWidth, extension.corePrototypeWidth )}\n" )
 
+                #Write function table
+                if loaderStyle == "context":
+                    writeTableStruct( out, extension.coreCommands, extension.corePrototypeWidth, extension.coreTable )
                 #Write declarations
-                out.write( "\n//Declarations\n" )
-                for command in extension.commands:
-                    out.write( f"{command.getDeclaration( extension.ptw )}\n" )
+                else:
+                    out.write( "\n//Declarations\n" )
+                    for command in extension.coreCommands:
+                        out.write( f"{command.getDeclaration( extension.corePrototypeWidth )}\n" )
                 out.write( "\n" )
 
+        #Write extension IDs
+        out.write( "//Extension IDs\nenum Extension : unsigned int {\n" )
+        for extension in generated:
+            out.write( f"    {extensionId( extension )},\n" )
+        out.write(
+            "    EXTENSION_COUNT\n"
+            "};\n"
+            "\n"
+            "//Returns the ID of the extension with the given name (which is length characters long), or -1 if GLL doesn't know about it.\n"
+            "int findExtension( const char* name, std::size_t length );\n"
+        )
+
+        #With context loaders, dispatch.hpp declares these per dispatch table
+        if loaderStyle != "context":
+            out.write(
+                "\n"
+                "//Bit i is set if the extension with ID i is present; filled by LoadExtensions()\n"
+                "extern std::uint64_t extensionBits[ ( EXTENSION_COUNT + 63 ) / 64 ];\n"
+                "\n"
+                "//Returns true if the given extension is present.\n"
+                "inline bool has( Extension extension ) {\n"
+                "    return ( extensionBits[ extension / 64 ] >> ( extension % 64 ) ) & 1;\n"
+                "}\n"
+                "\n"
+                "//Finds out which extensions the current context has, and loads their commands.\n"
+                "//Needs glGetIntegerv, glGetString and glGetStringi, so call it after loading the context's version (Load() calls it for you).\n"
+                "//Returns the number of commands that failed to load.\n"
+                "int LoadExtensions();\n"
+            )
+
         out.endNamespaces()
         out.endIncludeGuard()
 
@@ -588,54 +1791,394 @@ def generateExtensions():
         out.write(
              "\n\n\n\n"
              "//Includes\n"
-            f"#include \"{EXT_FILE}.{INC_EXT}\"\n"
-             "\n\n\n\n"
+             "#include <cstring>      //std::memcmp, std::memset, std::strlen\n"
+            f"#include <{PROJECT_NAME}/{REPORT_FILE}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{EXT_FILE}.{INC_EXT}>\n"
         )
+        if loaderStyle != "context":
+            for header in sorted( { moduleHeader( obj ) for obj in extensionQueries() if isDeclaredFor( obj, target ) } ):
+                out.write( f"#include <{PROJECT_NAME}/{header}>\n" )
+            writeCallProfileInclude( out )
+        out.write( "\n\n\n\n" )
 
         out.beginNamespaces()
 
-        #Write extension struct (used in extension table)
-        # fout.write(
-        #     "typedef void (*load_function)();\n" +
-        #     "struct ExtInfo {\n"                 +
-        #     "    const char* const name;\n"      +
-        #     "    bool loaded;\n"                 +
-        #     "    const load_function loader;\n"  +
-        #     "};"
-        # );
-
-        for extension in extensions:
-            #Skip extensions with no commands (nothing to load)
-            if len( extension.commands ) == 0:
-                continue
-
+        if loaderStyle != "context":
+            #TEMP
             out.write(
-                f"//Extension: {extension.name}\n"
-                 "//Definitions\n"
+                "typedef int (LoadFunction)();\n"
+                "typedef void(*ProcAddress)();\n"
+                "extern ProcAddress getProcAddress( const char* name );\n\n"
             )
 
-            for command in extension.commands:
-                out.write( f"{command.getDefinition( extension.ptw, extension.fnw )}\n" )
-
-            #Write loading function
+            for extension in generated:
+                #Skip extensions with no commands (nothing to load)
+                if len( extension.coreCommands ) == 0:
+                    continue
+
+                out.write(
+                    f"//Extension: {extension.name}\n"
+                     "//Definitions\n"
+                )
+
+                for command in extension.coreCommands:
+                    out.write( f"{command.getDefinition( extension.corePrototypeWidth, extension.coreFunctionNameWidth )}\n" )
+                writeCallProfile( out, extension.coreCommands, extension.coreTable )
+
+                #Write loading function
+                out.write(
+                    f"\nstatic int {extension.coreLoadFunction}() {{\n"
+                    f"    {reportStatement( extension.coreLoadFunction )}\n"
+                     "    int fail = 0;\n\n"
+                     "    //Load Statements\n"
+                )
+
+                for command in extension.coreCommands:
+                    out.write( f"    {command.getLoadStatement( extension.coreFunctionNameWidth, extension.corePrototypeWidth )}\n" )
+                writeCallProfileStatements( out, extension.coreCommands )
+                out.write(
+                    "\n    return fail;\n"
+                    "}\n\n"
+                )
+
+            #Write the loader of each extension, by ID
+            out.write( "//Loader of each extension (nullptr if the extension has no commands), by ID\nstatic LoadFunction* const extensionLoaders[] = {\n" )
+            for i, extension in enumerate( generated ):
+                loadFunction = extension.coreLoadFunction if len( extension.coreCommands ) > 0 else "nullptr"
+                separator    = "," if i < len( generated ) - 1 else ""
+                out.write( f"    {loadFunction}{separator}\n" )
+            out.write( "};\n\n" )
+
+        #Write the lookup table
+        table = PerfectHash( [ extension.name for extension in generated ] )
+        writeLookup( out, table, "extension", [ extension.name for extension in generated ], "findExtension" )
+
+        if loaderStyle != "context":
             out.write(
-                f"\nint {extension.loadFunction}() {{\n"
-                 "    int fail = 0;\n\n"
-                 "    //Load Statements\n"
+                "\n"
+                "std::uint64_t extensionBits[ ( EXTENSION_COUNT + 63 ) / 64 ] = {};\n"
+                "\n"
+                "//Marks the extension with the given name as present and loads it\n"
+                "static int loadExtension( const char* name, std::size_t length ) {\n"
+                "    int id = findExtension( name, length );\n"
+                "    if( id < 0 )\n"
+                "        return 0;\n"
+                "\n"
+                "    extensionBits[ id / 64 ] |= std::uint64_t( 1 ) << ( id % 64 );\n"
+                "    return extensionLoaders[ id ] ? extensionLoaders[ id ]() : 0;\n"
+                "}\n"
+                "\n"
+                "int LoadExtensions() {\n"
+                "    int fail = 0;\n"
+                "    std::memset( extensionBits, 0, sizeof( extensionBits ) );\n"
+                "\n"
             )
+            writeExtensionQuery( out, lambda command: command, "", isDeclaredFor( commands[ "glGetStringi" ], target ) )
+            out.write( "}\n" )
 
-            for command in extension.commands:
-                out.write( f"    {command.getLoadStatement( extension.fnw, extension.ptw )}\n" )
-            out.write(
-                "\n    return fail;\n"
-                "}\n\n"
-            )
+        out.endNamespaces()
 
-        # fout.write( "ExtInfo extensions[] = {\n" )
-        # for extension in extensions:
-        #     fout.write( "    { \"%s\", false, %s },\n" % ( ( "\"%s\"," % extension.name ), extension.loadFunction if len( extension.commands ) > 0 else "nullptr" ) )
-        # fout.write( "    { nullptr, false, nullptr }\n" )
-        # fout.write( "};\n" )
+#Returns the commands and enums that are needed to ask a context which extensions it has
+def extensionQueries():
+    return [ commands[ "glGetIntegerv" ], commands[ "glGetString" ], commands[ "glGetStringi" ], enums[ "GL_NUM_EXTENSIONS" ], enums[ "GL_EXTENSIONS" ] ]
+
+#Returns True if the given enum or command is declared in the given feature's user header, or always if no feature is given (the split layout declares everything)
+def isDeclaredFor( obj, target ):
+    return target is None or ( obj.owner.api == target.api and obj.owner.version <= target.version )
+
+#Writes the body of a function that asks the context which extensions it has, and passes each name to loadExtension().
+#The function must have declared "int fail".
+#Each command is called through the expression returned by the given function for its name, and loadExtension() is called with the given arguments before the name.
+#glGetStringi and GL_NUM_EXTENSIONS only exist from OpenGL 3.0 on; if stringiDeclared is False (amalgamations and module units of earlier versions),
+#glGetStringi is looked up with getProcAddress() instead, and the enum is written as a value.
+def writeExtensionQuery( out, call, args, stringiDeclared = True ):
+    getStringi    = call( "glGetStringi" )
+    numExtensions = "GL_NUM_EXTENSIONS"
+    if not stringiDeclared:
+        getStringi    = "getStringi"
+        numExtensions = f"{enums[ 'GL_NUM_EXTENSIONS' ].value} /*GL_NUM_EXTENSIONS*/"
+        out.write(
+             "    typedef const GLubyte* (GLAPI *GetStringiFunction)( GLenum name, GLuint index );\n"
+             "    GetStringiFunction getStringi = reinterpret_cast<GetStringiFunction>( getProcAddress( \"glGetStringi\" ) );\n"
+             "\n"
+        )
+    out.write(
+         "    //OpenGL 3.0 and above report extensions one at a time. glGetStringi can be found on older contexts too (glXGetProcAddress finds any name),\n"
+         "    //but they don't know GL_NUM_EXTENSIONS and leave count at 0, so they fall back to the string below\n"
+         "    GLint count = 0;\n"
+        f"    if( {getStringi} )\n"
+        f"        {call( 'glGetIntegerv' )}( {numExtensions}, &count );\n"
+         "    if( count > 0 ) {\n"
+         "        for( GLint i = 0; i < count; ++i ) {\n"
+        f"            const char* name = reinterpret_cast<const char*>( {getStringi}( GL_EXTENSIONS, i ) );\n"
+         "            if( name )\n"
+        f"                fail += loadExtension( {args}name, std::strlen( name ) );\n"
+         "        }\n"
+         "        return fail;\n"
+         "    }\n"
+         "\n"
+         "    //Older contexts report them in a single space-separated string\n"
+        f"    const char* names = {call( 'glGetString' )} ? reinterpret_cast<const char*>( {call( 'glGetString' )}( GL_EXTENSIONS ) ) : nullptr;\n"
+         "    if( !names )\n"
+         "        return fail;\n"
+         "    while( *names ) {\n"
+         "        const char* end = names;\n"
+         "        while( *end && *end != ' ' )\n"
+         "            ++end;\n"
+         "        if( end != names )\n"
+        f"            fail += loadExtension( {args}names, end - names );\n"
+         "        names = *end ? end + 1 : end;\n"
+         "    }\n"
+         "    return fail;\n"
+    )
+
+#Returns the modules whose commands are gathered in dispatch tables, in the order they appear in DispatchTable, as a list of ( member, commands ) tuples.
+#Every version of OpenGL comes first, followed by every extension.
+def dispatchModules():
+    modules = []
+    for api, apiFeatures in generatedApis():
+        if api != "gl":
+            continue
+        for feature in apiFeatures:
+            if len( feature.coreCommands ) > 0:
+                modules.append( ( feature.coreTable[ len( "table_" ): ], feature.coreCommands, feature.coreTable ) )
+            if len( feature.removedCommands ) > 0:
+                modules.append( ( feature.removedTable[ len( "table_" ): ], feature.removedCommands, feature.removedTable ) )
+    for extension in generatedExtensions():
+        if len( extension.coreCommands ) > 0:
+            modules.append( ( extension.coreTable[ len( "table_" ): ], extension.coreCommands, extension.coreTable ) )
+    return modules
+
+#Generates dispatch.hpp and dispatch.cpp (context loaders only).
+#A dispatch table holds every OpenGL and extension command for one context, along with which extensions that context has.
+#Each thread has a current dispatch table, and the gll::gl* functions call through it; making a different table current is a single pointer store,
+#and resetting a table is a single memset.
+def generateDispatch():
+    modules = dispatchModules()
+
+    #Slot of each command in the table; every member of DispatchTable before extensionBits is an array of pointers, so they're numbered consecutively
+    slots   = [ command for _, commands, _ in modules for command in commands ]
+    members = { command.name: member for member, commands, _ in modules for command in commands }
+    headers = [
+        f"mod_{feature.name}{suffix}.{INC_EXT}"
+        for api, apiFeatures in generatedApis() if api == "gl"
+        for feature in apiFeatures
+        for suffix, moduleEnums, moduleCommands in ( ( "", feature.coreEnums, feature.coreCommands ), ( "_rem", feature.removedEnums, feature.removedCommands ) )
+        if suffix == "" or len( moduleEnums ) > 0 or len( moduleCommands ) > 0
+    ]
+
+    with IncludeFile( f"{DISPATCH_FILE}.{INC_EXT}" ) as out:
+        out.writeComment()
+        out.beginIncludeGuard()
+
+        out.write(
+             "//Includes\n"
+             "#include <cstdint>      //std::uint64_t\n"
+             "#include <cstring>      //std::memset\n"
+            f"#include \"{TYPES_FILE}.{INC_EXT}\"\n"
+            f"#include \"{LOADER_FILE}.{INC_EXT}\"\n"
+        )
+        for header in headers:
+            out.write( f"#include \"{header}\"\n" )
+        out.write( f"#include \"{EXT_FILE}.{INC_EXT}\"\n\n" )
+
+        out.beginNamespaces()
+
+        out.write( "//Every OpenGL and extension command for one context, and which extensions it has\nstruct alignas( 64 ) DispatchTable {\n" )
+        width = max( len( table ) for _, _, table in modules ) + len( "_t" )
+        for member, _, table in modules:
+            out.write( f"    {( table + '_t' ).ljust( width )} {member};\n" )
+        out.write(
+            "\n"
+            "    //Bit i is set if the extension with ID i is present\n"
+            "    std::uint64_t extensionBits[ ( EXTENSION_COUNT + 63 ) / 64 ];\n"
+            "\n"
+            "    //Version and profile of the context, as detected by Load()\n"
+            "    ContextVersion version;\n"
+            "};\n"
+            "\n"
+            "//The current dispatch table of the calling thread; gll::gl* functions call through it\n"
+            "extern thread_local constinit DispatchTable* currentTable;\n"
+            "\n"
+            "//Makes the given dispatch table current on the calling thread. Call it whenever a different context is made current.\n"
+            "inline void MakeCurrent( DispatchTable* table ) {\n"
+            "    currentTable = table;\n"
+            "}\n"
+            "\n"
+            "//Returns the current dispatch table of the calling thread\n"
+            "inline DispatchTable* GetCurrent() {\n"
+            "    return currentTable;\n"
+            "}\n"
+            "\n"
+            "//Forgets every command and extension in the given dispatch table (e.g. after its context is lost)\n"
+            "inline void Reset( DispatchTable& table ) {\n"
+            "    std::memset( &table, 0, sizeof( table ) );\n"
+            "}\n"
+            "\n"
+            "//Returns true if the given extension is present in the given dispatch table's context\n"
+            "inline bool has( const DispatchTable& table, Extension extension ) {\n"
+            "    return ( table.extensionBits[ extension / 64 ] >> ( extension % 64 ) ) & 1;\n"
+            "}\n"
+            "\n"
+            "//Returns true if the given extension is present in the current context\n"
+            "inline bool has( Extension extension ) {\n"
+            "    return has( *currentTable, extension );\n"
+            "}\n"
+            "\n"
+            "//Loads every command and extension the current context has into the given dispatch table.\n"
+            "//Returns the number of commands that failed to load.\n"
+            "int Load( DispatchTable& table );\n"
+            "\n"
+            "//Commands\n"
+        )
+        for command in slots:
+            out.write( f"{command.getDispatchWrapper( members[ command.name ] )}\n" )
+
+        out.endNamespaces()
+        out.endIncludeGuard()
+
+    #Offset of each command's name in the packed string
+    offsets = []
+    size    = 0
+    for command in slots:
+        offsets.append( size )
+        size += len( command.name ) + 1
+    offsetType = "unsigned short" if size <= 0xFFFF else "unsigned int"
+
+    #First slot and number of slots of each extension's commands, by ID
+    first = {}
+    slot  = 0
+    for member, commands, _ in modules:
+        first[ member ] = slot
+        slot += len( commands )
+    ranges = [
+        ( first.get( extension.coreTable[ len( "table_" ): ], 0 ), len( extension.coreCommands ) )
+        for extension in generatedExtensions()
+    ]
+    rangeType = "unsigned short" if len( slots ) <= 0xFFFF else "unsigned int"
+
+    #First slot, number of slots, version (major * 10 + minor) and whether it's a removed module, of each OpenGL version's modules
+    coreModules = [
+        ( first[ table[ len( "table_" ): ] ], len( commands ), feature.version.major * 10 + feature.version.minor, int( removed ) )
+        for api, apiFeatures in generatedApis() if api == "gl"
+        for feature in apiFeatures
+        for table, commands, removed in ( ( feature.coreTable, feature.coreCommands, False ), ( feature.removedTable, feature.removedCommands, True ) )
+        if len( commands ) > 0
+    ]
+
+    def slotCall( name ):
+        return f"table.{members[ name ]}.{name}"
+
+    with SourceFile( f"{DISPATCH_FILE}.{SRC_EXT}" ) as out:
+        out.writeComment()
+
+        out.write(
+             "\n\n\n\n"
+             "//Includes\n"
+             "#include <cstddef>      //offsetof, std::size_t\n"
+             "#include <cstring>      //std::memcpy, std::strlen\n"
+            f"#include <{PROJECT_NAME}/{REPORT_FILE}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{DISPATCH_FILE}.{INC_EXT}>\n"
+             "\n\n\n\n"
+        )
+
+        out.beginNamespaces()
+
+        #TEMP
+        out.write(
+            "typedef void(*ProcAddress)();\n"
+            "extern ProcAddress getProcAddress( const char* name );\n"
+            "extern ContextVersion detectContextVersion();\n\n"
+            "thread_local constinit DispatchTable* currentTable = nullptr;\n\n"
+            f"static_assert( offsetof( DispatchTable, extensionBits ) == {len( slots )} * sizeof( ProcAddress ), \"Every member of DispatchTable before extensionBits must be an array of pointers\" );\n"
+            "\n"
+            "//Names of the commands in DispatchTable, in the same order\n"
+            "static const char commandNames[] =\n"
+        )
+        for i, command in enumerate( slots ):
+            terminator = ";" if i == len( slots ) - 1 else ""
+            out.write( f"    \"{command.name}\\0\"{terminator}\n" )
+
+        out.write( f"\n//Offset of each command's name in commandNames\nstatic const {offsetType} commandOffsets[] = {{\n" )
+        for i in range( 0, len( offsets ), 16 ):
+            line = ", ".join( str( offset ) for offset in offsets[ i : i + 16 ] )
+            separator = "," if i + 16 < len( offsets ) else ""
+            out.write( f"    {line}{separator}\n" )
+        out.write( "};\n" )
+
+        out.write( f"\n//First slot and number of slots of each extension's commands, by ID\nstatic const {rangeType} extensionSlots[][2] = {{\n" )
+        for i in range( 0, len( ranges ), 8 ):
+            line = ", ".join( f"{{ {start}, {count} }}" for start, count in ranges[ i : i + 8 ] )
+            separator = "," if i + 8 < len( ranges ) else ""
+            out.write( f"    {line}{separator}\n" )
+        out.write( "};\n" )
+
+        out.write( f"\n//First slot, number of slots, version (major * 10 + minor) and whether it's removed, of each OpenGL version's modules\nstatic const {rangeType} coreModules[][4] = {{\n" )
+        for i in range( 0, len( coreModules ), 4 ):
+            line = ", ".join( f"{{ {start}, {count}, {version}, {removed} }}" for start, count, version, removed in coreModules[ i : i + 4 ] )
+            separator = "," if i + 4 < len( coreModules ) else ""
+            out.write( f"    {line}{separator}\n" )
+        out.write( "};\n" )
+
+        out.write(
+             "\n"
+             "//Loads count commands into the given table, starting at the given slot\n"
+             "static int loadSlots( DispatchTable& table, std::size_t first, std::size_t count ) {\n"
+             "    int fail = 0;\n"
+             "    char* slots = reinterpret_cast<char*>( &table );\n"
+             "    for( std::size_t i = first; i < first + count; ++i ) {\n"
+             "        ProcAddress address = getProcAddress( commandNames + commandOffsets[i] );\n"
+             "        if( !address ) ++fail;\n"
+             "        std::memcpy( slots + i * sizeof( ProcAddress ), &address, sizeof( ProcAddress ) );\n"
+             "    }\n"
+             "    return fail;\n"
+             "}\n"
+             "\n"
+             "//Loads the commands of every OpenGL version the table's context supports into the given table,\n"
+             "//including the commands later versions removed only if the context has them. Loads every version if the context's version is unknown.\n"
+             "static int loadCore( DispatchTable& table ) {\n"
+             "    GLL_REPORT_MODULE( \"gl\" );\n"
+             "    const ContextVersion& context = table.version;\n"
+             "    int version = context.major * 10 + context.minor;\n"
+             "    int fail    = 0;\n"
+             "    for( const auto& module : coreModules ) {\n"
+             "        if( context.major == 0 || ( module[2] <= version && ( !module[3] || context.compatibility ) ) )\n"
+             "            fail += loadSlots( table, module[0], module[1] );\n"
+             "    }\n"
+             "    return fail;\n"
+             "}\n"
+             "\n"
+        )
+
+        #Only needed for the load report; extensions without commands have nothing to report
+        out.write( "#ifdef GLL_LOAD_REPORT\n//Name of each extension, by ID (nullptr if the extension has no commands)\nstatic const char* const extensionNames[] = {\n" )
+        generated = generatedExtensions()
+        for i, extension in enumerate( generated ):
+            name      = f"\"{extension.name}\"" if len( extension.coreCommands ) > 0 else "nullptr"
+            separator = "," if i < len( generated ) - 1 else ""
+            out.write( f"    {name}{separator}\n" )
+        out.write( "};\n#endif\n\n" )
+
+        out.write(
+             "//Marks the extension with the given name as present in the given table and loads it\n"
+             "static int loadExtension( DispatchTable& table, const char* name, std::size_t length ) {\n"
+             "    int id = findExtension( name, length );\n"
+             "    if( id < 0 )\n"
+             "        return 0;\n"
+             "\n"
+             "    table.extensionBits[ id / 64 ] |= std::uint64_t( 1 ) << ( id % 64 );\n"
+             "    GLL_REPORT_MODULE( extensionNames[ id ] );\n"
+             "    return loadSlots( table, extensionSlots[ id ][0], extensionSlots[ id ][1] );\n"
+             "}\n"
+             "\n"
+             "int Load( DispatchTable& table ) {\n"
+             "    Reset( table );\n"
+             "    table.version = detectContextVersion();\n"
+             "    int fail = loadCore( table );\n"
+             "\n"
+        )
+        writeExtensionQuery( out, slotCall, "table, " )
+        out.write( "}\n" )
 
         out.endNamespaces()
 
@@ -650,7 +2193,7 @@ def generateUserHeader( feature, path, compatibility = False ):
         
         out.write(
              "//Includes\n"
-            f"#include \"{TYPES_FILE}.{INC_EXT}\"\n\n"
+            f"#include \"{TYPES_FILES[ feature.registry ]}.{INC_EXT}\"\n\n"
         )
 
         #We need to include the core headers for this version and every version that came before it
@@ -662,28 +2205,1368 @@ def generateUserHeader( feature, path, compatibility = False ):
                 if compatibility and ( len( feature2.removedEnums ) > 0 or len( feature2.removedCommands ) > 0 ):
                     out.write( f"#include \"mod_{feature2.name}_rem.{INC_EXT}\"\n" )
 
+        #With context loaders, the commands themselves are declared in dispatch.hpp
+        if moduleStyle( feature ) == "context":
+            out.write( f"#include \"{DISPATCH_FILE}.{INC_EXT}\"\n" )
+
         out.endIncludeGuard()
 
 #Generates files the user can include
 def generateUserHeaders():
     for feature in features:
-        corePath   = f"{feature.name}.{INC_EXT}"
-        compatPath = f"{feature.name}_comp.{INC_EXT}"
-
-        #We may or may not need to generate additional headers when generating for the GL api.
-        if feature.api == "gl":
-            #For GL 3.0 and below, a single header that includes both core and removed headers is generated.
-            if feature.version < PROFILES_SINCE:
-                generateUserHeader( feature, corePath, True )
-            #For GL 3.1 and above, two headers (core and compatibility) are generated.
-            #The former includes only the core headers, while the latter includes both core and removed headers.
-            #The compatibility header has a "_comp" suffix added to distinguish it from the core header.
+        generateUserHeadersFor( feature )
+
+#Generates the user headers for a single feature
+def generateUserHeadersFor( feature ):
+    corePath   = f"{feature.name}.{INC_EXT}"
+    compatPath = f"{feature.name}_comp.{INC_EXT}"
+
+    #We may or may not need to generate additional headers when generating for the GL api.
+    if feature.api == "gl":
+        #For GL 3.0 and below, a single header that includes both core and removed headers is generated.
+        if feature.version < PROFILES_SINCE:
+            generateUserHeader( feature, corePath, True )
+        #For GL 3.1 and above, two headers (core and compatibility) are generated.
+        #The former includes only the core headers, while the latter includes both core and removed headers.
+        #The compatibility header has a "_comp" suffix added to distinguish it from the core header.
+        else:
+            generateUserHeader( feature, corePath )
+            generateUserHeader( feature, compatPath, True )
+    #For all other APIs we generate only a single header
+    else:
+        generateUserHeader( feature, corePath, True )
+
+#Returns a dict mapping the name of each OpenGL user header (e.g. "gl_4_6_comp") to the feature it's for and whether it includes removed modules
+def userHeaderTargets():
+    targets = {}
+    for feature in features:
+        if feature.api != "gl":
+            continue
+        if feature.version < PROFILES_SINCE:
+            targets[ feature.name ] = ( feature, True )
+        else:
+            targets[ feature.name ] = ( feature, False )
+            targets[ f"{feature.name}_comp" ] = ( feature, True )
+    return targets
+
+#Returns the given generated file's content without its leading comment, its include guard, and its includes of other GLL files
+def flatten( content, includeGuard = None ):
+    if content.startswith( "/*" ):
+        content = content[ content.index( "*/\n" ) + 3: ]
+
+    lines = []
+    for line in content.split( "\n" ):
+        if includeGuard is not None and line in ( f"#ifndef {includeGuard}", f"#define {includeGuard}", f"#endif //{includeGuard}" ):
+            continue
+        if line.startswith( "#include \"" ) or line.startswith( f"#include <{PROJECT_NAME}/" ):
+            continue
+        lines.append( line )
+    return "\n".join( lines ).strip( "\n" ) + "\n"
+
+#Renders the split layout of the given feature's user header in memory.
+#Returns a dict mapping each rendered file's path to its content, and the names (sans extension) of the headers and sources
+#the user header depends on, in the order the split user header includes them.
+def renderTarget( feature, compatibility ):
+    included = [ feature2 for feature2 in features if feature2.api == feature.api and feature2.version <= feature.version ]
+
+    SourceFile.captured = {}
+    try:
+        generateTypes()
+        for feature2 in included:
+            generateFeature( feature2 )
+        generateExtensions( feature )
+        generateLoader( feature, compatibility )
+        captured = SourceFile.captured
+    finally:
+        SourceFile.captured = None
+
+    modules = []
+    for feature2 in included:
+        modules.append( f"mod_{feature2.name}" )
+        if compatibility:
+            modules.append( f"mod_{feature2.name}_rem" )
+    headers = [ TYPES_FILE, REPORT_FILE, CALL_PROFILE_FILE, *modules, EXT_FILE, LOADER_FILE ]
+    sources = [ *modules, EXT_FILE, CALL_PROFILE_FILE, LOADER_FILE ]
+    return captured, headers, sources
+
+#Writes an amalgamation for the given target (see userHeaderTargets()): a single header and a single source file,
+#named after the target's user header, that contain everything the split layout would generate for it.
+#The split files are rendered in memory and flattened, so the amalgamation has the same content in the same order, without includes between GLL files.
+def amalgamate( target ):
+    if loaderStyle == "context":
+        raise RuntimeError( "--amalgamate can't be used with context loaders." )
+    targets = userHeaderTargets()
+    if target not in targets:
+        raise RuntimeError( f"Unknown --amalgamate target \"{target}\"; expected the name of an OpenGL user header, e.g. gl_4_6_comp." )
+    feature, compatibility = targets[ target ]
+    captured, headers, sources = renderTarget( feature, compatibility )
+
+    with IncludeFile( f"{target}.{INC_EXT}" ) as out:
+        out.writeComment()
+        out.beginIncludeGuard()
+        for name in headers:
+            path = f"{INC_PROJECT_DIR}/{name}.{INC_EXT}"
+            if path in captured:
+                out.write( f"//{name}.{INC_EXT}\n{flatten( captured[ path ], IncludeFile( f'{name}.{INC_EXT}' ).guardName )}\n\n\n\n" )
+        out.endIncludeGuard()
+
+    with SourceFile( f"{target}.{SRC_EXT}" ) as out:
+        out.writeComment()
+        out.write(
+             "\n\n\n\n"
+             "//Includes\n"
+            f"#include <{PROJECT_NAME}/{target}.{INC_EXT}>\n"
+             "\n\n\n\n"
+        )
+        for name in sources:
+            path = f"{SRC_PROJECT_DIR}/{name}.{SRC_EXT}"
+            if path in captured:
+                out.write( f"//{name}.{SRC_EXT}\n{flatten( captured[ path ] )}\n\n\n\n" )
+
+#Matches the #define of an enum in a generated header, capturing its name, the padding after the name, and its value
+RE_ENUM_DEFINE = re_compile( r"^#define (\w+)(\s+)(.+)$" )
+
+#Generates the C++20 module interface units for a single feature, one for each of its user headers (see userHeaderTargets())
+def generateModuleInterfacesFor( feature ):
+    for target, ( feature2, _ ) in userHeaderTargets().items():
+        if feature2 is feature:
+            generateModuleInterface( target )
+
+#Writes a C++20 module interface unit for the given target, which exports everything the target's user header declares as module gll.{target}.
+#Enums are exported as constexpr variables instead of macros, since macros can't be exported from modules.
+#The unit also contains every definition the target needs, so it's compiled in place of the target's split sources rather than alongside them.
+def generateModuleInterface( target ):
+    feature, compatibility = userHeaderTargets()[ target ]
+    captured, headers, sources = renderTarget( feature, compatibility )
+
+    #System headers are included in the global module fragment, so that what they declare isn't attached to this module
+    includes = {}
+    def hoistIncludes( content ):
+        lines = []
+        for line in content.split( "\n" ):
+            if line.startswith( "#include <" ):
+                includes.setdefault( line.split()[1], line )
             else:
-                generateUserHeader( feature, corePath )
-                generateUserHeader( feature, compatPath, True )
-        #For all other APIs we generate only a single header
+                lines.append( line )
+        return "\n".join( lines )
+
+    def exportEnums( content ):
+        lines = []
+        for line in content.split( "\n" ):
+            match = RE_ENUM_DEFINE.match( line )
+            if match is not None and match.group( 1 ) in enums:
+                name, padding, value = match.groups()
+                line = f"inline constexpr auto {name}{padding}= {value};"
+            lines.append( line )
+        return "\n".join( lines )
+
+    exported = []
+    for name in headers:
+        path = f"{INC_PROJECT_DIR}/{name}.{INC_EXT}"
+        if path in captured:
+            content = flatten( captured[ path ], IncludeFile( f"{name}.{INC_EXT}" ).guardName )
+            exported.append( f"//{name}.{INC_EXT}\n{exportEnums( hoistIncludes( content ) )}\n\n\n\n" )
+
+    #The loader's source isn't taken from the render because its platform includes are conditional; its body is written below instead
+    definitions = []
+    for name in sources:
+        path = f"{SRC_PROJECT_DIR}/{name}.{SRC_EXT}"
+        if name != LOADER_FILE and path in captured:
+            definitions.append( f"//{name}.{SRC_EXT}\n{hoistIncludes( flatten( captured[ path ] ) )}\n\n\n\n" )
+    for header in ( "<cstddef>", "<cstring>", "<cstdint>" ):
+        includes.setdefault( header, f"#include {header}" )
+
+    with SourceFile( f"{target}.{MODULE_EXT}" ) as out:
+        out.writeComment()
+        out.write(
+            "\n\n\n\n"
+            "//Global module fragment\n"
+            "module;\n"
+            "\n"
+        )
+        for include in includes.values():
+            out.write( f"{include}\n" )
+        out.write(
+             "\n"
+             "#ifdef _WIN32\n"
+             "#include <windows.h>    //wglGetProcAddress, LoadLibraryA, GetProcAddress\n"
+             "#else\n"
+             "#include <dlfcn.h>      //dlopen, dlsym\n"
+             "#endif\n"
+             "\n"
+             "#ifdef GLL_LOAD_REPORT\n"
+             "#include <chrono>       //std::chrono::steady_clock\n"
+             "#include <mutex>        //std::mutex, std::lock_guard\n"
+             "#include <utility>      //std::move\n"
+             "#endif\n"
+             "\n\n\n\n"
+            f"export module {PROJECT_NAME}.{target};\n"
+             "\n\n\n\n"
+             "export {\n"
+             "\n"
+        )
+        for content in exported:
+            out.write( content )
+        out.write( "} //export\n\n\n\n" )
+        for content in definitions:
+            out.write( content )
+
+        out.write( f"//{LOADER_FILE}.{SRC_EXT}\n" )
+        out.beginNamespaces()
+        writeLoaderSource( out, loaderApis( feature ), compatibility )
+        out.endNamespaces()
+
+#Returns the features modules are generated for, grouped by API: a list of ( api, features ) tuples, with features sorted by version.
+def generatedApis():
+    apis = {}
+    for feature in features:
+        if isGenerated( feature ):
+            apis.setdefault( feature.api, [] ).append( feature )
+    return [ ( api, sorted( apiFeatures, key = lambda x: x.version ) ) for api, apiFeatures in apis.items() ]
+
+#Returns True if the given feature has separate core and compatibility profiles
+def hasProfiles( feature ):
+    return feature.api == "gl" and feature.version >= PROFILES_SINCE
+
+#Returns the load functions of the given feature's core and removed modules, respectively; either is None if that module has nothing to load.
+#If compatibility is False, removed modules are left out.
+def moduleLoadFunctions( feature, compatibility = True ):
+    core    = feature.coreLoadFunction    if len( feature.coreCommands    ) > 0 else None
+    removed = feature.removedLoadFunction if len( feature.removedCommands ) > 0 and compatibility else None
+    return core, removed
+
+#Returns True if any of the given features has a removed module (and compatibility is True)
+def hasRemovedModules( apiFeatures, compatibility = True ):
+    return any( moduleLoadFunctions( feature, compatibility )[1] is not None for feature in apiFeatures )
+
+#Writes a "return a + b + ...;" statement summing the results of the given function calls, one call per line
+def writeSum( out, calls ):
+    if len( calls ) == 0:
+        out.write( "    return 0;\n" )
+        return
+
+    width = max( len( call ) for call in calls )
+    for i, call in enumerate( calls[:-1] ):
+        out.write( f"{'    return ' if i == 0 else '           '}{call.ljust( width )} +\n" )
+    out.write( f"{'    return ' if len( calls ) == 1 else '           '}{calls[-1]};\n" )
+
+def beginPlatformCondition( out, api ):
+    condition = PLATFORM_CONDITIONS.get( api )
+    if condition is not None:
+        out.write( f"#if {condition}\n" )
+
+def endPlatformCondition( out, api ):
+    condition = PLATFORM_CONDITIONS.get( api )
+    if condition is not None:
+        out.write( f"#endif //{condition}\n" )
+
+#Generates loader.hpp and loader.cpp.
+#loader.cpp defines a loader for each version of each API (e.g. load_gl_4_5, load_gl_4_5_comp, load_glx_1_4), as well as Load().
+#Version loaders are built up from two chains of helpers, one for core modules and one for removed modules;
+#each helper loads its version's module and calls the helper for the previous version, so every module is loaded exactly once per call.
+#If a target feature is given, only the OpenGL versions up to and including it are loaded, Load() loads the target, and removed modules
+#are only loaded if compatibility is True (this is how amalgamations get their loader).
+#Returns the APIs and features generateLoader() writes loaders for, in the same form as generatedApis().
+#If a target feature is given, only its API is included, up to and including the target's version.
+def loaderApis( target = None ):
+    #With context loaders, OpenGL is loaded into dispatch tables by dispatch.cpp instead
+    contexts = loaderStyle == "context"
+    apis     = [ ( api, apiFeatures ) for api, apiFeatures in generatedApis() if not ( contexts and api == "gl" ) ]
+    if target is not None:
+        apis = [ ( api, [ feature for feature in apiFeatures if feature.version <= target.version ] ) for api, apiFeatures in apis if api == target.api ]
+    return apis
+
+def generateLoader( target = None, compatibility = True ):
+    contexts = loaderStyle == "context"
+    apis     = loaderApis( target )
+
+    with IncludeFile( f"{LOADER_FILE}.{INC_EXT}" ) as out:
+        out.writeComment()
+        out.beginIncludeGuard()
+        out.beginNamespaces()
+
+        out.write(
+            "//Version loaders\n"
+            "//Each loads every command of its version and the versions before it,\n"
+            "//and returns the number of commands that failed to load.\n"
+        )
+        for api, apiFeatures in apis:
+            beginPlatformCondition( out, api )
+            for feature in apiFeatures:
+                out.write( f"int {feature.loadFunction}();\n" )
+                if hasProfiles( feature ) and hasRemovedModules( apiFeatures, compatibility ):
+                    out.write( f"int {feature.compatLoadFunction}();\n" )
+            endPlatformCondition( out, api )
+
+        out.write(
+            "\n"
+            "//Version and profile of a context, as detected by Load()\n"
+            "struct ContextVersion {\n"
+            "    int  major;         //0 if the version couldn't be detected\n"
+            "    int  minor;\n"
+            "    bool compatibility; //True if the context has the commands later versions removed (compatibility profiles, and versions before 3.1)\n"
+            "};\n"
+        )
+
+        if contexts:
+            out.write(
+                "\n"
+                "struct DispatchTable;\n"
+                "\n"
+                "/*\n"
+                "Load\n"
+                "----\n"
+                "\n"
+                "Description:\n"
+                "    Call to load all available bindings and extensions for the currently active context into the given dispatch table.\n"
+                "    Make the table current with MakeCurrent() (see dispatch.hpp) before calling any bindings on a thread.\n"
+                "    Asks the context for its version and profile first (stored in table.version), and only loads the versions it supports,\n"
+                "    including the commands later versions removed only if it has them. If the context doesn't say, loads every version.\n"
+                "\n"
+                "Arguments:\n"
+                "    table: The dispatch table of the currently active context.\n"
+                "\n"
+                "Returns:\n"
+                "    int: The number of bindings that failed to load.\n"
+                "*/\n"
+                "int Load( DispatchTable& table );\n"
+            )
         else:
-            generateUserHeader( feature, corePath, True )
+            out.write(
+                "\n"
+                "/*\n"
+                "Load\n"
+                "----\n"
+                "\n"
+                "Description:\n"
+                "    Call to load all available bindings and extensions for the currently active context.\n"
+                "    Asks the context for its version and profile first, and only loads the versions it supports,\n"
+                "    including the commands later versions removed only if it has them. If the context doesn't say, loads every version.\n"
+                "\n"
+                "Arguments:\n"
+                "    N/A\n"
+                "\n"
+                "Returns:\n"
+                "    int: The number of bindings that failed to load.\n"
+                "*/\n"
+                "int Load();\n"
+                "\n"
+                "/*\n"
+                "GetContextVersion\n"
+                "-----------------\n"
+                "\n"
+                "Description:\n"
+                "    Returns the version and profile Load() detected, without asking the context again.\n"
+                "\n"
+                "Arguments:\n"
+                "    N/A\n"
+                "\n"
+                "Returns:\n"
+                "    ContextVersion: The version and profile of the context Load() last loaded, or a major version of 0 if Load() hasn't been called.\n"
+                "*/\n"
+                "ContextVersion GetContextVersion();\n"
+            )
+
+        out.write(
+            "\n"
+            "//Resolvers\n"
+            "//Prototype for loaded OpenGL functions\n"
+            "typedef void(*ProcAddress)();\n"
+            "//Prototype for functions that return the address of the command with the given name, or nullptr if it isn't available\n"
+            "typedef ProcAddress (Resolver)( const char* name );\n"
+            "\n"
+            "/*\n"
+            "SetResolver\n"
+            "-----------\n"
+            "\n"
+            "Description:\n"
+            "    Makes the loaders look commands up with the given resolver instead of ResolveDefault(), e.g. to load without an OpenGL implementation in tests.\n"
+            "    Only affects commands loaded after the call.\n"
+            "\n"
+            "Arguments:\n"
+            "    resolver: The resolver to use, or nullptr to go back to ResolveDefault().\n"
+            "\n"
+            "Returns:\n"
+            "    N/A\n"
+            "*/\n"
+            "void SetResolver( Resolver* resolver );\n"
+            "\n"
+            "/*\n"
+            "ResolveDefault\n"
+            "--------------\n"
+            "\n"
+            "Description:\n"
+            "    Looks up a command in the system's OpenGL implementation.\n"
+            "    On Windows, asks wglGetProcAddress, then opengl32.dll itself, which is the only place OpenGL 1.1 commands can be found.\n"
+            "    Elsewhere, opens libGL the first time it's called and keeps it open. Commands libGL is required to export (OpenGL 1.x and GLX)\n"
+            "    are looked up with dlsym, so they're only found if they're really there. Everything else is looked up with glXGetProcAddress,\n"
+            "    which returns an address for any name; whether those commands can be called depends on the context's version and extensions.\n"
+            "\n"
+            "Arguments:\n"
+            "    name: The name of the command, e.g. \"glClear\".\n"
+            "\n"
+            "Returns:\n"
+            "    ProcAddress: The address of the command, or nullptr if it isn't available.\n"
+            "*/\n"
+            "ProcAddress ResolveDefault( const char* name );\n"
+        )
+
+        out.endNamespaces()
+        out.endIncludeGuard()
+
+    generateReportHeader()
+    if callProfile:
+        generateCallProfile()
+
+    with SourceFile( f"{LOADER_FILE}.{SRC_EXT}" ) as out:
+        out.writeComment()
+
+        out.write(
+             "\n\n\n\n"
+             "//Includes\n"
+             "#include <cstddef>      //std::ptrdiff_t, std::size_t\n"
+             "#include <cstring>      //std::memcmp, std::strlen\n"
+             "#include <cstdint>      //std::uint32_t\n"
+            f"#include <{PROJECT_NAME}/{TYPES_FILE}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{REPORT_FILE}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{LOADER_FILE}.{INC_EXT}>\n"
+             "\n"
+             "#ifdef _WIN32\n"
+             "#include <windows.h>    //wglGetProcAddress, LoadLibraryA, GetProcAddress\n"
+             "#else\n"
+             "#include <dlfcn.h>      //dlopen, dlsym\n"
+             "#endif\n"
+             "\n"
+             "#ifdef GLL_LOAD_REPORT\n"
+             "#include <chrono>       //std::chrono::steady_clock\n"
+             "#include <mutex>        //std::mutex, std::lock_guard\n"
+             "#include <utility>      //std::move\n"
+             "#endif\n"
+             "\n\n\n\n"
+        )
+
+        out.beginNamespaces()
+        writeLoaderSource( out, apis, compatibility )
+        out.endNamespaces()
+
+#Generates report.hpp, which declares the load report.
+#Everything in it is conditional on GLL_LOAD_REPORT; without it, GLL_REPORT_MODULE expands to nothing and the loaders are exactly as they'd be without the report.
+def generateReportHeader():
+    with IncludeFile( f"{REPORT_FILE}.{INC_EXT}" ) as out:
+        out.writeComment()
+        out.beginIncludeGuard()
+
+        out.write(
+            "//Define GLL_LOAD_REPORT when compiling GLL's sources to have every module loader report how long it took\n"
+            "//and which of its commands failed to load; see GetLoadReport().\n"
+            "#ifdef GLL_LOAD_REPORT\n"
+            "\n"
+            "//Includes\n"
+            "#include <cstdint>      //std::uint64_t\n"
+            "#include <vector>       //std::vector\n"
+            "\n"
+        )
+
+        out.beginNamespaces()
+        out.write(
+            "//How loading one module went\n"
+            "struct ModuleReport {\n"
+            "    const char*              name;           //Name of the module, e.g. \"gl_4_6\", \"gl_4_6_rem\" or \"GL_ARB_sync\"\n"
+            "    std::uint64_t            nanoseconds;    //How long the module took to load\n"
+            "    int                      resolved;       //Number of the module's commands that loaded\n"
+            "    std::vector<const char*> failures;       //Names of the module's commands that failed to load\n"
+            "};\n"
+            "\n"
+            "/*\n"
+            "GetLoadReport\n"
+            "-------------\n"
+            "\n"
+            "Description:\n"
+            "    Returns a report of every module loaded since the program started or ClearLoadReport() was last called, in the order they finished loading.\n"
+            "    A module loaded more than once (e.g. for several contexts) is reported each time.\n"
+            "    Lazy loaders resolve commands on their first call rather than when their module is loaded, so their reports never count any commands.\n"
+            "\n"
+            "Arguments:\n"
+            "    N/A\n"
+            "\n"
+            "Returns:\n"
+            "    std::vector<ModuleReport>: A copy of the report of each module.\n"
+            "*/\n"
+            "std::vector<ModuleReport> GetLoadReport();\n"
+            "\n"
+            "/*\n"
+            "ClearLoadReport\n"
+            "---------------\n"
+            "\n"
+            "Description:\n"
+            "    Forgets every module reported so far.\n"
+            "\n"
+            "Arguments:\n"
+            "    N/A\n"
+            "\n"
+            "Returns:\n"
+            "    N/A\n"
+            "*/\n"
+            "void ClearLoadReport();\n"
+            "\n"
+            "//Reports on the module loader it's declared in: times it, and counts the commands it resolves on its thread while in scope.\n"
+            "//Modules without a name aren't reported. Use GLL_REPORT_MODULE rather than declaring these directly.\n"
+            "class ModuleTimer {\n"
+            "public:\n"
+            "    explicit ModuleTimer( const char* name );\n"
+            "    ~ModuleTimer();\n"
+            "\n"
+            "    ModuleTimer( const ModuleTimer& )            = delete;\n"
+            "    ModuleTimer& operator=( const ModuleTimer& ) = delete;\n"
+            "\n"
+            "private:\n"
+            "    ModuleReport  report;\n"
+            "    ModuleReport* previous;\n"
+            "    std::uint64_t start;\n"
+            "};\n"
+            "\n"
+        )
+        out.endNamespaces()
+
+        out.write(
+            "#define GLL_REPORT_MODULE( name ) ModuleTimer moduleTimer( name )\n"
+            "\n"
+            "#else\n"
+            "\n"
+            "#define GLL_REPORT_MODULE( name )\n"
+            "\n"
+            "#endif //GLL_LOAD_REPORT\n"
+        )
+
+        out.endIncludeGuard()
+
+#Generates callprofile.hpp and callprofile.cpp (--call-profile only), which declare and implement the call stats kept by the wrappers writeCallProfile() writes.
+#Everything in them is conditional on GLL_CALL_PROFILE, so builds that don't define it are the same as without --call-profile.
+def generateCallProfile():
+    with IncludeFile( f"{CALL_PROFILE_FILE}.{INC_EXT}" ) as out:
+        out.writeComment()
+        out.beginIncludeGuard()
+
+        out.write(
+            "//Define GLL_CALL_PROFILE when compiling GLL's sources to have every command count its calls and the time they take; see DumpCallProfile().\n"
+            "#ifdef GLL_CALL_PROFILE\n"
+            "\n"
+            "//Includes\n"
+            "#include <atomic>       //std::atomic\n"
+            "#include <chrono>       //std::chrono::steady_clock\n"
+            "#include <cstddef>      //std::size_t\n"
+            "#include <cstdint>      //std::uint64_t\n"
+            "#include <cstdio>       //std::FILE\n"
+            "\n"
+        )
+
+        out.beginNamespaces()
+        out.write(
+            "//Calls made to one command, and the total time they took; updated without locks, so commands can be called on any thread\n"
+            "struct CallStats {\n"
+            "    const char*                name;\n"
+            "    std::atomic<std::uint64_t> calls;\n"
+            "    std::atomic<std::uint64_t> nanoseconds;\n"
+            "};\n"
+            "\n"
+            "//Call stats of one module's commands. Each module registers one when the program starts, so DumpCallProfile() can find them.\n"
+            "struct CallProfileModule {\n"
+            "    CallProfileModule( CallStats* stats, std::size_t count );\n"
+            "\n"
+            "    CallStats*         stats;\n"
+            "    std::size_t        count;\n"
+            "    CallProfileModule* next;\n"
+            "};\n"
+            "\n"
+            "//Counts and times the call to the command it's declared in\n"
+            "class CallTimer {\n"
+            "public:\n"
+            "    explicit CallTimer( CallStats& stats ) : stats( stats ), start( std::chrono::steady_clock::now() ) {}\n"
+            "\n"
+            "    ~CallTimer() {\n"
+            "        std::uint64_t nanoseconds = std::chrono::duration_cast<std::chrono::nanoseconds>( std::chrono::steady_clock::now() - start ).count();\n"
+            "        stats.calls.fetch_add( 1, std::memory_order_relaxed );\n"
+            "        stats.nanoseconds.fetch_add( nanoseconds, std::memory_order_relaxed );\n"
+            "    }\n"
+            "\n"
+            "    CallTimer( const CallTimer& )            = delete;\n"
+            "    CallTimer& operator=( const CallTimer& ) = delete;\n"
+            "\n"
+            "private:\n"
+            "    CallStats&                            stats;\n"
+            "    std::chrono::steady_clock::time_point start;\n"
+            "};\n"
+            "\n"
+            "/*\n"
+            "DumpCallProfile\n"
+            "---------------\n"
+            "\n"
+            "Description:\n"
+            "    Writes a table of every command that was called since the program started or ResetCallProfile() was last called:\n"
+            "    how many times it was called, the total time those calls took, and the average time per call, slowest command first.\n"
+            "    Times include the cost of timing each call, which is significant for commands that do little work.\n"
+            "\n"
+            "Arguments:\n"
+            "    file: The file to write the table to, e.g. stdout.\n"
+            "\n"
+            "Returns:\n"
+            "    N/A\n"
+            "*/\n"
+            "void DumpCallProfile( std::FILE* file );\n"
+            "\n"
+            "/*\n"
+            "ResetCallProfile\n"
+            "----------------\n"
+            "\n"
+            "Description:\n"
+            "    Sets the calls and time of every command back to zero, e.g. to profile a single frame.\n"
+            "    Calls made on other threads while this runs may or may not be counted.\n"
+            "\n"
+            "Arguments:\n"
+            "    N/A\n"
+            "\n"
+            "Returns:\n"
+            "    N/A\n"
+            "*/\n"
+            "void ResetCallProfile();\n"
+            "\n"
+        )
+        out.endNamespaces()
+
+        out.write( "#endif //GLL_CALL_PROFILE\n" )
+        out.endIncludeGuard()
+
+    with SourceFile( f"{CALL_PROFILE_FILE}.{SRC_EXT}" ) as out:
+        out.writeComment()
+
+        out.write(
+             "\n\n\n\n"
+             "//Includes\n"
+             "#include <algorithm>    //std::sort\n"
+             "#include <cinttypes>    //PRIu64\n"
+             "#include <vector>       //std::vector\n"
+            f"#include <{PROJECT_NAME}/{CALL_PROFILE_FILE}.{INC_EXT}>\n"
+             "\n\n\n\n"
+             "#ifdef GLL_CALL_PROFILE\n"
+             "\n"
+        )
+
+        out.beginNamespaces()
+        out.write(
+            "//Every registered module, most recent first; modules are only ever added, so the list can be read without a lock\n"
+            "static constinit std::atomic<CallProfileModule*> callProfileModules = nullptr;\n"
+            "\n"
+            "CallProfileModule::CallProfileModule( CallStats* stats, std::size_t count ) : stats( stats ), count( count ), next( callProfileModules.load( std::memory_order_relaxed ) ) {\n"
+            "    while( !callProfileModules.compare_exchange_weak( next, this, std::memory_order_release, std::memory_order_relaxed ) ) {}\n"
+            "}\n"
+            "\n"
+            "void DumpCallProfile( std::FILE* file ) {\n"
+            "    struct Row {\n"
+            "        const char*   name;\n"
+            "        std::uint64_t calls;\n"
+            "        std::uint64_t nanoseconds;\n"
+            "    };\n"
+            "\n"
+            "    std::vector<Row> rows;\n"
+            "    for( CallProfileModule* module = callProfileModules.load( std::memory_order_acquire ); module; module = module->next ) {\n"
+            "        for( std::size_t i = 0; i < module->count; ++i ) {\n"
+            "            const CallStats& stats = module->stats[i];\n"
+            "            std::uint64_t    calls = stats.calls.load( std::memory_order_relaxed );\n"
+            "            if( calls > 0 )\n"
+            "                rows.push_back( { stats.name, calls, stats.nanoseconds.load( std::memory_order_relaxed ) } );\n"
+            "        }\n"
+            "    }\n"
+            "    std::sort( rows.begin(), rows.end(), []( const Row& a, const Row& b ) {\n"
+            "        return a.nanoseconds != b.nanoseconds ? a.nanoseconds > b.nanoseconds : a.calls > b.calls;\n"
+            "    } );\n"
+            "\n"
+            "    std::fprintf( file, \"%-48s %12s %14s %13s\\n\", \"command\", \"calls\", \"total (us)\", \"per call (ns)\" );\n"
+            "    for( const Row& row : rows )\n"
+            "        std::fprintf( file, \"%-48s %12\" PRIu64 \" %14.1f %13.1f\\n\", row.name, row.calls, row.nanoseconds / 1000.0, (double)row.nanoseconds / row.calls );\n"
+            "}\n"
+            "\n"
+            "void ResetCallProfile() {\n"
+            "    for( CallProfileModule* module = callProfileModules.load( std::memory_order_acquire ); module; module = module->next ) {\n"
+            "        for( std::size_t i = 0; i < module->count; ++i ) {\n"
+            "            module->stats[i].calls.store( 0, std::memory_order_relaxed );\n"
+            "            module->stats[i].nanoseconds.store( 0, std::memory_order_relaxed );\n"
+            "        }\n"
+            "    }\n"
+            "}\n"
+            "\n"
+        )
+        out.endNamespaces()
+
+        out.write( "#endif //GLL_CALL_PROFILE\n" )
+
+#Value of fake_requirements (see generateFake()) for extension commands, and the flag set in it for commands a later version removed, respectively
+FAKE_EXTENSION = 0xFF
+FAKE_REMOVED   = 0x80
+
+#Returns the names of the commands ResolveFake() can find, and what each needs from the fake context (see generateFake()), in the same order.
+#Window system commands need nothing (0); OpenGL commands need the version that introduced them (major * 10 + minor, with FAKE_REMOVED set if a
+#later version removed them), and extension commands need extensions (FAKE_EXTENSION).
+def fakeCommands():
+    requirements = {}
+    for feature in features:
+        if not isGenerated( feature ):
+            continue
+        for commandList, removed in ( ( feature.coreCommands, 0 ), ( feature.removedCommands, FAKE_REMOVED ) ):
+            for command in commandList:
+                requirements.setdefault( command.name, ( feature.version.major * 10 + feature.version.minor ) | removed if feature.api == "gl" else 0 )
+    for extension in generatedExtensions():
+        for command in extension.coreCommands:
+            requirements.setdefault( command.name, FAKE_EXTENSION )
+    return list( requirements ), list( requirements.values() )
+
+#Generates fake.hpp and fake.cpp, a stand-in OpenGL implementation that loaders can resolve commands from with SetResolver( ResolveFake ),
+#and bench/load.cpp, a program that uses it to time every version loader and Load() without a GPU (--fake only).
+def generateFake():
+    apiFeatures = next( ( apiFeatures for api, apiFeatures in generatedApis() if api == "gl" ), [] )
+    newest      = apiFeatures[-1].version if len( apiFeatures ) > 0 else Version( 1, 0 )
+    contexts    = loaderStyle == "context"
+
+    with IncludeFile( f"{FAKE_FILE}.{INC_EXT}" ) as out:
+        out.writeComment()
+        out.beginIncludeGuard()
+
+        out.write(
+             "//Includes\n"
+            f"#include \"{LOADER_FILE}.{INC_EXT}\"\n"
+             "\n"
+        )
+
+        out.beginNamespaces()
+        out.write(
+             "//Describes the OpenGL context ResolveFake() stands in for\n"
+             "struct FakeContext {\n"
+             "    int  major;            //The context's version; ResolveFake() finds the commands of this version and every version before it\n"
+             "    int  minor;\n"
+             "    bool compatibility;    //If false, the context has a core profile, and ResolveFake() doesn't find commands that later versions removed\n"
+             "    bool extensions;       //If true, the context reports every extension GLL knows about, and ResolveFake() finds their commands\n"
+             "};\n"
+             "\n"
+             "/*\n"
+             "SetFakeContext\n"
+             "--------------\n"
+             "\n"
+             "Description:\n"
+            f"    Changes the context ResolveFake() stands in for. It starts out as an OpenGL {newest.major}.{newest.minor} compatibility context with every extension.\n"
+             "\n"
+             "Arguments:\n"
+             "    context: The context to stand in for.\n"
+             "\n"
+             "Returns:\n"
+             "    N/A\n"
+             "*/\n"
+             "void SetFakeContext( const FakeContext& context );\n"
+             "\n"
+             "/*\n"
+             "ResolveFake\n"
+             "-----------\n"
+             "\n"
+             "Description:\n"
+             "    A resolver for SetResolver() that stands in for an OpenGL implementation, so loaders can be run without a GPU or a context, e.g. in CI.\n"
+             "    Finds every window system command, and the OpenGL and extension commands of the context set with SetFakeContext().\n"
+             "    The commands it finds do nothing and return zero, except for the queries the loaders make (glGetIntegerv, glGetString and glGetStringi),\n"
+             "    which describe the fake context. Only load them; on 32-bit Windows, calling one that takes arguments would unbalance the stack.\n"
+             "\n"
+             "Arguments:\n"
+             "    name: The name of the command, e.g. \"glClear\".\n"
+             "\n"
+             "Returns:\n"
+             "    ProcAddress: The address of the command's stand-in, or nullptr if the fake context doesn't have the command.\n"
+             "*/\n"
+             "ProcAddress ResolveFake( const char* name );\n"
+        )
+        out.endNamespaces()
+        out.endIncludeGuard()
+
+    names, requirements = fakeCommands()
+    extensionNames      = [ extension.name for extension in generatedExtensions() ]
+    queries             = { "glGetIntegerv": "fakeGetIntegerv", "glGetString": "fakeGetString", "glGetStringi": "fakeGetStringi" }
+    offsets = []
+    size    = 0
+    for name in extensionNames:
+        offsets.append( size )
+        size += len( name ) + 1
+    offsetType = "unsigned short" if size <= 0xFFFF else "unsigned int"
+
+    with SourceFile( f"{FAKE_FILE}.{SRC_EXT}" ) as out:
+        out.writeComment()
+
+        out.write(
+             "\n\n\n\n"
+             "//Includes\n"
+             "#include <cstddef>      //std::size_t\n"
+             "#include <cstdint>      //std::uint32_t, std::uintptr_t\n"
+             "#include <cstdio>       //std::snprintf\n"
+             "#include <cstring>      //std::memcmp, std::strlen\n"
+             "#include <string>       //std::string\n"
+            f"#include <{PROJECT_NAME}/{TYPES_FILE}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{FAKE_FILE}.{INC_EXT}>\n"
+             "\n\n\n\n"
+        )
+
+        out.beginNamespaces()
+
+        out.write(
+             "//The context set with SetFakeContext(), and the version string it reports\n"
+            f"static FakeContext fakeContext = {{ {newest.major}, {newest.minor}, true, true }};\n"
+            f"static char        fakeVersion[32] = \"{newest.major}.{newest.minor}.0 GLL fake\";\n"
+             "\n"
+        )
+
+        writeLookup( out, PerfectHash( names ), "fake", names, "findFakeCommand" )
+
+        out.write(
+            "\n"
+            "//What each command needs from the fake context, by index: the OpenGL version that introduced it (major * 10 + minor; 0 for window system commands),\n"
+           f"//with {FAKE_REMOVED:#04x} set if a later version removed it, or {FAKE_EXTENSION:#04x} for extension commands\n"
+            "static const unsigned char fake_requirements[] = {\n"
+        )
+        for i in range( 0, len( requirements ), 16 ):
+            line = ", ".join( str( requirement ) for requirement in requirements[ i : i + 16 ] )
+            separator = "," if i + 16 < len( requirements ) else ""
+            out.write( f"    {line}{separator}\n" )
+        out.write( "};\n" )
+
+        out.write( f"\n//Names of the extensions the fake context reports\nstatic const std::size_t fakeExtensionCount = {len( extensionNames )};\n" )
+        if len( extensionNames ) > 0:
+            out.write( "static const char fakeExtensionNames[] =\n" )
+            for i, name in enumerate( extensionNames ):
+                terminator = ";" if i == len( extensionNames ) - 1 else ""
+                out.write( f"    \"{name}\\0\"{terminator}\n" )
+            out.write( f"\n//Offset of each extension's name in fakeExtensionNames\nstatic const {offsetType} fakeExtensionOffsets[] = {{\n" )
+            for i in range( 0, len( offsets ), 16 ):
+                line = ", ".join( str( offset ) for offset in offsets[ i : i + 16 ] )
+                separator = "," if i + 16 < len( offsets ) else ""
+                out.write( f"    {line}{separator}\n" )
+            out.write( "};\n" )
+        else:
+            out.write( "static const char fakeExtensionNames[] = \"\";\nstatic const unsigned short fakeExtensionOffsets[] = { 0 };\n" )
+
+        out.write(
+             "\n"
+             "//Names of the extensions the fake context reports, separated by spaces, as glGetString( GL_EXTENSIONS ) reports them\n"
+             "static std::string joinExtensionNames() {\n"
+             "    std::string names;\n"
+             "    for( std::size_t i = 0; i < fakeExtensionCount; ++i ) {\n"
+             "        if( i > 0 )\n"
+             "            names += ' ';\n"
+             "        names += fakeExtensionNames + fakeExtensionOffsets[i];\n"
+             "    }\n"
+             "    return names;\n"
+             "}\n"
+             "\n"
+             "//Stands in for every command but the queries below\n"
+             "static std::uintptr_t GLAPI fakeCommand() {\n"
+             "    return 0;\n"
+             "}\n"
+             "\n"
+             "//Like real contexts, only answers the queries the context's version has, and leaves data untouched otherwise\n"
+             "static void GLAPI fakeGetIntegerv( GLenum name, GLint* data ) {\n"
+             "    int version = fakeContext.major * 10 + fakeContext.minor;\n"
+             "    switch( name ) {\n"
+            f"    case {enums[ 'GL_MAJOR_VERSION' ].value}: //GL_MAJOR_VERSION\n"
+             "        if( version >= 30 )\n"
+             "            *data = fakeContext.major;\n"
+             "        break;\n"
+            f"    case {enums[ 'GL_MINOR_VERSION' ].value}: //GL_MINOR_VERSION\n"
+             "        if( version >= 30 )\n"
+             "            *data = fakeContext.minor;\n"
+             "        break;\n"
+            f"    case {enums[ 'GL_NUM_EXTENSIONS' ].value}: //GL_NUM_EXTENSIONS\n"
+             "        if( version >= 30 )\n"
+             "            *data = fakeContext.extensions ? GLint( fakeExtensionCount ) : 0;\n"
+             "        break;\n"
+            f"    case {enums[ 'GL_CONTEXT_PROFILE_MASK' ].value}: //GL_CONTEXT_PROFILE_MASK\n"
+             "        if( version >= 32 )\n"
+            f"            *data = fakeContext.compatibility ? {enums[ 'GL_CONTEXT_COMPATIBILITY_PROFILE_BIT' ].value} : {enums[ 'GL_CONTEXT_CORE_PROFILE_BIT' ].value};\n"
+             "        break;\n"
+             "    }\n"
+             "}\n"
+             "\n"
+             "static const GLubyte* GLAPI fakeGetString( GLenum name ) {\n"
+             "    static const std::string extensionNames = joinExtensionNames();\n"
+             "    switch( name ) {\n"
+            f"    case {enums[ 'GL_VENDOR' ].value}: //GL_VENDOR\n"
+            f"    case {enums[ 'GL_RENDERER' ].value}: //GL_RENDERER\n"
+             "        return reinterpret_cast<const GLubyte*>( \"GLL fake\" );\n"
+            f"    case {enums[ 'GL_VERSION' ].value}: //GL_VERSION\n"
+             "        return reinterpret_cast<const GLubyte*>( fakeVersion );\n"
+            f"    case {enums[ 'GL_EXTENSIONS' ].value}: //GL_EXTENSIONS\n"
+             "        return reinterpret_cast<const GLubyte*>( fakeContext.extensions ? extensionNames.c_str() : \"\" );\n"
+             "    }\n"
+             "    return nullptr;\n"
+             "}\n"
+             "\n"
+             "static const GLubyte* GLAPI fakeGetStringi( GLenum name, GLuint index ) {\n"
+            f"    if( name != {enums[ 'GL_EXTENSIONS' ].value} || !fakeContext.extensions || index >= fakeExtensionCount )\n"
+             "        return nullptr;\n"
+             "    return reinterpret_cast<const GLubyte*>( fakeExtensionNames + fakeExtensionOffsets[ index ] );\n"
+             "}\n"
+             "\n"
+             "void SetFakeContext( const FakeContext& context ) {\n"
+             "    fakeContext = context;\n"
+             "    std::snprintf( fakeVersion, sizeof( fakeVersion ), \"%d.%d.0 GLL fake\", context.major, context.minor );\n"
+             "}\n"
+             "\n"
+             "ProcAddress ResolveFake( const char* name ) {\n"
+             "    int index = findFakeCommand( name, std::strlen( name ) );\n"
+             "    if( index < 0 )\n"
+             "        return nullptr;\n"
+             "\n"
+             "    unsigned requirement = fake_requirements[ index ];\n"
+            f"    if( requirement == {FAKE_EXTENSION:#04x} ) {{\n"
+             "        if( !fakeContext.extensions )\n"
+             "            return nullptr;\n"
+             "    } else {\n"
+            f"        if( ( requirement & {FAKE_REMOVED:#04x} ) && !fakeContext.compatibility )\n"
+             "            return nullptr;\n"
+            f"        if( int( requirement & ~{FAKE_REMOVED:#04x}u ) > fakeContext.major * 10 + fakeContext.minor )\n"
+             "            return nullptr;\n"
+             "    }\n"
+             "\n"
+             "    switch( index ) {\n"
+        )
+        for command, function in queries.items():
+            if command in names:
+                out.write( f"    case {names.index( command )}: //{command}\n        return reinterpret_cast<ProcAddress>( {function} );\n" )
+        out.write(
+            "    }\n"
+            "    return reinterpret_cast<ProcAddress>( fakeCommand );\n"
+            "}\n"
+        )
+
+        out.endNamespaces()
+
+    #The version loaders of OpenGL (with context loaders, Load( table ) is the only one)
+    loaders = []
+    if not contexts:
+        for feature in apiFeatures:
+            loaders.append( feature.loadFunction )
+            if hasProfiles( feature ) and hasRemovedModules( apiFeatures ):
+                loaders.append( feature.compatLoadFunction )
+
+    with BenchmarkFile( f"{BENCH_FILE}.{SRC_EXT}" ) as out:
+        out.writeComment()
+
+        out.write(
+             "\n\n\n\n"
+             "//Includes\n"
+             "#include <chrono>       //std::chrono::steady_clock\n"
+             "#include <cstdio>       //std::printf\n"
+             "#include <cstdlib>      //std::atoi\n"
+            f"#include <{PROJECT_NAME}/{LOADER_FILE}.{INC_EXT}>\n"
+            f"#include <{PROJECT_NAME}/{FAKE_FILE}.{INC_EXT}>\n"
+        )
+        if contexts:
+            out.write( f"#include <{PROJECT_NAME}/{DISPATCH_FILE}.{INC_EXT}>\n" )
+        out.write(
+             "\n\n\n\n"
+             "//Fake contexts to load against: one with every command, and one with only those of an OpenGL 3.3 core context\n"
+             "struct SymbolSet {\n"
+             "    const char*      name;\n"
+             "    gll::FakeContext context;\n"
+             "};\n"
+             "static const SymbolSet symbolSets[] = {\n"
+            f"    {{ \"full\",    {{ {newest.major}, {newest.minor}, true,  true  }} }},\n"
+             "    { \"partial\", { 3, 3, false, false } }\n"
+             "};\n"
+             "\n"
+        )
+        if contexts:
+            out.write(
+                "static gll::DispatchTable table;\n"
+                "static int load() {\n"
+                "    return gll::Load( table );\n"
+                "}\n"
+            )
+        else:
+            out.write(
+                "static int load() {\n"
+                "    return gll::Load();\n"
+                "}\n"
+            )
+        out.write(
+            "\n"
+            "//Loaders to time\n"
+            "struct Loader {\n"
+            "    const char* name;\n"
+            "    int         ( *load )();\n"
+            "};\n"
+            "static const Loader loaders[] = {\n"
+        )
+        for loadFunction in loaders:
+            out.write( f"    {{ \"{loadFunction}\", gll::{loadFunction} }},\n" )
+        out.write(
+            "    { \"Load\", load }\n"
+            "};\n"
+            "\n"
+            "int main( int argc, char** argv ) {\n"
+            "    int iterations = argc > 1 ? std::atoi( argv[1] ) : 100;\n"
+            "    if( iterations < 1 )\n"
+            "        iterations = 1;\n"
+            "    gll::SetResolver( gll::ResolveFake );\n"
+            "\n"
+            "    std::printf( \"%-24s %-8s %6s %12s %12s\\n\", \"loader\", \"symbols\", \"fail\", \"mean (us)\", \"best (us)\" );\n"
+            "    for( const SymbolSet& symbolSet : symbolSets ) {\n"
+            "        gll::SetFakeContext( symbolSet.context );\n"
+            "        for( const Loader& loader : loaders ) {\n"
+            "            //The first load warms up, and counts the commands the fake context doesn't have\n"
+            "            int    fail  = loader.load();\n"
+            "            double total = 0;\n"
+            "            double best  = 0;\n"
+            "            for( int i = 0; i < iterations; ++i ) {\n"
+            "                auto start = std::chrono::steady_clock::now();\n"
+            "                loader.load();\n"
+            "                double microseconds = std::chrono::duration<double, std::micro>( std::chrono::steady_clock::now() - start ).count();\n"
+            "                total += microseconds;\n"
+            "                best   = i == 0 || microseconds < best ? microseconds : best;\n"
+            "            }\n"
+            "            std::printf( \"%-24s %-8s %6d %12.2f %12.2f\\n\", loader.name, symbolSet.name, fail, total / iterations, best );\n"
+            "        }\n"
+            "    }\n"
+            "    return 0;\n"
+            "}\n"
+        )
+
+#Returns the names of the commands the Linux OpenGL ABI requires libGL to export (those of OpenGL 1.x and GLX), in the order they're generated in.
+#ResolveDefault() looks these up with dlsym rather than glXGetProcAddress, so it can tell whether they're really available.
+def exportedCommands():
+    names = []
+    for feature in features:
+        if isGenerated( feature ) and ( ( feature.api == "gl" and feature.version.major == 1 ) or feature.api == "glx" ):
+            names.extend( command.name for command in ( *feature.coreCommands, *feature.removedCommands ) )
+    return names
+
+#Writes detectContextVersion(), which asks the current context for its version and profile.
+#Load() uses it to pick the version loader to run, and with context loaders, Load( table ) uses it to pick the modules to load (see generateDispatch()).
+def writeContextDetection( out ):
+    def value( name ):
+        return enums[ name ].value
+
+    out.write(
+         "//Context detection\n"
+         "typedef void           (GLAPI *GetIntegervFunction)( GLenum name, GLint* data );\n"
+         "typedef const GLubyte* (GLAPI *GetStringFunction)(   GLenum name );\n"
+         "typedef const GLubyte* (GLAPI *GetStringiFunction)(  GLenum name, GLuint index );\n"
+         "\n"
+         "//Reads a number from the given text, and moves past it\n"
+         "static int readNumber( const char*& text ) {\n"
+         "    int number = 0;\n"
+         "    for( ; *text >= '0' && *text <= '9'; ++text )\n"
+         "        number = number * 10 + ( *text - '0' );\n"
+         "    return number;\n"
+         "}\n"
+         "\n"
+         "//Asks the current context for its version and profile. The queries are resolved here, so this can be called before anything is loaded.\n"
+         "//major is 0 if there's no current context, or it didn't say.\n"
+         "ContextVersion detectContextVersion() {\n"
+         "    ContextVersion version = { 0, 0, true };\n"
+         "    GetIntegervFunction getIntegerv = reinterpret_cast<GetIntegervFunction>( getProcAddress( \"glGetIntegerv\" ) );\n"
+         "    GetStringFunction   getString   = reinterpret_cast<GetStringFunction>(   getProcAddress( \"glGetString\"   ) );\n"
+         "    if( !getIntegerv || !getString )\n"
+         "        return version;\n"
+         "\n"
+         "    //OpenGL 3.0 and above report their version as numbers; older contexts don't know these queries and leave the numbers alone\n"
+         "    GLint major = 0, minor = 0;\n"
+        f"    getIntegerv( {value( 'GL_MAJOR_VERSION' )}, &major ); //GL_MAJOR_VERSION\n"
+        f"    getIntegerv( {value( 'GL_MINOR_VERSION' )}, &minor ); //GL_MINOR_VERSION\n"
+         "    if( major <= 0 ) {\n"
+         "        //Every version's GL_VERSION string starts with \"major.minor\" (OpenGL ES prefixes it with \"OpenGL ES \")\n"
+        f"        const char* text = reinterpret_cast<const char*>( getString( {value( 'GL_VERSION' )} ) ); //GL_VERSION\n"
+         "        if( !text )\n"
+         "            return version;\n"
+         "        while( *text && ( *text < '0' || *text > '9' ) )\n"
+         "            ++text;\n"
+         "        major = readNumber( text );\n"
+         "        minor = *text == '.' ? readNumber( ++text ) : 0;\n"
+         "    }\n"
+         "    version.major = major;\n"
+         "    version.minor = minor;\n"
+         "\n"
+         "    //OpenGL 3.2 and above report their profile. OpenGL 3.1 contexts have what 3.1 removed only if they have GL_ARB_compatibility,\n"
+         "    //and older contexts haven't removed anything.\n"
+         "    if( major > 3 || ( major == 3 && minor >= 2 ) ) {\n"
+         "        GLint mask = 0;\n"
+        f"        getIntegerv( {value( 'GL_CONTEXT_PROFILE_MASK' )}, &mask ); //GL_CONTEXT_PROFILE_MASK\n"
+        f"        version.compatibility = ( mask & {value( 'GL_CONTEXT_COMPATIBILITY_PROFILE_BIT' )} ) != 0; //GL_CONTEXT_COMPATIBILITY_PROFILE_BIT\n"
+         "    } else if( major == 3 && minor == 1 ) {\n"
+         "        GetStringiFunction getStringi = reinterpret_cast<GetStringiFunction>( getProcAddress( \"glGetStringi\" ) );\n"
+         "        GLint count = 0;\n"
+        f"        getIntegerv( {value( 'GL_NUM_EXTENSIONS' )}, &count ); //GL_NUM_EXTENSIONS\n"
+         "        version.compatibility = false;\n"
+         "        for( GLint i = 0; getStringi && i < count && !version.compatibility; ++i ) {\n"
+        f"            const char* name = reinterpret_cast<const char*>( getStringi( {value( 'GL_EXTENSIONS' )}, i ) ); //GL_EXTENSIONS\n"
+         "            version.compatibility = name && std::strcmp( name, \"GL_ARB_compatibility\" ) == 0;\n"
+         "        }\n"
+         "    }\n"
+         "    return version;\n"
+         "}\n"
+         "\n\n\n\n"
+    )
+
+#Writes the body of loader.cpp for the given APIs (see loaderApis()): the resolvers, context detection, the version loaders and Load().
+#Expects to be written inside GLL's namespaces, after <cstring>, <cstdint> and <cstddef>, either <windows.h> or <dlfcn.h>, gl_types.hpp and report.hpp have been included,
+#along with <chrono>, <mutex> and <utility> if GLL_LOAD_REPORT is defined.
+def writeLoaderSource( out, apis, compatibility = True ):
+    contexts = loaderStyle == "context"
+
+    out.write(
+        "//Typedefs\n"
+        "//Prototype for gll loaders\n"
+        "typedef int (LoadFunction)();\n"
+        "//Prototype for loaded OpenGL functions\n"
+        "typedef void(*ProcAddress)();\n"
+        "\n\n\n\n"
+    )
+
+    #Declare module loaders (these are defined in the mod_*.cpp files)
+    out.write( "//Module loaders\n" )
+    for api, apiFeatures in apis:
+        beginPlatformCondition( out, api )
+        for feature in apiFeatures:
+            for loadFunction in moduleLoadFunctions( feature, compatibility ):
+                if loadFunction is not None:
+                    out.write( f"LoadFunction {loadFunction};\n" )
+        endPlatformCondition( out, api )
+
+    #Declared in gl_ext.hpp, which isn't included here because its enums would clash with the system's OpenGL headers
+    if not contexts:
+        out.write( "\n//Extension loader\nLoadFunction LoadExtensions;\n" )
+
+    out.write(
+        "\n\n\n\n"
+        "//Resolvers\n"
+        "//The resolver set with SetResolver(), or nullptr to use ResolveDefault()\n"
+        "static Resolver* resolver = nullptr;\n"
+        "\n"
+        "void SetResolver( Resolver* replacement ) {\n"
+        "    resolver = replacement;\n"
+        "}\n"
+        "\n"
+        "#ifdef GLL_LOAD_REPORT\n"
+        "\n"
+        "//Reports of the modules loaded so far; modules can be loaded on several threads at once, so these are guarded by reportMutex\n"
+        "static std::mutex                reportMutex;\n"
+        "static std::vector<ModuleReport> reports;\n"
+        "\n"
+        "//Report of the module being loaded on this thread, if any\n"
+        "static thread_local ModuleReport* currentReport = nullptr;\n"
+        "\n"
+        "static std::uint64_t now() {\n"
+        "    return std::chrono::duration_cast<std::chrono::nanoseconds>( std::chrono::steady_clock::now().time_since_epoch() ).count();\n"
+        "}\n"
+        "\n"
+        "ModuleTimer::ModuleTimer( const char* name ) : report{ name, 0, 0, {} }, previous( currentReport ), start( now() ) {\n"
+        "    currentReport = &report;\n"
+        "}\n"
+        "\n"
+        "ModuleTimer::~ModuleTimer() {\n"
+        "    report.nanoseconds = now() - start;\n"
+        "    currentReport      = previous;\n"
+        "    if( !report.name )\n"
+        "        return;\n"
+        "\n"
+        "    std::lock_guard<std::mutex> lock( reportMutex );\n"
+        "    reports.push_back( std::move( report ) );\n"
+        "}\n"
+        "\n"
+        "std::vector<ModuleReport> GetLoadReport() {\n"
+        "    std::lock_guard<std::mutex> lock( reportMutex );\n"
+        "    return reports;\n"
+        "}\n"
+        "\n"
+        "void ClearLoadReport() {\n"
+        "    std::lock_guard<std::mutex> lock( reportMutex );\n"
+        "    reports.clear();\n"
+        "}\n"
+        "\n"
+        "#endif\n"
+        "\n"
+        "//Returns the process address; every loader resolves its commands with this\n"
+        "ProcAddress getProcAddress( const char* name ) {\n"
+        "    ProcAddress address = resolver ? resolver( name ) : ResolveDefault( name );\n"
+        "#ifdef GLL_LOAD_REPORT\n"
+        "    if( currentReport ) {\n"
+        "        if( address )\n"
+        "            ++currentReport->resolved;\n"
+        "        else\n"
+        "            currentReport->failures.push_back( name );\n"
+        "    }\n"
+        "#endif\n"
+        "    return address;\n"
+        "}\n"
+        "\n"
+        "#if defined( _WIN32 )\n"
+        "\n"
+        "ProcAddress ResolveDefault( const char* name ) {\n"
+        "    //Try to grab the function with wglGetProcAddress.\n"
+        "    //Note: this requires an active context; it will fail immediately if one is not found.\n"
+        "    ProcAddress    ptr = (ProcAddress)wglGetProcAddress( name );\n"
+        "    std::ptrdiff_t rv  = (std::ptrdiff_t)ptr;\n"
+        "\n"
+        "    //MSDN states that wglGetProcAddress returns NULL (0) on failure.\n"
+        "    //However, the OpenGL wiki claims that other implementations can additionally return 1, 2, 3, and -1 to indicate failures,\n"
+        "    //so we check for all 5 possible failure codes here:\n"
+        "    if( rv < -1 || rv > 3 )\n"
+        "        return ptr;\n"
+        "\n"
+        "    //wglGetProcAddress fails for the commands the OpenGL dll exports itself (OpenGL 1.1), so grab the function from the dll directly.\n"
+        "    //The dll is loaded the first time this happens and kept loaded.\n"
+        "    static const HMODULE library = LoadLibraryA( \"opengl32.dll\" );\n"
+        "    return library ? (ProcAddress)GetProcAddress( library, name ) : nullptr;\n"
+        "}\n"
+        "\n"
+        "#else\n"
+        "\n"
+    )
+
+    #The Linux OpenGL ABI requires libGL to export these commands; ResolveDefault() looks them up with dlsym
+    exported = exportedCommands()
+    if len( exported ) > 0:
+        writeLookup( out, PerfectHash( exported ), "exported", exported, "findExportedCommand" )
+    else:
+        out.write( "static int findExportedCommand( const char*, std::size_t ) {\n    return -1;\n}\n" )
+
+    out.write(
+        "\n"
+        "//libGL, and its glXGetProcAddressARB\n"
+        "struct Library {\n"
+        "    void*       handle;\n"
+        "    ProcAddress ( *getProcAddress )( const unsigned char* name );\n"
+        "};\n"
+        "\n"
+        "static Library openLibrary() {\n"
+        "    Library library = { nullptr, nullptr };\n"
+        "    library.handle  = dlopen( \"libGL.so.1\", RTLD_LAZY | RTLD_LOCAL );\n"
+        "    if( !library.handle )\n"
+        "        library.handle = dlopen( \"libGL.so\", RTLD_LAZY | RTLD_LOCAL );\n"
+        "    if( library.handle )\n"
+        "        library.getProcAddress = reinterpret_cast<ProcAddress (*)( const unsigned char* )>( dlsym( library.handle, \"glXGetProcAddressARB\" ) );\n"
+        "    return library;\n"
+        "}\n"
+        "\n"
+        "ProcAddress ResolveDefault( const char* name ) {\n"
+        "    //libGL is opened the first time a command is resolved and kept open\n"
+        "    static const Library library = openLibrary();\n"
+        "    if( !library.handle )\n"
+        "        return nullptr;\n"
+        "\n"
+        "    //libGL has to export these, so if dlsym can't find one, it really isn't available\n"
+        "    if( findExportedCommand( name, std::strlen( name ) ) >= 0 )\n"
+        "        return reinterpret_cast<ProcAddress>( dlsym( library.handle, name ) );\n"
+        "\n"
+        "    //glXGetProcAddress returns an address for any name; whether the command is available depends on the context's version and extensions\n"
+        "    return library.getProcAddress ? library.getProcAddress( reinterpret_cast<const unsigned char*>( name ) ) : nullptr;\n"
+        "}\n"
+        "\n"
+        "#endif\n"
+        "\n\n\n\n"
+    )
+    writeContextDetection( out )
+
+    #Write the chains of helpers that load core and removed modules, respectively
+    out.write(
+        "//Each of these loads the core modules of its version and every version before it\n"
+        "//and the removed modules of its version and every version before it, respectively.\n"
+    )
+    for api, apiFeatures in apis:
+        #APIs that never removed anything don't need a chain for removed modules
+        suffixes = ( "core", "removed" ) if hasRemovedModules( apiFeatures, compatibility ) else ( "core", )
+
+        beginPlatformCondition( out, api )
+        previous = None
+        for feature in apiFeatures:
+            core, removed = moduleLoadFunctions( feature, compatibility )
+            for suffix, loadFunction in zip( suffixes, ( core, removed ) ):
+                calls = []
+                if previous is not None:
+                    calls.append( f"{previous.loadFunction}_{suffix}_modules()" )
+                if loadFunction is not None:
+                    calls.append( f"{loadFunction}()" )
+
+                out.write( f"static int {feature.loadFunction}_{suffix}_modules() {{\n" )
+                writeSum( out, calls )
+                out.write( "}\n" )
+            previous = feature
+        endPlatformCondition( out, api )
+        out.write( "\n" )
+
+    #Write version loaders
+    out.write( "\n\n\n//Version loaders\n" )
+    for api, apiFeatures in apis:
+        hasRemoved = hasRemovedModules( apiFeatures, compatibility )
+
+        beginPlatformCondition( out, api )
+        for feature in apiFeatures:
+            core    = f"{feature.loadFunction}_core_modules()"
+            removed = f"{feature.loadFunction}_removed_modules()"
+            if not hasRemoved:
+                out.write( f"int {feature.loadFunction}() {{\n" )
+                writeSum( out, [ core ] )
+                out.write( "}\n" )
+                continue
+
+            #Contexts older than OpenGL 3.1 haven't removed anything yet, so their loaders load removed modules too.
+            #For 3.1 and above, core and compatibility profile loaders are generated.
+            if hasProfiles( feature ):
+                out.write( f"int {feature.loadFunction}() {{\n" )
+                writeSum( out, [ core ] )
+                out.write( f"}}\nint {feature.compatLoadFunction}() {{\n" )
+                writeSum( out, [ core, removed ] )
+                out.write( "}\n" )
+            else:
+                out.write( f"int {feature.loadFunction}() {{\n" )
+                writeSum( out, [ core, removed ] )
+                out.write( "}\n" )
+        endPlatformCondition( out, api )
+        out.write( "\n" )
+
+    #Load() runs the version loader of the context's version and profile (or the newest generated version, if the context is newer),
+    #followed by LoadExtensions(). If the version can't be detected, it loads everything, including everything that was removed.
+    if not contexts:
+        glFeatures = [ feature for api, apiFeatures in apis if api == "gl" for feature in apiFeatures ]
+        hasRemoved = hasRemovedModules( glFeatures, compatibility )
+
+        def versionLoader( feature, compat ):
+            return feature.compatLoadFunction if compat and hasRemoved and hasProfiles( feature ) else feature.loadFunction
+
+        out.write(
+             "\n"
+             "//Version and profile of the context Load() last loaded\n"
+             "static ContextVersion contextVersion = { 0, 0, false };\n"
+             "\n"
+             "ContextVersion GetContextVersion() {\n"
+             "    return contextVersion;\n"
+             "}\n"
+             "\n"
+             "int Load() {\n"
+             "    contextVersion = detectContextVersion();\n"
+        )
+        if len( glFeatures ) > 1:
+            out.write( "    int version    = contextVersion.major * 10 + contextVersion.minor;\n" )
+        out.write(
+             "    int fail       = 0;\n"
+             "\n"
+             "    if( contextVersion.major == 0 )\n"
+            f"        fail = {versionLoader( glFeatures[-1], True )}();\n"
+        )
+        for i, feature in enumerate( reversed( glFeatures ) ):
+            condition = f"else if( version >= {feature.version.major * 10 + feature.version.minor} )" if i < len( glFeatures ) - 1 else "else"
+            core      = versionLoader( feature, False )
+            compat    = versionLoader( feature, True )
+            if core == compat:
+                out.write( f"    {condition}\n        fail = {core}();\n" )
+            else:
+                out.write( f"    {condition}\n        fail = contextVersion.compatibility ? {compat}() : {core}();\n" )
+        out.write(
+             "\n"
+             "    return fail + LoadExtensions();\n"
+             "}\n"
+        )
 
 #Enter into main()
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+"""
+This module builds the perfect hash tables generated code uses to look up names at runtime.
+
+Every name is hashed once with 32-bit FNV-1a. The hash picks a bucket, and each bucket has a seed that was chosen by the generator
+so that mixing the hash with its bucket's seed sends every name to its own slot. A lookup therefore costs one pass over the name,
+two integer mixes, and a single string comparison against the one name that could be in its slot.
+The C++ side of a table is written by writeLookup(); it must compute exactly what hashName(), mix() and PerfectHash.slotOf() do here.
+"""
+FNV_OFFSET = 2166136261
+FNV_PRIME  = 16777619
+MASK       = 0xFFFFFFFF
+
+#Seeds are stored as unsigned shorts, so the search for each bucket's seed gives up after this many tries
+MAX_SEED   = 0xFFFF
+
+def hashName( name ):
+    """Returns the 32-bit FNV-1a hash of the given name."""
+    h = FNV_OFFSET
+    for byte in name.encode():
+        h = ( ( h ^ byte ) * FNV_PRIME ) & MASK
+    return h
+
+def mix( h ):
+    """Scrambles the bits of a 32-bit hash (the MurmurHash3 finalizer)."""
+    h ^= h >> 16
+    h  = ( h * 0x85EBCA6B ) & MASK
+    h ^= h >> 13
+    h  = ( h * 0xC2B2AE35 ) & MASK
+    h ^= h >> 16
+    return h
+
+def powerOfTwo( n ):
+    """Returns the smallest power of two that is at least n."""
+    size = 1
+    while size < n:
+        size *= 2
+    return size
+
+class PerfectHash:
+    """
+    A perfect hash table for a list of names.
+    slots[ slotOf( name ) ] is the index of the name in the list the table was built from, or None if that slot is empty.
+    """
+    def __init__( self, names ):
+        hashes = [ hashName( name ) for name in names ]
+        if len( set( hashes ) ) != len( hashes ):
+            raise RuntimeError( "Can't build a perfect hash table for names whose hashes collide." )
+
+        self.bucketCount = powerOfTwo( max( len( names ) // 4, 1 ) )
+        self.slotCount   = powerOfTwo( len( names ) * 5 // 4 + 1 )
+        self.seeds       = [ 0 ] * self.bucketCount
+        self.slots       = [ None ] * self.slotCount
+
+        buckets = [ [] for _ in range( self.bucketCount ) ]
+        for index, h in enumerate( hashes ):
+            buckets[ self.bucketOf( h ) ].append( ( index, h ) )
+
+        #Place the biggest buckets first, while the table is still mostly empty
+        for bucket in sorted( range( self.bucketCount ), key = lambda b: len( buckets[b] ), reverse = True ):
+            if len( buckets[ bucket ] ) == 0:
+                break
+            self.seeds[ bucket ] = self.findSeed( buckets[ bucket ] )
+            for index, h in buckets[ bucket ]:
+                self.slots[ self.slotFor( h, self.seeds[ bucket ] ) ] = index
+
+    def bucketOf( self, h ):
+        return mix( h ) & ( self.bucketCount - 1 )
+
+    def slotFor( self, h, seed ):
+        return mix( h ^ seed ) & ( self.slotCount - 1 )
+
+    def slotOf( self, name ):
+        """Returns the slot the given name hashes to."""
+        h = hashName( name )
+        return self.slotFor( h, self.seeds[ self.bucketOf( h ) ] )
+
+    def findSeed( self, bucket ):
+        """Returns a seed that sends every name in the given bucket to a different empty slot."""
+        for seed in range( 1, MAX_SEED + 1 ):
+            slots = { self.slotFor( h, seed ) for _, h in bucket }
+            if len( slots ) == len( bucket ) and all( self.slots[ slot ] is None for slot in slots ):
+                return seed
+        raise RuntimeError( "Couldn't find a seed for a bucket of the perfect hash table." )
+
+def writeLookup( out, table, prefix, names, function ):
+    """
+    Writes the arrays of the given PerfectHash, built from the given names, and a function that looks names up in it.
+    The arrays are static and named after the given prefix. The function is declared as "int function( const char* name, std::size_t length )"
+    and returns the index of the name, or -1 if it isn't one of the names. Needs <cstring> and <cstdint>.
+    """
+    #Offset of each name in the packed string, plus the offset just past the end so every name's length is known
+    offsets = [ 0 ]
+    for name in names:
+        offsets.append( offsets[-1] + len( name ) + 1 )
+    offsetType = "unsigned short" if offsets[-1] <= 0xFFFF else "unsigned int"
+    empty      = 0xFFFF if len( names ) < 0xFFFF else 0xFFFFFFFF
+    indexType  = "unsigned short" if empty == 0xFFFF else "unsigned int"
+
+    def writeNumbers( numbers ):
+        for i in range( 0, len( numbers ), 16 ):
+            line = ", ".join( str( number ) for number in numbers[ i : i + 16 ] )
+            separator = "," if i + 16 < len( numbers ) else ""
+            out.write( f"    {line}{separator}\n" )
+
+    out.write( f"//Names, in index order\nstatic const char {prefix}_names[] =\n" )
+    for i, name in enumerate( names ):
+        terminator = ";" if i == len( names ) - 1 else ""
+        out.write( f"    \"{name}\\0\"{terminator}\n" )
+
+    out.write( f"\n//Offset of each name in {prefix}_names, followed by the size of {prefix}_names\nstatic const {offsetType} {prefix}_offsets[] = {{\n" )
+    writeNumbers( offsets )
+    out.write( "};\n" )
+
+    out.write( f"\n//Seed of each bucket of the perfect hash table\nstatic const unsigned short {prefix}_seeds[] = {{\n" )
+    writeNumbers( table.seeds )
+    out.write( "};\n" )
+
+    out.write( f"\n//Index of the name in each slot of the perfect hash table ({empty} if the slot is empty)\nstatic const {indexType} {prefix}_slots[] = {{\n" )
+    writeNumbers( [ empty if index is None else index for index in table.slots ] )
+    out.write( "};\n" )
+
+    out.write(
+         "\n"
+        f"static inline std::uint32_t {prefix}_mix( std::uint32_t h ) {{\n"
+         "    h ^= h >> 16;\n"
+         "    h *= 0x85EBCA6Bu;\n"
+         "    h ^= h >> 13;\n"
+         "    h *= 0xC2B2AE35u;\n"
+         "    h ^= h >> 16;\n"
+         "    return h;\n"
+         "}\n"
+         "\n"
+        f"int {function}( const char* name, std::size_t length ) {{\n"
+        f"    std::uint32_t h = {FNV_OFFSET}u;\n"
+         "    for( std::size_t i = 0; i < length; ++i ) {\n"
+         "        h ^= (unsigned char)name[i];\n"
+        f"        h *= {FNV_PRIME}u;\n"
+         "    }\n"
+         "\n"
+        f"    std::uint32_t seed  = {prefix}_seeds[ {prefix}_mix( h ) & {table.bucketCount - 1}u ];\n"
+        f"    {indexType} index = {prefix}_slots[ {prefix}_mix( h ^ seed ) & {table.slotCount - 1}u ];\n"
+        f"    if( index == {empty}u )\n"
+         "        return -1;\n"
+         "\n"
+         "    //Names that aren't in the table can still land in an occupied slot\n"
+        f"    const char* candidate = {prefix}_names + {prefix}_offsets[ index ];\n"
+        f"    if( {prefix}_offsets[ index + 1 ] - {prefix}_offsets[ index ] - 1u != length || std::memcmp( candidate, name, length ) != 0 )\n"
+         "        return -1;\n"
+         "    return (int)index;\n"
+         "}\n"
+    )
@@ -0,0 +1,118 @@
+"""
+This module implements GLL's --profile instrumentation.
+
+Phases of a run are measured with phase(), which records how long each took and, while profiling is enabled, the peak memory
+it allocated (measured with tracemalloc). Phases nest; a phase started inside another is recorded as "outer/inner".
+Work done in worker processes is measured there with Measurement and recorded by the parent process with add(),
+so its times are summed across workers rather than being wall time. Counters (e.g. files written) are kept with count().
+When profiling is disabled, phases are still timed, but nothing else is measured and nothing is reported.
+"""
+import json
+import tracemalloc
+
+from time        import perf_counter
+from contextlib  import contextmanager
+
+#True if --profile (or an option implying it) was given
+enabled  = False
+
+#Maps the name of each phase to [ calls, seconds, peak bytes ], in the order phases were first recorded
+records  = {}
+
+#Maps the name of each counter to its value, in the order counters were first counted
+counters = {}
+
+#Names of the phases currently being measured, outermost first
+stack    = []
+
+#Peak traced memory (in bytes) of each measurement in progress from before tracemalloc's peak was last reset, outermost first
+floors   = []
+
+class Measurement:
+    """
+    Measures the wall time of a block, and while profiling is enabled, the peak memory allocated while it ran.
+    Starts tracing memory if nothing else was, so it can be used in worker processes as well.
+    After the block, seconds and peak (in bytes, or None if profiling is disabled) hold the results.
+    """
+    def __enter__( self ):
+        self.seconds = None
+        self.peak    = None
+        self.started = False
+        if enabled:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started = True
+
+            #Resetting the peak loses the enclosing measurement's peak so far, so it's set aside in floors first
+            current, peak = tracemalloc.get_traced_memory()
+            if len( floors ) > 0:
+                floors[-1] = max( floors[-1], peak )
+            tracemalloc.reset_peak()
+            floors.append( current )
+            self.base = current
+        self.start = perf_counter()
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        self.seconds = perf_counter() - self.start
+        if enabled:
+            peak      = max( floors.pop(), tracemalloc.get_traced_memory()[1] )
+            self.peak = peak - self.base
+
+            #Whatever this measurement allocated was allocated by the enclosing one too
+            if len( floors ) > 0:
+                floors[-1] = max( floors[-1], peak )
+            if self.started:
+                tracemalloc.stop()
+
+def add( name, seconds, peak = None ):
+    """Records a call of the given phase, inside whichever phases are currently being measured."""
+    name   = "/".join( [ *stack, name ] )
+    record = records.setdefault( name, [ 0, 0.0, None ] )
+    record[0] += 1
+    record[1] += seconds
+    if peak is not None:
+        record[2] = peak if record[2] is None else max( record[2], peak )
+
+@contextmanager
+def phase( name ):
+    """Measures the enclosed block as a call of the given phase."""
+    #Reserve the phase's place in records now, so it's reported before the phases inside it
+    records.setdefault( "/".join( [ *stack, name ] ), [ 0, 0.0, None ] )
+    with Measurement() as measurement:
+        stack.append( name )
+        try:
+            yield
+        finally:
+            stack.pop()
+    add( name, measurement.seconds, measurement.peak )
+
+def count( name, n = 1 ):
+    """Adds n to the given counter."""
+    counters[ name ] = counters.get( name, 0 ) + n
+
+def report():
+    """Prints every recorded phase and counter."""
+    if not enabled:
+        return
+
+    width = max( ( len( name ) for name in [ *records, *counters ] ), default=0 )
+    print( "\nProfile (times of phases run in worker processes are summed across workers):" )
+    print( f"{'phase'.ljust( width )} {'calls':>6} {'time (ms)':>10} {'peak (MiB)':>11}" )
+    for name, ( calls, seconds, peak ) in records.items():
+        peakText = "-" if peak is None else f"{peak / ( 1024 * 1024 ):.2f}"
+        print( f"{name.ljust( width )} {calls:>6} {seconds * 1000:>10.1f} {peakText:>11}" )
+
+    print( f"\n{'counter'.ljust( width )} {'value':>10}" )
+    for name, value in counters.items():
+        print( f"{name.ljust( width )} {value:>10}" )
+
+def writeJson( path ):
+    """Writes every recorded phase and counter to the given file as JSON."""
+    trace = {
+        "phases":   { name: { "calls": calls, "seconds": seconds, "peakBytes": peak } for name, ( calls, seconds, peak ) in records.items() },
+        "counters": counters
+    }
+    with open( path, "w" ) as fout:
+        json.dump( trace, fout, indent=4 )
+        fout.write( "\n" )
@@ -1,20 +1,22 @@
 """
 This module implements various utilities for GLL.
 """
-from sys import stderr, exit
+import os
+import logging
+
+from sys     import stderr, exit
+from hashlib import sha256
+
+#Diagnostics that aren't part of a command's normal output are logged here; only warnings and errors are shown unless --log-level says otherwise
+log = logging.getLogger( "gll" )
 
 def innerText( node ):
     """
     Returns the text content of a node as a complete string.
-    This function is called recursively on child nodes of the given node;
+    Includes the text of every descendant of the given node, as well as the text that follows each of them;
     e.g. "<span>A, <bold>B<bold>, <italics>C</italics></span>" becomes "A, B, C"
     """
-    text = node.text
-    rv = "" if text is None else text
-    for child in node:
-        text = child.tail
-        rv += innerText( child ) + ( "" if text is None else text )
-    return rv
+    return "".join( node.itertext() )
 
 def error( msg ):
     """Prints the given error message and exits with code 1."""
@@ -24,3 +26,40 @@ def error( msg ):
 def tagError( node ):
     """Called when encountering an unrecognized tag during parsing."""
     error( f"Unrecognized tag: \"{node.tag}\"" )
+
+def cpuCount():
+    """Returns the number of CPUs this process can run on."""
+    try:
+        return len( os.sched_getaffinity( 0 ) )
+    #Not available on every platform (e.g. Windows)
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def hashText( text ):
+    """Returns a hash of the given text."""
+    return sha256( text.encode() ).digest()
+
+def hashFile( path ):
+    """Returns a hash of the text in the file at the given path, or None if the file doesn't exist."""
+    try:
+        with open( path, "r" ) as fin:
+            return hashText( fin.read() )
+    except FileNotFoundError:
+        return None
+
+def writeAtomically( path, text ):
+    """
+    Writes the given text to a temporary file next to the given path, then renames it over the file at that path.
+    Anything reading the file at the same time (e.g. a build) sees either the old or the new contents, never a partial write.
+    """
+    temppath = f"{path}.{os.getpid()}.part"
+    try:
+        with open( temppath, "w" ) as fout:
+            fout.write( text )
+        os.replace( temppath, path )
+    except:
+        try:
+            os.remove( temppath )
+        except FileNotFoundError:
+            pass
+        raise
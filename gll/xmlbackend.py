@@ -0,0 +1,55 @@
+"""
+This module implements the XML backends GLL can parse the registry files with.
+
+The parser only relies on the ElementTree API (iterparse(), parse(), and find(), get(), attrib, text, tail, itertext() and remove() on elements),
+which every backend provides, so the same parse functions produce the same model on any of them:
+    etree  The standard library's xml.etree.ElementTree, whose C accelerator parses with expat. Always available.
+    lxml   lxml.etree, which parses with libxml2. Only available if lxml is installed.
+The backend is chosen with select(); etree is the default. libxml2 reads the file faster than expat does,
+but every element the parser touches has to be wrapped in a Python proxy object first, so parsing with lxml ends up slower overall
+(see the parse suite of gll.benchmark).
+"""
+import xml.etree.ElementTree as ET
+
+#Optional
+try:
+    import lxml.etree as LET
+except ImportError:
+    LET = None
+
+#Names of the backends
+BACKENDS = ( "etree", "lxml" )
+
+#Errors any backend raises when a file isn't well-formed XML
+ParseError = ( ET.ParseError, ) if LET is None else ( ET.ParseError, LET.XMLSyntaxError )
+
+#Name of the selected backend
+backend = "etree"
+
+def available():
+    """Returns the names of the backends that can be used."""
+    return [ name for name in BACKENDS if name != "lxml" or LET is not None ]
+
+def select( name ):
+    """Selects the backend with the given name. Raises RuntimeError if there's no such backend or it isn't installed."""
+    global backend
+    if name not in BACKENDS:
+        raise RuntimeError( "Expected one of {} after \"--xml-backend\".".format( ", ".join( BACKENDS ) ) )
+    if name not in available():
+        raise RuntimeError( f"The {name} XML backend isn't installed (try pip install {name})." )
+    backend = name
+
+def iterparse( path ):
+    """Returns an iterator over the ( event, element ) pairs of the "start" and "end" events of the elements of the given file."""
+    if backend == "lxml":
+        #ElementTree drops comments and processing instructions; lxml would otherwise keep them as children of their elements
+        return LET.iterparse( path, events=( "start", "end" ), remove_comments=True, remove_pis=True )
+    return ET.iterparse( path, events=( "start", "end" ) )
+
+def parse( path ):
+    """Returns the root element of the given file."""
+    if backend == "lxml":
+        #Opened here so a missing file raises FileNotFoundError, as it does with ElementTree
+        with open( path, "rb" ) as fin:
+            return LET.parse( fin, LET.XMLParser( remove_comments=True, remove_pis=True ) ).getroot()
+    return ET.parse( path ).getroot()
@@ -1,16 +0,0 @@
-/*
-loader.hpp
------------------------
-Copyright (c) 2024, theJ89
-
-Description:
-    GLL's load function is declared here
-*/
-#ifndef GLL_LOADER_HPP
-#define GLL_LOADER_HPP
-
-namespace gll {
-    int Load();
-}
-
-#endif //GLL_LOADER_HPP
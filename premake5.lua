@@ -2,7 +2,8 @@
 local build_platforms = { "x64", "x32" }
 
 --Supported configurations
-local build_configurations = { "release", "debug" }
+--profile is release with the call profiling wrappers compiled in (see gll.generate --call-profile)
+local build_configurations = { "release", "debug", "profile" }
 
 --[[
 Table of all supported builds, one for each combination of build_platforms and build_configurations.
@@ -19,6 +20,13 @@ function doBuilds()
         x32 = "x86"
     }
 
+    --Translation table from premake's configuration strings to filename suffixes
+    local cfgToSuffix = {
+        release = "",
+        debug   = "d",
+        profile = "p"
+    }
+
     --Create a list of builds. Builds are a cartesian product of platforms and configurations.
     for _,x in ipairs( build_platforms ) do
         for _,y in ipairs( build_configurations ) do
@@ -29,7 +37,7 @@ function doBuilds()
                     "architecture:"..x,
                     "configurations:"..y
                 },
-                suffix = pfToArch[x]..(y == "debug" and "d" or "")
+                suffix = pfToArch[x]..cfgToSuffix[y]
             } )
         end
     end
@@ -57,10 +65,15 @@ function doFlags()
     filter( "configurations:debug" )
         symbols( "On" )
 
-    --Optimize for speed in release builds
-    filter( "configurations:release" )
+    --Optimize for speed in release and profile builds
+    filter( "configurations:release or profile" )
         optimize( "Speed" )
 
+    --Count and time every call to a GL command in profile builds; DumpCallProfile() (see callprofile.hpp) reports them.
+    --Generate with --call-profile, or the wrappers won't exist.
+    filter( "configurations:profile" )
+        defines( { "GLL_CALL_PROFILE" } )
+
     --[[
     When compiling with G++:
     * -Wno-unknown-pragmas: Don't generate warnings for unknown pragmas (e.g. pragmas compatible with MSVC but not other compilers)
@@ -93,16 +106,45 @@ solution( "gll" )
         includedirs( "include" )
         targetdir( "lib" )
 
-        --Exclude Windows files when compiling for non-window OSes
+        --Exclude Windows files (WGL) when compiling for non-window OSes
         filter( "system:not windows" )
-            --excludes( {} )
+            excludes( {
+                "src/gll/*wgl_*.cpp",
+                "include/gll/*wgl_*.hpp"
+            } )
 
-        --Exclude Linux files when compiling for non-linux OSes
+        --Exclude Linux files (GLX) when compiling for non-linux OSes
         filter( "system:not linux" )
-            --excludes( {} )
+            excludes( {
+                "src/gll/*glx_*.cpp",
+                "include/gll/*glx_*.hpp"
+            } )
 
         doFlags()
 
         --The output library name is different depending on the
         --architecture and whether or not this is the debug/release version
         doSuffixes()
+
+--The load benchmark times the loaders against a fake OpenGL implementation, so it runs without a GPU.
+--It only exists if the sources were generated with --fake.
+if os.isfile( "bench/load.cpp" ) then
+    project( "gll_bench" )
+        kind( "ConsoleApp" )
+        language( "C++" )
+        files( {
+            "bench/**.cpp"
+        } )
+
+        includedirs( "include" )
+        targetdir( "bin" )
+        links( { "gll" } )
+
+        --ResolveDefault() opens libGL with dlopen
+        filter( "system:linux" )
+            links( { "dl" } )
+
+        doFlags()
+
+        doSuffixes()
+end